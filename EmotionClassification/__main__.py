@@ -0,0 +1,115 @@
+from EmotionClassification.data_representation.data_representation import CHUNK_SIZE, stream_columns, \
+    column_chunks, open_input
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+from EmotionClassification.data_representation.features import FeaturePipeline, EMOTION_FEATURES, \
+    DEMOGRAPHIC_FEATURES
+import argparse
+import sys
+
+
+def read_text_chunks(f, columns, chunk_size=CHUNK_SIZE, text_lines=False):
+    """
+    stream the lines of an open file in chunks such that only one chunk is kept in memory at a time
+    :param f: the file opened in binary mode (e.g. sys.stdin.buffer)
+    :param columns: the names of the columns to extract (keys of COLUMNS) if the file is in the layout of the
+                    original file
+    :param chunk_size: the number of lines of a chunk - default is CHUNK_SIZE
+    :param text_lines: boolean variable whether every line only contains a text instead of the columns of the
+                       original file - default is False
+    :return: a generator yielding a dictionary of the form {column name: list of values} for every chunk
+    """
+    if text_lines:
+        rows = ((line.decode("utf8").rstrip("\r\n"),) for line in f)
+        columns = ("generated_text",)
+    else:
+        rows = stream_columns(f, columns)
+    return column_chunks(rows, columns, chunk_size)
+
+
+def predict_stream(model, f, output, chunk_size=CHUNK_SIZE, text_lines=False, scores=False):
+    """
+    predict the emotions of all lines of a file chunk by chunk and write them to the output right away
+    the memory needed does not depend on the number of lines since only one chunk is kept at a time
+    the additional information used by the model (e.g. intensity) is taken from the columns of the file
+    :param model: a trained or loaded NaiveBayes object
+    :param f: the file opened in binary mode (e.g. sys.stdin.buffer)
+    :param output: the open text file to write the predictions to (e.g. sys.stdout)
+    :param chunk_size: the number of lines predicted at once - default is CHUNK_SIZE
+    :param text_lines: boolean variable whether every line only contains a text - default is False
+    :param scores: boolean variable to also write the naive bayes score of every emotion - default is False
+    :return: the number of predicted lines
+    """
+    if text_lines and model.features:
+        raise ValueError("the model uses additional information which is not contained in text lines")
+    # only the columns needed by the features of the model are read in
+    pipeline = FeaturePipeline(model.features)
+    emotions = list(model.log_prior.keys())
+
+    output.write("predicted_emotion" + ("\t" + "\t".join(emotions) if scores else "") + "\n")
+    lines = 0
+    for chunk in read_text_chunks(f, pipeline.columns, chunk_size=chunk_size, text_lines=text_lines):
+        labels, chunk_scores = model.predict_batch(list(pipeline.sequences(chunk)))
+        if scores:
+            output.writelines(label + "\t" + "\t".join(repr(score) for score in row) + "\n"
+                              for label, row in zip(labels, chunk_scores.tolist()))
+        else:
+            output.writelines(label + "\n" for label in labels)
+        output.flush()
+        lines += len(labels)
+    return lines
+
+
+def main(arguments=None):
+    """
+    run a command from the command line, e.g.
+        python -m EmotionClassification predict --model model.bin --input test.tsv --output predictions.tsv
+        cat test.tsv | python -m EmotionClassification predict --train "exports/*.tsv.gz" --intensity
+    :param arguments: the command line arguments - default is None (sys.argv)
+    """
+    parser = argparse.ArgumentParser(prog="python -m EmotionClassification",
+                                     description="naive bayes emotion classification")
+    commands = parser.add_subparsers(dest="command", required=True)
+    predict = commands.add_parser("predict", help="predict the emotions of the lines of a file or stdin")
+    model_source = predict.add_mutually_exclusive_group(required=True)
+    model_source.add_argument("--model", help="model file written by NaiveBayes.save")
+    model_source.add_argument("--train", nargs="+",
+                              help="training files or glob patterns (plain or compressed) to train the model on "
+                                   "without keeping their lines in memory")
+    for feature in EMOTION_FEATURES + DEMOGRAPHIC_FEATURES:
+        predict.add_argument("--" + feature.replace("_", "-"), action="store_true",
+                             help="incorporate {} (only with --train)".format(feature))
+    predict.add_argument("--tokenize", nargs="?", const="nltk", default=False, choices=("nltk", "regex"),
+                         help="use the nltk tokenizer or the faster regex tokenizer (only with --train)")
+    predict.add_argument("--input", help="file to predict in the layout of the original file, plain or "
+                                          "compressed (stdin otherwise)")
+    predict.add_argument("--output", help="tsv file to write the predictions to (stdout otherwise)")
+    predict.add_argument("--text-lines", action="store_true",
+                         help="every input line only contains a text instead of the columns of the original file")
+    predict.add_argument("--scores", action="store_true", help="also write the score of every emotion")
+    predict.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="number of lines predicted at once")
+    arguments = parser.parse_args(arguments)
+
+    features = {feature: getattr(arguments, feature) for feature in EMOTION_FEATURES + DEMOGRAPHIC_FEATURES}
+    # text lines do not contain the columns of additional information - checked before training the model
+    if arguments.text_lines and any(features.values()):
+        predict.error("--text-lines can not be combined with additional information")
+    if arguments.model is not None:
+        model = NaiveBayes.load(arguments.model)
+    else:
+        model = NaiveBayes.from_files(arguments.train, tokenize=arguments.tokenize, **features)
+    if arguments.text_lines and model.features:
+        predict.error("--text-lines can not be used with a model incorporating additional information")
+    f = open_input(arguments.input) if arguments.input is not None else sys.stdin.buffer
+    output = open(arguments.output, "w", encoding="utf8") if arguments.output is not None else sys.stdout
+    try:
+        predict_stream(model, f, output, chunk_size=arguments.chunk_size, text_lines=arguments.text_lines,
+                       scores=arguments.scores)
+    finally:
+        if arguments.input is not None:
+            f.close()
+        if arguments.output is not None:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+from EmotionClassification.benchmark.synthetic_corpus import generate_corpus
+from EmotionClassification.data_representation.data_representation import DataInstance
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+from EmotionClassification.evaluation.evaluation import Evaluation
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# the numbers of training lines measured by default
+SIZES = (10000, 100000, 1000000)
+
+
+class Benchmark:
+    """
+    This class measures how the classifier scales with the number of lines of the training file
+    For every size a synthetic training and test file are generated (see generate_corpus) and the stages
+        parsing         reading the training file with DataInstance (the tokens are not counted)
+        data_instance   reading and counting the training file with DataInstance
+        training        training NaiveBayes on the training file
+        scoring         predicting the test data one sequence at a time with NaiveBayes.predict
+        batch_scoring   predicting the test data at once with NaiveBayes.predict_batch
+        evaluation      the complete Evaluation of the training and test file
+    are timed - the results can be stored as json and compared with the results of an earlier run
+
+    The file was created on     Sat October 17th 2026
+    """
+    def __init__(self, sizes=SIZES, directory=None, test_fraction=0.1, repeat=1, seed=0, workers=1, **corpus_options):
+        """
+        this is the constructor for the class Benchmark which runs all measurements in the first step
+            self.results stores a list with a dictionary of the form {"rows": ..., "stage": ..., "seconds": ...,
+                         "lines_per_second": ...} for every size and stage
+            self.comparison stores the result of the last call of compare (None before)
+        :param sizes: the numbers of lines of the training files - default is SIZES
+        :param directory: the directory to keep the generated files in such that later runs can re-use them
+                          default is None (a temporary directory which is deleted afterwards)
+        :param test_fraction: the size of the test file relative to the training file - default is 0.1
+        :param repeat: the number of times every stage is run, the fastest run is reported - default is 1
+        :param seed: the seed used to generate the files - default is 0
+        :param workers: the number of processes used by Evaluation - default is 1
+        :param corpus_options: further keyword arguments for generate_corpus (e.g. vocabulary_size)
+        """
+        self.sizes = sizes
+        self.test_fraction = test_fraction
+        self.repeat = repeat
+        self.seed = seed
+        self.workers = workers
+        self.corpus_options = corpus_options
+        self.results = []
+        self.comparison = None
+
+        if directory is None:
+            with tempfile.TemporaryDirectory() as temporary_directory:
+                self.run(temporary_directory)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.run(directory)
+
+    def run(self, directory):
+        """
+        helper method to generate the files (if they do not exist yet) and measure every size
+        :param directory: the directory containing the generated files
+        """
+        # the options are part of the names such that only files generated the same way are re-used
+        options = "".join("_" + str(key) + str(value) for key, value in sorted(self.corpus_options.items()))
+        for rows in self.sizes:
+            test_rows = max(1, int(rows * self.test_fraction))
+            filename_train = os.path.join(directory, "train_{}_seed{}{}.tsv".format(rows, self.seed, options))
+            filename_test = os.path.join(directory, "test_{}_seed{}{}.tsv".format(test_rows, self.seed, options))
+            if not os.path.exists(filename_train):
+                generate_corpus(filename_train, rows, seed=self.seed, **self.corpus_options)
+            if not os.path.exists(filename_test):
+                # the test file uses a different seed but the same distributions
+                generate_corpus(filename_test, test_rows, seed=self.seed + 1, **self.corpus_options)
+            self.results.extend(self.measure(rows, test_rows, filename_train, filename_test))
+
+    def time_stage(self, function):
+        """
+        helper method to time a stage
+        :param function: a function without arguments running the stage
+        :return: the time of the fastest run in seconds
+        """
+        times = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def measure(self, rows, test_rows, filename_train, filename_test):
+        """
+        time all stages for one size
+        the files are read in again by every stage since the parsed content is not kept between the runs
+        :param rows: the number of lines of the training file
+        :param test_rows: the number of lines of the test file
+        :param filename_train: the name of the training file
+        :param filename_test: the name of the test file
+        :return: a list containing a dictionary for every stage
+        """
+        times = dict()
+        times["parsing"] = self.time_stage(lambda: DataInstance(filename_train))
+        # the counts of DataInstance are only built on first access
+        times["data_instance"] = self.time_stage(lambda: DataInstance(filename_train).emotion_dependent_count)
+        # the model of the last run is kept for scoring - it is dropped before every run
+        # since it would keep the parsed training file in use (see load_corpus)
+        models = []
+
+        def train():
+            models.clear()
+            models.append(NaiveBayes(filename_train))
+        times["training"] = self.time_stage(train)
+        model = models.pop()
+        test_data = DataInstance(filename_test).extracted_data
+        times["scoring"] = self.time_stage(lambda: [model.predict(sequence) for sequence in test_data])
+        times["batch_scoring"] = self.time_stage(lambda: model.predict_batch(test_data))
+        del model
+        times["evaluation"] = self.time_stage(lambda: Evaluation(filename_train, filename_test,
+                                                                 workers=self.workers))
+
+        lines = {"parsing": rows, "data_instance": rows, "training": rows, "scoring": test_rows, "batch_scoring": test_rows,
+                 "evaluation": rows + test_rows}
+        return [{"rows": rows, "stage": stage, "seconds": seconds, "lines_per_second": lines[stage] / seconds}
+                for stage, seconds in times.items()]
+
+    def compare(self, baseline, tolerance=0.1):
+        """
+        compare the results with the results of an earlier run (e.g. before a change)
+        :param baseline: the name of a json file written by write_file or a list of results
+        :param tolerance: the relative slowdown which is still accepted - default is 0.1 (10 percent)
+        :return: a list with a dictionary of the form {"rows": ..., "stage": ..., "seconds": ...,
+                 "baseline_seconds": ..., "ratio": ..., "regression": ...} for every stage measured in both runs
+        """
+        if isinstance(baseline, str):
+            with open(baseline, encoding="utf8") as f:
+                baseline = json.load(f)["results"]
+        baseline_seconds = {(result["rows"], result["stage"]): result["seconds"] for result in baseline}
+        self.comparison = []
+        for result in self.results:
+            key = (result["rows"], result["stage"])
+            if key in baseline_seconds:
+                ratio = result["seconds"] / baseline_seconds[key]
+                self.comparison.append({"rows": result["rows"], "stage": result["stage"],
+                                        "seconds": result["seconds"], "baseline_seconds": baseline_seconds[key],
+                                        "ratio": ratio, "regression": ratio > 1 + tolerance})
+        return self.comparison
+
+    def to_json(self):
+        """
+        helper method to get the results together with the environment they were measured in
+        :return: a dictionary which can be stored as json
+        """
+        output = {"environment": {"python": platform.python_version(), "platform": platform.platform(),
+                                  "cpus": os.cpu_count()},
+                  "options": {"test_fraction": self.test_fraction, "repeat": self.repeat, "seed": self.seed,
+                              "workers": self.workers, "corpus_options": self.corpus_options},
+                  "results": self.results}
+        if self.comparison is not None:
+            output["comparison"] = self.comparison
+        return output
+
+    def write_file(self, filename_output):
+        """
+        helper method to store the results in a separate .json file
+        :param filename_output: the json-file's name for storing the output
+        :return: returns a message after successfully writing file
+        """
+        with open(filename_output, "w", encoding="utf8") as f:
+            json.dump(self.to_json(), f, indent=2)
+        return "File {} was successfully written.".format(filename_output)
+
+
+def main(arguments=None):
+    """
+    run the benchmark from the command line, e.g.
+        python -m EmotionClassification.benchmark.benchmark --sizes 10000 100000 --output results.json
+    the exit status is 1 if a baseline is given and one of the stages got slower than the tolerance
+    :param arguments: the command line arguments - default is None (sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="measure how the emotion classifier scales")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help="numbers of lines of the training files")
+    parser.add_argument("--directory", help="directory to keep the generated files in")
+    parser.add_argument("--test-fraction", type=float, default=0.1,
+                        help="size of the test file relative to the training file")
+    parser.add_argument("--repeat", type=int, default=1, help="number of runs per stage (the fastest is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="seed used to generate the files")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes used by Evaluation")
+    parser.add_argument("--vocabulary-size", type=int, default=20000, help="number of distinct words")
+    parser.add_argument("--output", help="json file to store the results in (printed otherwise)")
+    parser.add_argument("--baseline", help="json file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="accepted relative slowdown")
+    arguments = parser.parse_args(arguments)
+
+    benchmark = Benchmark(arguments.sizes, directory=arguments.directory, test_fraction=arguments.test_fraction,
+                          repeat=arguments.repeat, seed=arguments.seed, workers=arguments.workers,
+                          vocabulary_size=arguments.vocabulary_size)
+    if arguments.baseline is not None:
+        benchmark.compare(arguments.baseline, tolerance=arguments.tolerance)
+    if arguments.output is not None:
+        print(benchmark.write_file(arguments.output))
+    else:
+        print(json.dumps(benchmark.to_json(), indent=2))
+    if benchmark.comparison is not None and any(result["regression"] for result in benchmark.comparison):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
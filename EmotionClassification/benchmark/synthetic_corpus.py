@@ -0,0 +1,88 @@
+from EmotionClassification.data_representation.data_representation import COLUMNS
+import numpy as np
+
+# the number of columns of the original file - the columns which are not used by the classifier are filled with "x"
+NUMBER_OF_COLUMNS = 48
+
+EMOTIONS = ("anger", "boredom", "disgust", "fear", "guilt", "joy", "no-emotion", "pride", "relief", "sadness",
+            "shame", "surprise", "trust")
+EVENT_DURATIONS = ("seconds", "minutes", "hours", "days", "weeks", "months", "years")
+EMOTION_DURATIONS = ("I had none", "seconds", "minutes", "hours", "days", "weeks", "months", "years")
+INTENSITIES = ("not very intense", "moderately intense", "intense", "very intense", "extremely intense")
+GENDERS = ("Male", "Female", "Gender Variant/Non-Conforming", "Prefer not to answer")
+EDUCATIONS = ("High school", "Undergraduate degree (BA/BSc/other)", "Graduate degree (MA/MSc/MPhil/other)",
+              "Secondary education", "Doctorate degree (PhD/other)", "No formal qualifications",
+              "Don't know / not applicable")
+
+
+def generate_corpus(filename, rows, vocabulary_size=20000, emotion_distribution=None, text_length=(5, 40),
+                    cue_probability=0.1, zipf_exponent=1.1, seed=0, chunk_size=10000):
+    """
+    write a synthetic file in the layout of the original file to measure how the classifier scales
+    the tokens of the generated text follow a zipf distribution over the vocabulary ("word0" is the most frequent)
+    every emotion has a few cue words ("joycue0", ...) which are mixed into its texts such that there is something
+    to learn - the duration, intensity and demographic columns are drawn uniformly from their values
+    :param filename: the name of the file to write
+    :param rows: the number of lines (without the header)
+    :param vocabulary_size: the number of distinct words of the generated text - default is 20000
+    :param emotion_distribution: a dictionary of the form {emotion: weight} - default is None (EMOTIONS uniformly)
+    :param text_length: a tuple with the minimum and maximum number of tokens of a text - default is (5, 40)
+    :param cue_probability: the probability that a token is one of the cue words of the emotion - default is 0.1
+    :param zipf_exponent: the exponent of the zipf distribution of the words - default is 1.1
+    :param seed: the seed of the random number generator such that the same file is generated again - default is 0
+    :param chunk_size: the number of lines which are generated at once - default is 10000
+    :return: returns a message after successfully writing file
+    """
+    random = np.random.default_rng(seed)
+    if emotion_distribution is None:
+        emotion_distribution = {emotion: 1 for emotion in EMOTIONS}
+    emotions = list(emotion_distribution.keys())
+    emotion_weights = np.array(list(emotion_distribution.values()), dtype=np.float64)
+    emotion_weights /= emotion_weights.sum()
+    words = ["word" + str(rank) for rank in range(vocabulary_size)]
+    word_weights = 1 / np.arange(1, vocabulary_size + 1, dtype=np.float64) ** zipf_exponent
+    word_weights /= word_weights.sum()
+    cue_words = [[emotion.replace("-", "") + "cue" + str(number) for number in range(5)] for emotion in emotions]
+
+    # the columns are named as in COLUMNS - the names of the other columns are placeholders
+    header = ["unused" + str(position) for position in range(NUMBER_OF_COLUMNS)]
+    for name, position in COLUMNS.items():
+        header[position] = name
+
+    with open(filename, "w", encoding="utf8") as f:
+        f.write("\t".join(header) + "\n")
+        for start in range(0, rows, chunk_size):
+            size = min(chunk_size, rows - start)
+            line_emotions = random.choice(len(emotions), size=size, p=emotion_weights).tolist()
+            lengths = random.integers(text_length[0], text_length[1] + 1, size=size)
+            # the tokens of all lines of the chunk are drawn at once
+            tokens = random.choice(vocabulary_size, size=int(lengths.sum()), p=word_weights).tolist()
+            is_cue = (random.random(size=len(tokens)) < cue_probability).tolist()
+            cues = random.integers(0, 5, size=len(tokens)).tolist()
+            lengths = lengths.tolist()
+            event_durations = random.integers(0, len(EVENT_DURATIONS), size=size).tolist()
+            emotion_durations = random.integers(0, len(EMOTION_DURATIONS), size=size).tolist()
+            intensities = random.integers(0, len(INTENSITIES), size=size).tolist()
+            ages = random.integers(18, 71, size=size).tolist()
+            genders = random.integers(0, len(GENDERS), size=size).tolist()
+            educations = random.integers(0, len(EDUCATIONS), size=size).tolist()
+
+            lines, offset = [], 0
+            for line in range(size):
+                emotion = line_emotions[line]
+                end = offset + lengths[line]
+                text = " ".join(cue_words[emotion][cue] if cue_token else words[token] for token, cue_token, cue
+                                in zip(tokens[offset:end], is_cue[offset:end], cues[offset:end]))
+                offset = end
+                values = ["x"] * NUMBER_OF_COLUMNS
+                values[COLUMNS["emotion"]] = emotions[emotion]
+                values[COLUMNS["generated_text"]] = text
+                values[COLUMNS["event_duration"]] = EVENT_DURATIONS[event_durations[line]]
+                values[COLUMNS["emotion_duration"]] = EMOTION_DURATIONS[emotion_durations[line]]
+                values[COLUMNS["intensity"]] = INTENSITIES[intensities[line]]
+                values[COLUMNS["age"]] = str(ages[line])
+                values[COLUMNS["gender"]] = GENDERS[genders[line]]
+                values[COLUMNS["education"]] = EDUCATIONS[educations[line]]
+                lines.append("\t".join(values) + "\n")
+            f.writelines(lines)
+    return "File {} was successfully written.".format(filename)
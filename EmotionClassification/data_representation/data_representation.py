@@ -1,16 +1,1019 @@
-from nltk.tokenize import word_tokenize
+from EmotionClassification.instrumentation.instrumentation import instrumented, count_calls
+from EmotionClassification.data_representation.tokenizer import get_tokenizer
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from array import array
+from collections.abc import Mapping
+from functools import cached_property
+import bz2
+import glob
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import sys
+import weakref
+import zlib
+import numpy as np
+
+# the columns used by the classifier together with their position in the original file
+# columns are looked up by name in the header - the position is only used if the header does not contain the name
+COLUMNS = {"emotion": 1, "generated_text": 17, "event_duration": 19, "emotion_duration": 20, "intensity": 21,
+           "age": 45, "gender": 46, "education": 47}
+# the size of the buffered reads of the input files - compressed files are decompressed in blocks of this size
+BUFFER_SIZE = 1 << 20
+# the number of lines kept in memory at once when files are streamed in chunks (for training and prediction)
+CHUNK_SIZE = 10000
+# the running counts of streamed files keep at most this multiple of max_vocabulary tokens (see count_files)
+RUNNING_VOCABULARY = 4
+# the first bytes of compressed files together with the function opening them
+COMPRESSIONS = ((b"\x1f\x8b", gzip.open), (b"BZh", bz2.open), (b"\xfd7zXZ\x00", lzma.open))
+# the layout of the entries of a CorpusCache - entries written with another version are built again
+CACHE_VERSION = 1
 
 
 def read_file(filename):
+    """
+    read in every line of a file completely as a list of all its fields (the header included)
+    this function is kept for backward compatibility only - the classes read the files with read_columns which
+    only keeps the columns in COLUMNS, so it can not return complete lines
+    the files are opened the same way as by read_columns (see expand_filenames and open_input)
+    :param filename: the file to read in the data from - several files can be given as a list or a glob pattern
+                     and compressed files are decompressed on the fly
+    :return: a list containing a list of the fields of every line
+    """
     complete_data = []
     # read data and store it in a list (line by line)
-    with open(filename, encoding="utf8") as f:
-        for lines in f:
-            line = lines.split('\t')
-            complete_data.append(line)
+    for path in expand_filenames(filename):
+        with io.TextIOWrapper(open_input(path), encoding="utf8") as f:
+            for lines in f:
+                line = lines.split('\t')
+                complete_data.append(line)
     return complete_data
 
 
+def expand_filenames(filenames):
+    """
+    get the files of a specification of one or several files
+    :param filenames: a filename, a glob pattern (e.g. "exports/*.tsv.gz") or a list of filenames and patterns
+    :return: a list of filenames (the files matching a pattern in sorted order)
+    """
+    if isinstance(filenames, (str, os.PathLike)):
+        filenames = [filenames]
+    expanded = []
+    for filename in map(os.fspath, filenames):
+        if any(character in filename for character in "*?["):
+            matches = sorted(glob.glob(filename))
+            if not matches:
+                raise FileNotFoundError("no file matches {}".format(filename))
+            expanded.extend(matches)
+        else:
+            expanded.append(filename)
+    return expanded
+
+
+def compression(filename):
+    """
+    recognize a compressed file by its first bytes such that the name of the file does not matter
+    :param filename: the name of the file
+    :return: the function opening the file (gzip.open, bz2.open or lzma.open) or None for a plain file
+    """
+    with open(filename, "rb") as f:
+        start = f.read(6)
+    for magic, opener in COMPRESSIONS:
+        if start.startswith(magic):
+            return opener
+    return None
+
+
+def open_input(filename):
+    """
+    open a plain or compressed (gzip, bz2 or xz) file for reading in binary mode
+    the file is read (and decompressed) in large blocks of BUFFER_SIZE bytes which are split into lines in memory
+    :param filename: the name of the file
+    :return: the opened file
+    """
+    opener = compression(filename)
+    if opener is None:
+        return open(filename, "rb", buffering=BUFFER_SIZE)
+    return io.BufferedReader(opener(filename, "rb"), buffer_size=BUFFER_SIZE)
+
+
+def read_columns(filename, columns=tuple(COLUMNS), byte_range=None):
+    """
+    stream the file line by line and only yield the requested columns
+    the positions of the columns are resolved by their names in the header
+    lines are only split as far as the last requested column and the other fields are not kept
+    :param filename: the file to read in the data from - several files can be given as a list or a glob pattern
+                     (see expand_filenames), compressed files are decompressed on the fly (see open_input)
+    :param columns: the names of the columns to extract (keys of COLUMNS)
+    :param byte_range: a tuple (start, end) to only read the lines starting within these byte offsets
+                       as given by shard_file (only for a single plain file) - default is None (the whole file)
+    :return: a generator yielding a tuple with the values of the requested columns for every line (header excluded)
+    """
+    if byte_range is not None:
+        with open(filename, "rb", buffering=BUFFER_SIZE) as f:
+            yield from stream_columns(f, columns, byte_range)
+        return
+    # every file has a header of its own
+    for path in expand_filenames(filename):
+        with open_input(path) as f:
+            yield from stream_columns(f, columns)
+
+
+def column_chunks(rows, columns, chunk_size=CHUNK_SIZE):
+    """
+    group streamed lines into chunks such that only one chunk is kept in memory at a time
+    :param rows: an iterator over tuples with the values of the columns of every line (e.g. from read_columns)
+    :param columns: the names of the columns in the order of the values
+    :param chunk_size: the number of lines of a chunk - default is CHUNK_SIZE
+    :return: a generator yielding a dictionary of the form {column name: list of values} for every chunk
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield {name: list(values) for name, values in zip(columns, zip(*chunk))}
+
+
+def read_chunks(filename, columns=tuple(COLUMNS), chunk_size=CHUNK_SIZE, byte_range=None):
+    """
+    stream one or several (compressed) files in chunks of lines (see read_columns and column_chunks)
+    :param filename: the file to read in the data from (or several files, see expand_filenames)
+    :param columns: the names of the columns to extract (keys of COLUMNS)
+    :param chunk_size: the number of lines of a chunk - default is CHUNK_SIZE
+    :param byte_range: a tuple (start, end) as given by shard_file - default is None (the whole file)
+    :return: a generator yielding a dictionary of the form {column name: list of values} for every chunk
+    """
+    return column_chunks(read_columns(filename, columns, byte_range), columns, chunk_size)
+
+
+def stream_columns(f, columns=tuple(COLUMNS), byte_range=None):
+    """
+    stream an open file line by line and only yield the requested columns (see read_columns)
+    the file does not need to be seekable (e.g. sys.stdin.buffer) unless a byte range is given
+    :param f: the file opened in binary mode
+    :param columns: the names of the columns to extract (keys of COLUMNS)
+    :param byte_range: a tuple (start, end) to only read the lines starting within these byte offsets
+                       as given by shard_file - default is None (the whole file)
+    :return: a generator yielding a tuple with the values of the requested columns for every line (header excluded)
+    """
+    first_line = f.readline()
+    header = first_line.decode("utf8").rstrip("\r\n").split('\t')
+    positions = [header.index(name) if name in header else COLUMNS[name] for name in columns]
+    lines = f
+    if byte_range is not None:
+        lines = _read_byte_range(f, *byte_range)
+    # a file without header starts with data right away
+    elif not any(name in header for name in columns):
+        lines = chain([first_line], f)
+    last_position = max(positions)
+    for line in lines:
+        line = line.decode("utf8").rstrip("\r\n")
+        if not line:  # skip empty lines
+            continue
+        fields = line.split('\t', last_position + 1)
+        yield tuple(fields[position] for position in positions)
+
+
+def _read_byte_range(f, start, end):
+    """
+    helper method to iterate over the lines of an open binary file which start within the given byte offsets
+    :param f: the file opened in binary mode
+    :param start: the offset of the first line
+    :param end: the offset up to which lines are read
+    :return: a generator yielding the lines
+    """
+    f.seek(start)
+    position = start
+    for line in f:
+        if position >= end:
+            break
+        position += len(line)
+        yield line
+
+
+def shard_file(filename, shards):
+    """
+    split a file into byte ranges of about the same size which start and end at line boundaries
+    the header is not part of any range
+    :param filename: the file to split
+    :param shards: the number of byte ranges
+    :return: a list of tuples (start, end) which can be passed to read_columns
+    """
+    size = os.path.getsize(filename)
+    with open(filename, "rb") as f:
+        first_line = f.readline()
+        header = first_line.decode("utf8").rstrip("\r\n").split('\t')
+        boundaries = [len(first_line) if any(name in header for name in COLUMNS) else 0]
+        for shard in range(1, shards):
+            target = boundaries[0] + (size - boundaries[0]) * shard // shards
+            # go to the end of the line the target offset is part of
+            f.seek(max(target, boundaries[-1], 1) - 1)
+            f.readline()
+            boundaries.append(f.tell())
+        boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+class Vocabulary:
+    """
+        This class maps every token to an integer id once
+        the token counts of all emotions are stored in arrays indexed by these ids (see TokenCounts)
+        such that the token strings are not repeated in a dictionary for every emotion
+        """
+    def __init__(self):
+        """
+        this is the constructor for the class Vocabulary
+            self.ids stores a dictionary of the form {token: id} - the ids follow the order of the first occurrence
+            self.tokens stores a list containing the token of every id
+        """
+        self.ids = dict()
+        self.tokens = []
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add(self, token):
+        """
+        get the id of a token, the token gets the next free id if it is not part of the vocabulary yet
+        :param token: the token to look up
+        :return: the id of the token
+        """
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+
+class HashedVocabulary:
+    """
+        This class maps every token to one of a fixed number of buckets by a hash of the token (feature hashing)
+        it can be used instead of a Vocabulary such that the count arrays have a fixed size no matter how many
+        distinct tokens occur - tokens sharing a bucket share their counts
+        the hash does not depend on the process such that the ids are the same in every process and run
+        """
+    def __init__(self, buckets):
+        """
+        this is the constructor for the class HashedVocabulary
+            self.buckets stores the number of buckets
+            self.ids stores the object itself since it can be used like the dictionary of the form {token: id}
+            self.tokens stores a range of the bucket ids since the tokens themselves are not kept
+        :param buckets: the number of buckets
+        """
+        if buckets < 1:
+            raise ValueError("the number of hash buckets has to be at least 1")
+        self.buckets = buckets
+        self.ids = self
+        self.tokens = range(buckets)
+
+    def __len__(self):
+        return self.buckets
+
+    def add(self, token):
+        """
+        get the id of a token, i.e. its bucket
+        :param token: the token to look up
+        :return: the id of the token
+        """
+        return zlib.crc32(token.encode("utf8")) % self.buckets
+
+    def get(self, token, default=None):
+        """
+        get the id of a token like the dictionary of a Vocabulary - every token has an id
+        :param token: the token to look up
+        :param default: not used since there are no unknown tokens
+        :return: the id of the token
+        """
+        return zlib.crc32(token.encode("utf8")) % self.buckets
+
+    def same_ids(self, other):
+        """
+        check whether another vocabulary maps the tokens to the same ids
+        :param other: a Vocabulary or HashedVocabulary object
+        :return: True if both hash into the same number of buckets
+        """
+        return isinstance(other, HashedVocabulary) and other.buckets == self.buckets
+
+
+class EmotionTokenCounts(Mapping):
+    """
+        This class provides a read-only dictionary view of the form {token: count} on the count array of one emotion
+        tokens with a count of 0 are not part of the view
+        """
+    def __init__(self, vocabulary, counts):
+        self.vocabulary = vocabulary
+        self.counts = counts
+
+    def __getitem__(self, token):
+        token_id = self.vocabulary.ids.get(token)
+        if token_id is None or token_id >= len(self.counts) or not self.counts[token_id]:
+            raise KeyError(token)
+        return self.counts[token_id]
+
+    def __iter__(self):
+        return (token for token, count in zip(self.vocabulary.tokens, self.counts) if count)
+
+    def __len__(self):
+        return len(self.counts) - self.counts.count(0)
+
+    def items(self):
+        return [(token, count) for token, count in zip(self.vocabulary.tokens, self.counts) if count]
+
+    def values(self):
+        return [count for count in self.counts if count]
+
+
+class TokenCounts(Mapping):
+    """
+        This class stores emotion dependent token counts in one array of unsigned integers per emotion
+        the arrays are indexed by the ids of a Vocabulary which can be shared between several TokenCounts objects
+        (e.g. the counts of DataInstance, EmotionInformation and DemographicInformation for the same file)
+        it can be read like a dictionary of the form {emotion: {token: count}} (see EmotionTokenCounts)
+        with a HashedVocabulary the keys of the inner dictionaries are the bucket ids instead of the tokens
+        """
+    def __init__(self, vocabulary=None):
+        """
+        this is the constructor for the class TokenCounts
+            self.vocabulary stores the Vocabulary object mapping the tokens to the indices of the arrays
+            self.arrays stores a dictionary of the form {emotion: array of counts}
+                        the arrays are only extended up to the largest id counted for the emotion
+        :param vocabulary: an existing Vocabulary object to share - default is None (a new vocabulary)
+        """
+        self.vocabulary = Vocabulary() if vocabulary is None else vocabulary
+        self.arrays = dict()
+
+    @classmethod
+    def from_dict(cls, dependent_token_count, vocabulary=None):
+        """
+        create the array-backed counts from a dictionary
+        :param dependent_token_count: a dictionary of the form {emotion: {token: count}}
+        :param vocabulary: an existing Vocabulary object to share - default is None (a new vocabulary)
+        :return: a TokenCounts object
+        """
+        token_counts = cls(vocabulary)
+        token_counts.merge(dependent_token_count)
+        return token_counts
+
+    def __getitem__(self, emotion):
+        return EmotionTokenCounts(self.vocabulary, self.arrays[emotion])
+
+    def __iter__(self):
+        return iter(self.arrays)
+
+    def __len__(self):
+        return len(self.arrays)
+
+    def count_array(self, emotion):
+        """
+        get the counts of an emotion as an array covering the complete vocabulary
+        :param emotion: the emotion to get the counts for
+        :return: an array of unsigned integers indexed by the token ids (zeros for an unknown emotion)
+        """
+        counts = self.arrays.get(emotion, array("I"))
+        if len(counts) < len(self.vocabulary):
+            counts.frombytes(bytes(counts.itemsize * (len(self.vocabulary) - len(counts))))
+        return counts
+
+    def add_tokens(self, emotion, words):
+        """
+        count the tokens of a sequence for the given emotion
+        :param emotion: the emotion of the sequence
+        :param words: the tokens of the sequence
+        """
+        counts = self.arrays.setdefault(emotion, array("I"))
+        ids, vocabulary = self.vocabulary.ids, self.vocabulary
+        for word in words:
+            token_id = ids.get(word)
+            if token_id is None:
+                token_id = vocabulary.add(word)
+            # the array only grows when a token with a larger id occurs for this emotion
+            if token_id >= len(counts):
+                counts.frombytes(bytes(counts.itemsize * (len(vocabulary) - len(counts))))
+            counts[token_id] += 1
+
+    def merge(self, additional_count):
+        """
+        add emotion dependent token counts to the existing ones
+        :param additional_count: a TokenCounts object or a dictionary of the form {emotion: {token: count}}
+        :return: the updated TokenCounts object
+        """
+        if not isinstance(additional_count, TokenCounts):
+            for emotion, token_counts in additional_count.items():
+                self.arrays.setdefault(emotion, array("I"))
+                token_ids = [self.vocabulary.add(word) for word in token_counts.keys()]
+                counts = self.count_array(emotion)
+                for token_id, count in zip(token_ids, token_counts.values()):
+                    counts[token_id] += count
+            return self
+        # the ids of the other vocabulary are translated once for all emotions
+        if additional_count.vocabulary is self.vocabulary or (isinstance(self.vocabulary, HashedVocabulary)
+                                                              and self.vocabulary.same_ids(additional_count.vocabulary)):
+            token_ids = None
+        elif isinstance(additional_count.vocabulary, HashedVocabulary):
+            raise ValueError("hashed counts can only be merged into hashed counts with the same number of buckets")
+        else:
+            token_ids = np.fromiter((self.vocabulary.add(word) for word in additional_count.vocabulary.tokens),
+                                    dtype=np.int64, count=len(additional_count.vocabulary))
+        for emotion, additional_counts in additional_count.arrays.items():
+            self.arrays.setdefault(emotion, array("I"))
+            counts = np.frombuffer(self.count_array(emotion), dtype=np.uintc)
+            additional_counts = np.frombuffer(additional_counts, dtype=np.uintc)
+            if token_ids is None:
+                counts[:len(additional_counts)] += additional_counts
+            else:
+                counts[token_ids[:len(additional_counts)]] += additional_counts
+        return self
+
+    def copy(self):
+        """
+        copy the counts - the copy shares the vocabulary since ids are never removed from it
+        :return: a TokenCounts object
+        """
+        token_counts = TokenCounts(self.vocabulary)
+        token_counts.arrays = {emotion: array("I", counts) for emotion, counts in self.arrays.items()}
+        return token_counts
+
+    def subtract(self, other_count):
+        """
+        get the difference to counts which were taken from the same lines (e.g. a part of the file)
+        :param other_count: a TokenCounts object with the same vocabulary and counts not larger than these ones
+        :return: a new TokenCounts object containing the difference
+        """
+        token_counts = TokenCounts(self.vocabulary)
+        for emotion, counts in self.arrays.items():
+            counts = np.frombuffer(counts, dtype=np.uintc).copy()
+            if emotion in other_count.arrays:
+                other_counts = np.frombuffer(other_count.arrays[emotion], dtype=np.uintc)
+                counts[:len(other_counts)] -= other_counts
+            token_counts.arrays[emotion] = array("I", counts.tobytes())
+        return token_counts
+
+    def prune(self, min_count=1, max_vocabulary=None):
+        """
+        get the counts of the frequent tokens only - the other tokens are dropped from the counts and the vocabulary
+        such that they are unknown tokens for the naive bayes calculation
+        the frequency of a token is its count summed over all emotions
+        :param min_count: the minimum frequency of a kept token - default is 1 (all tokens)
+        :param max_vocabulary: the maximum number of kept tokens, the most frequent ones are kept
+                               (the first ones in the order of the vocabulary in case of a tie) - default is None
+        :return: a new TokenCounts object with a Vocabulary of its own containing the kept tokens in the same order
+        """
+        if isinstance(self.vocabulary, HashedVocabulary):
+            raise ValueError("hashed counts can not be pruned")
+        frequencies = np.zeros(len(self.vocabulary), dtype=np.int64)
+        for counts in self.arrays.values():
+            counts = np.frombuffer(counts, dtype=np.uintc)
+            frequencies[:len(counts)] += counts
+        kept_ids = np.flatnonzero(frequencies >= min_count)
+        if max_vocabulary is not None and len(kept_ids) > max_vocabulary:
+            kept_ids = np.sort(kept_ids[np.argsort(-frequencies[kept_ids], kind="stable")[:max_vocabulary]])
+        vocabulary = Vocabulary()
+        vocabulary.tokens = [self.vocabulary.tokens[token_id] for token_id in kept_ids.tolist()]
+        vocabulary.ids = {token: token_id for token_id, token in enumerate(vocabulary.tokens)}
+        token_counts = TokenCounts(vocabulary)
+        for emotion in self.arrays:
+            counts = np.frombuffer(self.count_array(emotion), dtype=np.uintc)[kept_ids]
+            token_counts.arrays[emotion] = array("I", counts.tobytes())
+        return token_counts
+
+    def memory_size(self):
+        """
+        get the size of the count arrays in bytes (without the vocabulary)
+        :return: the number of bytes
+        """
+        return sum(counts.itemsize * len(counts) for counts in self.arrays.values())
+
+
+def count_parallel(columns, count_function, options, workers, vocabulary=None,
+                   column_names=("emotion", "generated_text")):
+    """
+    count emotion dependent tokens with several processes
+    the lines which were already read in are split into one part per process, every process counts the tokens
+    of its lines and the resulting counts are merged - the file is not read in again by the processes
+    only the tokenizing and counting is parallel, the file is still parsed by the main process beforehand
+    (use count_files to also parse the file in several processes)
+    only the columns needed by count_function are split and sent to the processes
+    :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+    :param count_function: a function of the form count_function(columns, vocabulary=..., **options) returning
+                           the counts as TokenCounts object - it has to be defined on module level
+    :param options: a dictionary with the keyword arguments for count_function
+    :param workers: the number of processes
+    :param vocabulary: the Vocabulary (or HashedVocabulary) object of the merged counts
+                       default is None (a new vocabulary)
+    :param column_names: the names of the columns read by count_function - default is ("emotion", "generated_text")
+    :return: a TokenCounts object
+    """
+    dependent_token_count = TokenCounts(vocabulary)
+    lines = len(columns["emotion"])
+    part_size = max(1, -(-lines // workers))
+    parts = [{name: columns[name][start:start + part_size] for name in column_names}
+             for start in range(0, lines, part_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        part_counts = executor.map(_count_part, [count_function] * len(parts), parts, [options] * len(parts),
+                                   [_worker_vocabulary(vocabulary)] * len(parts))
+        # the counts are merged in the order of the lines
+        for part_count in part_counts:
+            merge_counts(dependent_token_count, part_count)
+    return dependent_token_count
+
+
+def _worker_vocabulary(vocabulary):
+    """
+    helper method to get the vocabulary the counts of a process start from
+    a HashedVocabulary is handed to the processes such that they hash the tokens into the same buckets instead of
+    keeping every distinct token, otherwise every process starts from a new vocabulary whose ids are translated
+    when the counts are merged
+    :param vocabulary: the Vocabulary or HashedVocabulary object of the merged counts (or None)
+    :return: a new HashedVocabulary with the same number of buckets or None
+    """
+    if isinstance(vocabulary, HashedVocabulary):
+        return HashedVocabulary(vocabulary.buckets)
+    return None
+
+
+def _count_tasks(filename, workers):
+    """
+    helper method to split the counting of one or several files into tasks for several processes
+    a single plain file is split into byte ranges, otherwise every file is a task of its own
+    :param filename: the file to read in the data from (or several files, see expand_filenames)
+    :param workers: the number of processes
+    :return: a tuple of a list of filenames and a list of byte ranges (None for a whole file)
+    """
+    filenames = expand_filenames(filename)
+    if len(filenames) == 1 and compression(filenames[0]) is None:
+        byte_ranges = shard_file(filenames[0], workers)
+        return filenames * len(byte_ranges), byte_ranges
+    return filenames, [None] * len(filenames)
+
+
+def count_files(filename, count_function, options, workers=1, vocabulary=None, chunk_size=CHUNK_SIZE,
+                max_vocabulary=None):
+    """
+    count the emotions and the emotion dependent tokens out of core
+    the files are streamed in chunks of lines and only the running counts are kept in memory, such that the
+    lines of many (compressed) files can be counted without holding them in memory or decompressing them to disk
+    with several processes every process counts whole files (or a byte range of a single plain file)
+    if max_vocabulary is given, the running counts are pruned to the RUNNING_VOCABULARY * max_vocabulary most
+    frequent tokens whenever they hold twice as many tokens, such that their memory is bounded as well - this is
+    approximate since the earlier counts of a dropped token are lost if it occurs again later on, but the counts
+    are exact as long as the running vocabulary never grows beyond this bound
+    the counts still have to be pruned to max_vocabulary (and min_count) afterwards (see prune_counts)
+    :param filename: the file to read in the data from (or several files, see expand_filenames)
+    :param count_function: a function of the form count_function(columns, vocabulary=..., **options) returning
+                           the counts as TokenCounts object - it has to be defined on module level
+    :param options: a dictionary with the keyword arguments for count_function
+    :param workers: the number of processes - default is 1
+    :param vocabulary: the Vocabulary (or HashedVocabulary) object of the counts - default is None (a new vocabulary)
+    :param chunk_size: the number of lines counted at once - default is CHUNK_SIZE
+    :param max_vocabulary: the maximum number of tokens the counts are pruned to afterwards - default is None
+                           (the running counts keep every token)
+    :return: a tuple of a dictionary of the form {emotion: count} and a TokenCounts object
+    """
+    if workers <= 1:
+        return _count_chunks(count_function, filename, None, options, chunk_size, vocabulary, max_vocabulary)
+    emotion_counts, dependent_token_count = dict(), TokenCounts(vocabulary)
+    filenames, byte_ranges = _count_tasks(filename, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shard_counts = executor.map(_count_chunks, [count_function] * len(byte_ranges), filenames, byte_ranges,
+                                    [options] * len(byte_ranges), [chunk_size] * len(byte_ranges),
+                                    [_worker_vocabulary(vocabulary)] * len(byte_ranges),
+                                    [max_vocabulary] * len(byte_ranges))
+        # the counts are merged in the order of the files
+        for shard_emotion_counts, shard_count in shard_counts:
+            for emotion, count in shard_emotion_counts.items():
+                emotion_counts[emotion] = emotion_counts.get(emotion, 0) + count
+            merge_counts(dependent_token_count, shard_count)
+            dependent_token_count = _bound_running_counts(dependent_token_count, max_vocabulary)
+    return emotion_counts, dependent_token_count
+
+
+def _count_chunks(count_function, filename, byte_range, options, chunk_size, vocabulary=None, max_vocabulary=None):
+    """
+    helper method to count the emotions and tokens of files (or a byte range) chunk by chunk
+    :return: a tuple of a dictionary of the form {emotion: count} and a TokenCounts object
+    """
+    emotion_counts, dependent_token_count = dict(), TokenCounts(vocabulary)
+    for columns in read_chunks(filename, chunk_size=chunk_size, byte_range=byte_range):
+        for emotion in columns["emotion"]:
+            emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
+        # the counts of the chunk share the vocabulary of the running counts
+        dependent_token_count.merge(count_function(columns, vocabulary=dependent_token_count.vocabulary, **options))
+        dependent_token_count = _bound_running_counts(dependent_token_count, max_vocabulary)
+    return emotion_counts, dependent_token_count
+
+
+def _bound_running_counts(dependent_token_count, max_vocabulary):
+    """
+    helper method to prune the running counts of count_files once they hold too many tokens
+    :param dependent_token_count: a TokenCounts object
+    :param max_vocabulary: the maximum number of tokens the final counts are pruned to (or None)
+    :return: the pruned TokenCounts object or the given one if it is within the bound
+    """
+    if max_vocabulary is None or isinstance(dependent_token_count.vocabulary, HashedVocabulary):
+        return dependent_token_count
+    if len(dependent_token_count.vocabulary) <= 2 * RUNNING_VOCABULARY * max_vocabulary:
+        return dependent_token_count
+    return dependent_token_count.prune(max_vocabulary=RUNNING_VOCABULARY * max_vocabulary)
+
+
+def _count_part(count_function, columns, options, vocabulary=None):
+    """
+    helper method to count the tokens of a part of the lines in a separate process
+    :return: a TokenCounts object
+    """
+    return count_function(columns, vocabulary=vocabulary, **options)
+
+
+def prune_counts(dependent_token_count, min_count=1, max_vocabulary=None):
+    """
+    prune the counts if a minimum frequency or a maximum number of tokens is given (see TokenCounts.prune)
+    :param dependent_token_count: a TokenCounts object
+    :param min_count: the minimum frequency of a kept token - default is 1 (no pruning)
+    :param max_vocabulary: the maximum number of kept tokens - default is None (no pruning)
+    :return: the pruned TokenCounts object or the given one if nothing is pruned
+    """
+    if min_count <= 1 and max_vocabulary is None:
+        return dependent_token_count
+    return dependent_token_count.prune(min_count, max_vocabulary)
+
+
+def count_tokens(columns, tokenize=False, vocabulary=None):
+    """
+    count the frequency of the tokens in the generated text depending on the emotion
+    :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+    :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                     tokenizer following the nltk rules, see tokenizer.py) - default is False
+    :param vocabulary: the Vocabulary object mapping the tokens to ids - default is None (a new vocabulary)
+    :return: a TokenCounts object which can be read like a dictionary of the form {emotion: {token: count}}
+    """
+    dependent_token_count = TokenCounts(vocabulary)
+    # tokenize words properly if specified - split at whitespace otherwise
+    tokenizer = get_tokenizer(tokenize)
+    # count the tokens of every line in a single pass over the file
+    # the emotion of the line determines which dictionary is updated
+    for emotion, input_sequence in zip(columns["emotion"], columns["generated_text"]):
+        words = tokenizer(input_sequence.lower())
+        # increment the counts of the words in the array of the emotion
+        dependent_token_count.add_tokens(emotion, words)
+    count_calls("tokenize", len(columns["emotion"]))
+    return dependent_token_count
+
+
+def content_hash(filename):
+    """
+    get a hash of the content of a file (of the compressed bytes for a compressed file)
+    :param filename: the name of the file
+    :return: the hash as a hexadecimal string
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TokenSequences:
+    """
+        This class stores the tokens of every line of a file as integer ids in a single array
+        the ids of line i are stored between offsets[i] and offsets[i + 1] such that the arrays can be
+        memory-mapped from a CorpusCache instead of keeping a list of tokens for every line
+        """
+    def __init__(self, tokens, ids, offsets):
+        """
+        this is the constructor for the class TokenSequences
+            self.tokens stores a list containing the token of every id (in the order of the first occurrence)
+            self.ids stores a numpy array containing the token ids of all lines one after the other
+            self.offsets stores a numpy array containing the start of every line in self.ids
+                         followed by the end of the last line
+        :param tokens: the token of every id
+        :param ids: the token ids of all lines
+        :param offsets: the start of every line and the end of the last line
+        """
+        self.tokens = tokens
+        self.ids = ids
+        self.offsets = offsets
+
+    @classmethod
+    def from_streams(cls, token_streams):
+        """
+        store the tokens of every line as ids
+        :param token_streams: an iterable yielding a list of tokens for every line
+        :return: a TokenSequences object
+        """
+        vocabulary = Vocabulary()
+        ids, offsets = array("I"), array("q", [0])
+        for words in token_streams:
+            ids.extend(map(vocabulary.add, words))
+            offsets.append(len(ids))
+        return cls(vocabulary.tokens, np.frombuffer(ids, dtype=np.uintc), np.frombuffer(offsets, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        tokens, ids, offsets = self.tokens, self.ids.tolist(), self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield [tokens[token_id] for token_id in ids[start:end]]
+
+    def count(self, emotions, vocabulary=None):
+        """
+        count the tokens of every line for the emotion of the line - this gives the same counts (and token ids)
+        as counting the tokenized lines one by one (see count_tokens)
+        :param emotions: the emotion of every line
+        :param vocabulary: the Vocabulary object mapping the tokens to ids - default is None (a new vocabulary)
+        :return: a TokenCounts object which can be read like a dictionary of the form {emotion: {token: count}}
+        """
+        dependent_token_count = TokenCounts(vocabulary)
+        vocabulary = dependent_token_count.vocabulary
+        # the stored ids are translated once - the tokens are added to the vocabulary in the order of first occurrence
+        token_ids = np.fromiter(map(vocabulary.add, self.tokens), dtype=np.int64, count=len(self.tokens))[self.ids]
+        emotion_ids = {emotion: emotion_id for emotion_id, emotion in enumerate(dict.fromkeys(emotions))}
+        line_emotions = np.fromiter(map(emotion_ids.__getitem__, emotions), dtype=np.int64, count=len(emotions))
+        token_emotions = np.repeat(line_emotions, np.diff(self.offsets))
+        for emotion, emotion_id in emotion_ids.items():
+            counts = np.bincount(token_ids[token_emotions == emotion_id], minlength=len(vocabulary))
+            dependent_token_count.arrays[emotion] = array("I", counts.astype(np.uintc).tobytes())
+        return dependent_token_count
+
+
+class CorpusCache:
+    """
+        This class stores the parsed columns of files and the token ids of their lines in a directory
+        such that later runs neither read in nor tokenize the same files again
+        every entry is a directory of numpy arrays which are memory-mapped when they are loaded:
+        the columns with few distinct values are stored as codes of their values, the generated text as a single
+        block of text (the values never contain a line break) and the tokens as ids with the offsets of every line
+        for every tokenizer setting (see TokenSequences)
+        an entry is keyed by the paths of the files and only used as long as their size, modification time and
+        content hash are unchanged - the content is only hashed again if the size or modification time changed
+        """
+    def __init__(self, directory):
+        """
+        this is the constructor for the class CorpusCache
+            self.directory stores the name of the directory containing the entries
+        :param directory: the directory to store the entries in - it is created if it does not exist
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def entry(self, filenames):
+        """
+        helper method to get the directory of the entry of the files
+        :param filenames: a list of file names (see expand_filenames)
+        :return: the name of the directory
+        """
+        key = "\n".join(os.path.abspath(name) for name in filenames)
+        return os.path.join(self.directory, hashlib.blake2b(key.encode(), digest_size=16).hexdigest())
+
+    def write_file(self, filenames, name, write):
+        """
+        helper method to write a file of the entry - it is written to a temporary file which replaces the file
+        once it is complete such that other processes never read a partially written file
+        :param filenames: a list of file names (see expand_filenames)
+        :param name: the name of the file within the entry
+        :param write: a function writing the content to the given binary file object
+        """
+        path = os.path.join(self.entry(filenames), name)
+        temporary = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporary, "wb") as f:
+            write(f)
+        os.replace(temporary, path)
+
+    def write_array(self, filenames, name, values):
+        self.write_file(filenames, name + ".npy", lambda f: np.save(f, values))
+
+    def read_array(self, filenames, name):
+        return np.load(os.path.join(self.entry(filenames), name + ".npy"), mmap_mode="r")
+
+    def write_meta(self, filenames, meta):
+        self.write_file(filenames, "meta.json", lambda f: f.write(json.dumps(meta).encode()))
+
+    def read_meta(self, filenames):
+        """
+        helper method to read the description of the entry of the files if it is still valid
+        :param filenames: a list of file names (see expand_filenames)
+        :return: a dictionary of the form {"version": ..., "files": ..., "lines": ..., "columns": ..., "tokens": ...}
+                 or None if there is no valid entry
+        """
+        try:
+            with open(os.path.join(self.entry(filenames), "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != CACHE_VERSION or len(meta["files"]) != len(filenames):
+            return None
+        touched = False
+        for file, name in zip(meta["files"], filenames):
+            stat = os.stat(name)
+            if file["path"] != os.path.abspath(name) or file["size"] != stat.st_size:
+                return None
+            if file["mtime"] != stat.st_mtime_ns:
+                # a file which was only touched or copied is still valid if its content is unchanged
+                if file["hash"] != content_hash(name):
+                    return None
+                file["mtime"], touched = stat.st_mtime_ns, True
+        if touched:
+            self.write_meta(filenames, meta)
+        return meta
+
+    def load_columns(self, filenames):
+        """
+        load the parsed columns of the files
+        :param filenames: a list of file names (see expand_filenames)
+        :return: a dictionary of the form {column name: list of values} or None if there is no valid entry
+        """
+        meta = self.read_meta(filenames)
+        if meta is None:
+            return None
+        columns = dict()
+        try:
+            for name, values in meta["columns"].items():
+                codes = self.read_array(filenames, name)
+                if values is None:
+                    columns[name] = codes.tobytes().decode("utf-8").split("\n") if meta["lines"] else []
+                else:
+                    # the values of the label and feature columns are only stored once (see Corpus)
+                    values = [sys.intern(value) for value in values]
+                    columns[name] = [values[code] for code in codes.tolist()]
+        except OSError:
+            return None
+        return columns
+
+    def store_columns(self, filenames, columns):
+        """
+        store the parsed columns of the files in a new entry - an existing entry of the files is replaced
+        :param filenames: a list of file names (see expand_filenames)
+        :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+        """
+        os.makedirs(self.entry(filenames), exist_ok=True)
+        meta = {"version": CACHE_VERSION, "files": [], "lines": len(columns["emotion"]), "columns": dict(),
+                "tokens": dict()}
+        for name in filenames:
+            stat = os.stat(name)
+            meta["files"].append({"path": os.path.abspath(name), "size": stat.st_size, "mtime": stat.st_mtime_ns,
+                                  "hash": content_hash(name)})
+        for name, values in columns.items():
+            if name == "generated_text":
+                self.write_array(filenames, name, np.frombuffer("\n".join(values).encode("utf-8"), dtype=np.uint8))
+                meta["columns"][name] = None
+            else:
+                codes = {value: code for code, value in enumerate(dict.fromkeys(values))}
+                self.write_array(filenames, name, np.fromiter(map(codes.__getitem__, values), count=len(values),
+                                                              dtype=np.min_scalar_type(len(codes))))
+                meta["columns"][name] = list(codes)
+        # the description is written last such that the entry is only valid once it is complete
+        self.write_meta(filenames, meta)
+
+    def load_tokens(self, filenames, name):
+        """
+        load the token ids of the lines of the files for a tokenizer setting
+        :param filenames: a list of file names (see expand_filenames)
+        :param name: the name of the tokenizer setting (see Corpus.token_sequences)
+        :return: a TokenSequences object or None if there is no valid entry
+        """
+        meta = self.read_meta(filenames)
+        if meta is None or name not in meta["tokens"]:
+            return None
+        try:
+            tokens = self.read_array(filenames, name + ".vocabulary").tobytes().decode("utf-8").split("\n")
+            return TokenSequences(tokens if meta["tokens"][name] else [], self.read_array(filenames, name + ".ids"),
+                                  self.read_array(filenames, name + ".offsets"))
+        except OSError:
+            return None
+
+    def store_tokens(self, filenames, name, token_sequences):
+        """
+        add the token ids of the lines of the files for a tokenizer setting to the entry of the files
+        :param filenames: a list of file names (see expand_filenames)
+        :param name: the name of the tokenizer setting (see Corpus.token_sequences)
+        :param token_sequences: a TokenSequences object
+        """
+        meta = self.read_meta(filenames)
+        if meta is None:
+            return
+        # the tokens never contain a line break
+        self.write_array(filenames, name + ".vocabulary",
+                         np.frombuffer("\n".join(token_sequences.tokens).encode("utf-8"), dtype=np.uint8))
+        self.write_array(filenames, name + ".ids", token_sequences.ids)
+        self.write_array(filenames, name + ".offsets", token_sequences.offsets)
+        meta["tokens"][name] = len(token_sequences.tokens)
+        self.write_meta(filenames, meta)
+
+
+class Corpus:
+    """
+        This class stores the parsed content of a file so that every file is only read in once
+        all classes processing the same file (DataInstance, EmotionInformation, DemographicInformation and Evaluation)
+        draw from the same Corpus object which is handed out by load_corpus
+        """
+    @instrumented("read_file")
+    def __init__(self, filename, rows=None, cache=None):
+        """
+        this is the constructor for the class Corpus which reads in the file once
+        only the columns in COLUMNS are kept - they are stored column by column
+            self.filename stores the name of the file the content was read from (or a list of names)
+            self.cache stores the CorpusCache object the columns and tokens are loaded from and stored in (or None)
+            self.columns stores a dictionary of the form {column name: list of values for every line}
+        :param filename: the file to read in the data from (or several files, see expand_filenames)
+        :param rows: tuples with the values of the columns in COLUMNS (in that order) to use instead of reading
+                     the file (e.g. new lines for incremental training) - default is None
+        :param cache: a CorpusCache object to load the parsed file from if it is unchanged since it was stored
+                      default is None (the file is always read in)
+        """
+        self.filename = filename
+        self.cache = cache
+        if rows is None and cache is not None:
+            self.columns = cache.load_columns(expand_filenames(filename))
+            if self.columns is not None:
+                return
+        self.columns = {name: [] for name in COLUMNS}
+        appends = [self.columns[name].append for name in COLUMNS]
+        if rows is None:
+            rows = read_columns(filename)
+        for values in rows:
+            for name, append, value in zip(COLUMNS, appends, values):
+                # values of the label and feature columns repeat a lot and are only stored once
+                append(value if name == "generated_text" else sys.intern(value))
+        if cache is not None:
+            cache.store_columns(expand_filenames(filename), self.columns)
+
+    def token_sequences(self, tokenize=False, features=(), token_streams=None):
+        """
+        get the tokens of every line as ids - if the corpus has a cache they are loaded from it or tokenized once
+        and stored in it such that later runs do not tokenize the file again
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        :param features: the names of the features whose extra tokens are part of the lines - default is ()
+        :param token_streams: the tokens of every line including the extra tokens of the features
+                              (see FeaturePipeline.token_streams) - default is None (the tokens of the generated text)
+        :return: a TokenSequences object
+        """
+        name = "tokens-" + "+".join(["split" if not tokenize else "nltk" if tokenize is True else tokenize]
+                                    + list(features))
+        if self.cache is not None:
+            token_sequences = self.cache.load_tokens(expand_filenames(self.filename), name)
+            if token_sequences is not None:
+                return token_sequences
+        if token_streams is None:
+            # tokenize words properly if specified - split at whitespace otherwise
+            tokenizer = get_tokenizer(tokenize)
+            token_streams = (tokenizer(text.lower()) for text in self.columns["generated_text"])
+        token_sequences = TokenSequences.from_streams(token_streams)
+        count_calls("tokenize", len(token_sequences))
+        if self.cache is not None:
+            self.cache.store_tokens(expand_filenames(self.filename), name, token_sequences)
+        return token_sequences
+
+
+# the corpora which are currently in use - a corpus is dropped as soon as no class refers to it anymore
+_corpus_cache = weakref.WeakValueDictionary()
+
+
+def load_corpus(filename, cache_directory=None):
+    """
+    return the parsed content of the file, reading it in only if it is not already in use
+    the file's size and modification time are part of the key such that changed files are read in again
+    :param filename: the file to read in the data from - several files can be given as a list or a glob pattern
+                     (see expand_filenames) and compressed files are decompressed on the fly
+    :param cache_directory: a directory to keep the parsed and tokenized file in for later runs (see CorpusCache)
+                            default is None (no cache on disk)
+    :return: a Corpus object containing the content of all files
+    """
+    filenames = expand_filenames(filename)
+    key = tuple((os.path.abspath(name), stat.st_size, stat.st_mtime_ns)
+                for name, stat in zip(filenames, map(os.stat, filenames)))
+    if cache_directory is not None:
+        key += (os.path.abspath(cache_directory),)
+    corpus = _corpus_cache.get(key)
+    if corpus is None:
+        corpus = Corpus(filenames[0] if len(filenames) == 1 else filenames,
+                        cache=None if cache_directory is None else CorpusCache(cache_directory))
+        _corpus_cache[key] = corpus
+    return corpus
+
+
+def merge_counts(total_count, additional_count):
+    """
+    add emotion dependent token counts to existing ones
+    :param total_count: a TokenCounts object or a dictionary of the form {emotion: {token: count}} which is updated
+    :param additional_count: a TokenCounts object or a dictionary of the form {emotion: {token: count}}
+                             containing the counts to add
+    :return: the updated counts total_count
+    """
+    if isinstance(total_count, TokenCounts):
+        return total_count.merge(additional_count)
+    for emotion, token_counts in additional_count.items():
+        token_count = total_count.setdefault(emotion, dict())
+        for word, count in token_counts.items():
+            token_count[word] = token_count.get(word, 0) + count
+    return total_count
+
+
 class DataInstance:
     """
         This class provides methods to read-in and process the data from the input file
@@ -21,27 +1024,62 @@ class DataInstance:
 
         @author: Miriam S.
         """
-    def __init__(self, filename, tokenize=False):
+    def __init__(self, filename, tokenize=False, corpus=None, workers=1, min_count=1, max_vocabulary=None,
+                 hash_buckets=None, cache_directory=None):
         """
         this is the constructor for the class DataInstance which reads in the file in the first step
         it stores instance variables containing data content from the different files
-            self.file_content stores a list containing every line in the file separated by tab
+            self.corpus stores the Corpus object shared between all classes reading the same file
+            self.columns stores the columns of the file as dictionary of the form {column name: list of values}
             self.extracted_data stores a list containing the data (a string) which is inserted in the NB calculation
+                                (it is only extracted on first access)
             self.true_emotions stores a list containing all emotions labels serving as true emotions in the evaluation
             self.emotion_counts stores a dictionary with emotions together with their respective count in the file
                                 used to calculate prior probability in naive bayes
-            self.emotion_dependent_count stores two nested dictionaries counting tokens depending on their emotion
-                                         used to calculate likelihood
+            self.vocabulary stores the Vocabulary (or HashedVocabulary) object mapping the tokens of the file to
+                            integer ids - it is shared with the feature classes drawing from this DataInstance
+            self.emotion_dependent_count stores a TokenCounts object counting tokens depending on their emotion
+                                         used to calculate likelihood (it is only counted on first access such
+                                         that test files and advanced configurations are not counted needlessly)
+        the memory of the counts can be bounded for large files either by pruning rare tokens after counting
+        (min_count, max_vocabulary) or by hashing the tokens into a fixed number of buckets (hash_buckets)
         :param filename: the file to read in the data from
                          can be both training and test file depending on the specification in other files
+                         several (compressed) files can be given as a list or a glob pattern (see load_corpus)
+        :param corpus: a Corpus object to draw the data from instead of reading the file - default is None
+        :param workers: the number of processes counting the tokens of the file - default is 1
+        :param min_count: the minimum frequency of a token over all emotions to be kept in the counts
+                          default is 1 (all tokens)
+        :param max_vocabulary: the maximum number of tokens kept in the counts (the most frequent ones)
+                               default is None (all tokens)
+        :param hash_buckets: the number of buckets the tokens are hashed into instead of keeping a vocabulary
+                             (can not be combined with pruning) - default is None (no hashing)
+        :param cache_directory: a directory to keep the parsed columns and the token ids of the file in such that
+                                later runs load them instead of reading in and tokenizing the file again
+                                (see CorpusCache) - default is None (no cache on disk)
         """
+        if hash_buckets is not None and (min_count > 1 or max_vocabulary is not None):
+            raise ValueError("hashed counts can not be pruned - use either hash_buckets or min_count/max_vocabulary")
         self.tokenize = tokenize
-        self.file_content = read_file(filename)
-        self.extracted_data = self.extract_data()
+        self.workers = workers
+        self.min_count = min_count
+        self.max_vocabulary = max_vocabulary
+        self.hash_buckets = hash_buckets
+        self.corpus = load_corpus(filename, cache_directory) if corpus is None else corpus
+        self.columns = self.corpus.columns
         self.true_emotion = self.extract_emotion()
         self.emotion_counts = self.emotion_frequency()
-        self.emotion_dependent_count = self.emotion_dependent_frequency()
+        self.vocabulary = Vocabulary() if hash_buckets is None else HashedVocabulary(hash_buckets)
+
+    @cached_property
+    def extracted_data(self):
+        return self.extract_data()
+
+    @cached_property
+    def emotion_dependent_count(self):
+        return self.emotion_dependent_frequency()
 
+    @instrumented("extract_data")
     def extract_data(self):
         """
         helper method to extract the data for calculation
@@ -49,9 +1087,8 @@ class DataInstance:
         """
         text_data = []
         # extract the generated text to re-use for NB calculation
-        for line in self.file_content:
-            if line[17] != "generated_text":  # skip header
-                text_data.append(line[17].lower())
+        for text in self.columns["generated_text"]:
+            text_data.append(text.lower())
         return text_data
 
     def extract_emotion(self):
@@ -59,12 +1096,8 @@ class DataInstance:
         helper methods to extract the emotions in the correct order from the inserted file
         :return: a list of extracted emotions
         """
-        emotions = []
-        # extract the generated text to re-use for NB calculation
-        for line in self.file_content:
-            if line[1] != "emotion":  # skip header
-                emotions.append(line[1])
-        return emotions
+        # extract the emotions to re-use for the evaluation
+        return list(self.columns["emotion"])
 
     def emotion_frequency(self):
         """
@@ -75,45 +1108,30 @@ class DataInstance:
         # count the emotions
         # by adding one to the count if the emotion was found previously
         # or creating a new dictionary entry otherwise
-        for token in self.file_content:
-            if token[1] != "emotion":  # skip header
-                if token[1] not in emotion_count.keys():
-                    emotion_count[token[1]] = 1
-                else:
-                    emotion_count[token[1]] += 1
+        for emotion in self.columns["emotion"]:
+            if emotion not in emotion_count.keys():
+                emotion_count[emotion] = 1
+            else:
+                emotion_count[emotion] += 1
         return emotion_count
 
+    @instrumented("emotion_dependent_frequency")
     def emotion_dependent_frequency(self):
         """
         helper method to count the frequency of tokens depending on the emotion
-        :return: a dictionary of the form: {emotion: {token: count}}
-        """
-        total_dict, dependent_token_count = dict(), dict()
-        emotions = set(self.true_emotion)
-        # for every emotion create new dict with emotion as key
-        # consequently add text to corresponding key
-        for emotion in emotions:
-            total_dict[emotion] = []
-            for line in self.file_content:
-                if line[1] == emotion and line[17] != "generated_text":
-                    total_dict[emotion].append(line[17])
-        for emotion in total_dict.keys():
-            # tokenize words properly if specified - split at whitespace otherwise
-            if self.tokenize:
-                total_dict[emotion] = word_tokenize(' '.join(total_dict[emotion]).lower())
-            else:
-                total_dict[emotion] = ' '.join(total_dict[emotion]).lower().split()
-        # iterate over each emotion, collect emotion dependent vocabulary and create a new dict for each emotion
-        for emotion in emotions:
-            if emotion != "emotion":  # skip header
-                words = total_dict[emotion]
-                dependent_token_count[emotion] = dict()
-                # iterate over every word - if the word is already part of the emotion dependent dictionary
-                # increment the count, add a new entry otherwise
-                for word in words:
-                    if word in dependent_token_count[emotion].keys():
-                        dependent_token_count[emotion][word] += 1
-                    else:
-                        dependent_token_count[emotion][word] = 1
+        :return: a TokenCounts object which can be read like a dictionary of the form {emotion: {token: count}}
+        """
+        # the token ids of the lines are loaded from the cache on disk if there is one
+        if self.corpus.cache is not None:
+            dependent_token_count = self.corpus.token_sequences(self.tokenize).count(self.columns["emotion"],
+                                                                                     vocabulary=self.vocabulary)
+        # several processes count the tokens of a part of the file each if specified
+        elif self.workers > 1:
+            dependent_token_count = count_parallel(self.columns, count_tokens, {"tokenize": self.tokenize},
+                                                   self.workers, vocabulary=self.vocabulary)
+        else:
+            dependent_token_count = count_tokens(self.columns, tokenize=self.tokenize, vocabulary=self.vocabulary)
+        dependent_token_count = prune_counts(dependent_token_count, self.min_count, self.max_vocabulary)
+        # the feature classes share the pruned vocabulary such that the complete one is not kept
+        self.vocabulary = dependent_token_count.vocabulary
         return dependent_token_count
-
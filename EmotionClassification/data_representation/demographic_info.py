@@ -1,8 +1,54 @@
-from EmotionClassification.data_representation.data_representation import DataInstance
-from nltk.tokenize import word_tokenize
+from EmotionClassification.data_representation.features import FeatureInformation, age_category, gender_category, \
+    education_category
+from functools import cached_property
 
 
-class DemographicInformation:
+def age_categories(ages):
+    """
+    method to bin age
+
+    for every instance in the column that contains age it replaces the integer by a category (see age_category)
+    borders for the categories are chosen according to the equal frequency bins
+    the word "Age" is put at the beginning to avoid ambiguity with other tokens in later steps
+
+    :param ages: the values of the column containing age
+    :return prep_age: a dictionary that contains the preprocessed age category for each line {line:category}
+    """
+    # line numbers refer to the file - the header is line 1
+    return {line_num: age_category(age) for line_num, age in enumerate(ages, start=2)}
+
+
+def gender_categories(genders):
+    """
+    method to preprocess gender
+
+    for every instance in the column that contains gender, the gender category is orthographically simplified or/and
+    the feature label "Gender" is put before to avoid ambiguity with other tokens and cutting by the tokenizer in
+    later steps (see gender_category)
+
+    :param genders: the values of the column containing gender
+    :return prep_gender: dictionary that contains preprocessed gender category for each line {line:category}
+    """
+    return {line_num: gender_category(gender) for line_num, gender in enumerate(genders, start=2)
+            if gender_category(gender) is not None}
+
+
+def education_categories(educations):
+    """
+    method to preprocess education
+
+    for every instance in the column that contains education, the education category is orthographically simplified
+    or/and the feature label "Education" is put before to avoid ambiguity with other tokens and cutting by the
+    tokenizer in later steps (see education_category)
+
+    :param educations: the values of the column containing education
+    :return prep_education: dictionary that contains preprocessed education category for each line {line:category}
+    """
+    return {line_num: education_category(education) for line_num, education in enumerate(educations, start=2)
+            if education_category(education) is not None}
+
+
+class DemographicInformation(FeatureInformation):
     """
     This class provides methods to incorporate additional information in the naive bayes classifier
     for emotion classification
@@ -15,256 +61,78 @@ class DemographicInformation:
 
     @author: Linnet M.
     """
-    def __init__(self, filename, age=False, gender=False, education=False, tokenize=False):
+    def __init__(self, filename, age=False, gender=False, education=False, tokenize=False, data_instance=None,
+                 workers=1, min_count=1,
+                 max_vocabulary=None, hash_buckets=None, cache_directory=None):
         """
         this is the constructor for the class DemographicInformation which processes the file in the second step
-        it calls the initial DataInstance class to access the data
+        it calls the initial DataInstance class to access the data (or re-uses an existing one for the same file)
         depending on the configuration, this class incorporates more information
-            self.file_content_advanced stores a list containing every line in the file separated by tab
+            self.columns_advanced stores the columns of the file as dictionary of the form {column name: list of values}
             self.extracted_data_advanced stores a list containing the data (a string)
-                                         which is inserted in the NB calculation
-            self.emotion_dependent_count_advanced stores two nested dictionaries counting tokens
+                                         which is inserted in the NB calculation (extracted on first access)
+            self.emotion_dependent_count_advanced stores a TokenCounts object counting tokens
                                                   depending on their emotion
-                                                  used to calculate likelihood;
-        it also contains three methods, stored in variables, for preprocessing the additional features
+                                                  used to calculate likelihood (counted on first access);
+        it also contains three methods for preprocessing the additional features whose results are stored in
+        variables on first access (the extra tokens themselves are extracted by the feature pipeline)
 
         :param filename: the filename to read the data from
         :param age: boolean variable to activate incorporation of age - default is False
         :param gender:  boolean variable to activate incorporation of gender - default is False
         :param education:  boolean variable to activate incorporation of education - default is False
+        :param data_instance: an existing DataInstance for the same file to draw the data from - default is None
+        :param workers: the number of processes counting the tokens of the file - default is 1
+        :param min_count: the minimum frequency of a token over all emotions to be kept in the counts
+                          default is 1 (all tokens)
+        :param max_vocabulary: the maximum number of tokens kept in the counts (the most frequent ones)
+                               default is None (all tokens)
+        :param hash_buckets: the number of buckets the tokens are hashed into if a new DataInstance is created
+                             otherwise the vocabulary of the given DataInstance is used - default is None (no hashing)
+        :param cache_directory: a directory to keep the parsed and tokenized file in for later runs if a new
+                                DataInstance is created (see CorpusCache) - default is None (no cache on disk)
         """
         self.age = age
         self.gender = gender
         self.education = education
-        self.tokenize = tokenize
+        # the extra tokens are extracted by the feature pipeline (see FeatureInformation)
+        super().__init__(filename, features={"age": age, "gender": gender, "education": education},
+                         tokenize=tokenize, data_instance=data_instance, workers=workers, min_count=min_count,
+                         max_vocabulary=max_vocabulary, hash_buckets=hash_buckets,
+                         cache_directory=cache_directory)
 
-        self.data = DataInstance(filename, tokenize=self.tokenize)
-        self.file_content_advanced = self.data.file_content
+    @cached_property
+    def preprocessed_age(self):
+        return self.bin_age()
 
-        self.preprocessed_age = self.bin_age()
-        self.preprocessed_gender = self.categorize_gender()
-        self.preprocessed_education = self.categorize_education()
+    @cached_property
+    def preprocessed_gender(self):
+        return self.categorize_gender()
 
-        self.extracted_data_advanced = self.extract_data()
-        self.emotion_dependent_count_advanced = self.emotion_dependent_frequency()
+    @cached_property
+    def preprocessed_education(self):
+        return self.categorize_education()
 
     def bin_age(self):
         """
-        method to bin age
-
-        for every instance in the column that contains age it replaces the integer by a category
-        borders for the categories are chosen according to the equal frequency bins
-        the word "Age" is put at the beginning to avoid ambiguity with other tokens in later steps
+        method to bin age of every line in the file (see age_categories)
 
         :return prep_age: a dictionary that contains the preprocessed age category for each line {line:category}
         """
-
-        prep_age = {}
-        for line_num, line in enumerate(self.file_content_advanced, start=1):
-            if line[45] != "age":
-                age = int(line[45])
-                if age <= 24:
-                    prep_age[line_num] = "AgeYoung"
-                elif 25 <= age <= 32:
-                    prep_age[line_num] = "AgeMiddle"
-                elif age >= 33:
-                    prep_age[line_num] = "AgeOld"
-
-        return prep_age
+        return age_categories(self.columns_advanced["age"])
 
     def categorize_gender(self):
         """
-        method to preprocess gender
-
-        for every instance in the column that contains gender, the gender category is orthographically simplified or/and
-        the feature label "Gender" is put before to avoid ambiguity with other tokens and cutting by the tokenizer in
-        later steps
+        method to preprocess gender of every line in the file (see gender_categories)
 
         :return prep_gender: dictionary that contains preprocessed gender category for each line {line:category}
         """
-        prep_gender = {}
-        for line_num, line in enumerate(self.file_content_advanced, start=1):
-            if line[46] != "gender":
-                gender = line[46]
-                if gender == "Male":
-                    prep_gender[line_num] = "GenderMale"
-                elif gender == "Female":
-                    prep_gender[line_num] = "GenderFemale"
-                elif gender == "Gender Variant/Non-Conforming":
-                    prep_gender[line_num] = "GenderQueer"
-                elif gender == "Prefer not to answer":
-                    prep_gender[line_num] = "GenderNone"
-
-        return prep_gender
+        return gender_categories(self.columns_advanced["gender"])
 
     def categorize_education(self):
         """
-        method to preprocess education
-
-        for every instance in the column that contains education, the education category is orthographically simplified
-        or/and the feature label "Education" is put before to avoid ambiguity with other tokens and cutting by the
-        tokenizer in later steps
+        method to preprocess education of every line in the file (see education_categories)
 
         :return prep_education: dictionary that contains preprocessed education category for each line {line:category}
         """
-
-        prep_education = {}
-        for line_num, line in enumerate(self.file_content_advanced, start=1):
-            if line[47] != "education":
-                if line[47] == "High school":
-                    prep_education[line_num] = "EducationHighSchool"
-                if line[47] == "Undergraduate degree (BA/BSc/other)":
-                    prep_education[line_num] = "EducationUndergraduateDegree"
-                if line[47] == "Graduate degree (MA/MSc/MPhil/other)":
-                    prep_education[line_num] = "EducationGraduateDegree"
-                if line[47] == "Secondary education":
-                    prep_education[line_num] = "EducationSecondaryEducation"
-                if line[47] == "Doctorate degree (PhD/other)":
-                    prep_education[line_num] = "EducationDoctorateDegree"
-                if line[47] == "No formal qualifications":
-                    prep_education[line_num] = "EducationNone"
-                if line[47] == "Don't know / not applicable":
-                    prep_education[line_num] = "EducationNone"
-
-        return prep_education
-
-    def emotion_dependent_frequency(self):
-        """
-        helper method to count the frequency of tokens depending on the emotion
-        :return: a dictionary of the form: {emotion: {token: count}}
-        """
-
-        total_dict, dependent_token_count = dict(), dict()
-        emotions = set(self.data.true_emotion)
-
-        # for every emotion create new dict with emotion as key
-        # consequently add text to corresponding key
-        for emotion in emotions:
-            total_dict[emotion] = []
-            # count through the lines
-            for line_num, line in enumerate(self.file_content_advanced, start=1):
-                input_sequence = ""
-                if line[1] == emotion and line[17] != "generated_text":
-                    """
-                    in the advanced step the goal is to incorporate more information such as 
-                        age which is the age of the participant describing the event
-                        gender which is the gender of the participant describing the event
-                        education which is the education of the participant describing the event
-                    """
-                    if self.age and not self.gender and not self.education:
-                        input_sequence += line[17]
-                        # for every line add the corresponding preprocessed additional information
-                        if line_num in self.preprocessed_age:
-                            input_sequence += " " + self.preprocessed_age[line_num]
-                    elif self.gender and not self.age and not self.education:
-                        input_sequence += line[17]
-                        if line_num in self.preprocessed_gender:
-                            input_sequence += " " + self.preprocessed_gender[line_num]
-                    elif self.education and not self.age and not self.gender:
-                        input_sequence += line[17]
-                        if line_num in self.preprocessed_education:
-                            input_sequence += " " + self.preprocessed_education[line_num]
-                    elif self.age and self.gender and not self.education:
-                        input_sequence += line[17]
-                        if line_num in self.preprocessed_age:
-                            input_sequence += " " + self.preprocessed_age[line_num]
-                        if line_num in self.preprocessed_gender:
-                            input_sequence += " " + self.preprocessed_gender[line_num]
-                    elif self.age and self.education and not self.gender:
-                        input_sequence += line[17]
-                        if line_num in self.preprocessed_age:
-                            input_sequence += " " + self.preprocessed_age[line_num]
-                        if line_num in self.preprocessed_education:
-                            input_sequence += " " + self.preprocessed_education[line_num]
-                    elif self.gender and self.education and not self.age:
-                        input_sequence += line[17]
-                        if line_num in self.preprocessed_gender:
-                            input_sequence += " " + self.preprocessed_gender[line_num]
-                        if line_num in self.preprocessed_education:
-                            input_sequence += " " + self.preprocessed_education[line_num]
-                    elif self.age and self.gender and self.education:
-                        input_sequence += line[17]
-                        if line_num in self.preprocessed_age:
-                            input_sequence += " " + self.preprocessed_age[line_num]
-                        if line_num in self.preprocessed_gender:
-                            input_sequence += " " + self.preprocessed_gender[line_num]
-                        if line_num in self.preprocessed_education:
-                            input_sequence += " " + self.preprocessed_education[line_num]
-                    total_dict[emotion].append(input_sequence)
-
-        for emotion in total_dict.keys():
-            # tokenize words properly if specified - split at whitespace otherwise
-            if self.tokenize:
-                total_dict[emotion] = word_tokenize(' '.join(total_dict[emotion]).lower())
-            else:
-                total_dict[emotion] = ' '.join(total_dict[emotion]).lower().split()
-        # iterate over each emotion, collect emotion dependent vocabulary and create a new dict for each emotion
-        for emotion in emotions:
-            if emotion != "emotion":  # skip header
-                words = total_dict[emotion]
-                dependent_token_count[emotion] = dict()
-                # iterate over every word - if the word is already part of the emotion dependent dictionary
-                # increment the count, add a new entry otherwise
-                for word in words:
-                    if word in dependent_token_count[emotion].keys():
-                        dependent_token_count[emotion][word] += 1
-                    else:
-                        dependent_token_count[emotion][word] = 1
-
-        return dependent_token_count
-
-    def extract_data(self):
-        """
-        helper method to extract the data for calculation
-        :return: a list containing the data to calculate NB
-        """
-        text_data = []
-
-        # extract the generated text to re-use for NB calculation
-        # count through the lines
-
-        for line_num, line in enumerate(self.file_content_advanced, start=1):
-            if line[17] != "generated_text":  # skip header
-                input_sequence = ""
-                if self.age and not self.gender and not self.education:
-                    input_sequence += line[17].lower()
-                    # for every line add the corresponding additional information
-                    if line_num in self.preprocessed_age:
-                        input_sequence += " " + self.preprocessed_age[line_num]
-                elif self.gender and not self.age and not self.education:
-                    input_sequence += line[17].lower()
-                    if line_num in self.preprocessed_gender:
-                        input_sequence += " " + self.preprocessed_gender[line_num]
-                elif self.education and not self.age and not self.gender:
-                    input_sequence += line[17].lower()
-                    if line_num in self.preprocessed_education:
-                        input_sequence += " " + self.preprocessed_education[line_num]
-                elif self.age and self.gender and not self.education:
-                    input_sequence += line[17].lower()
-                    if line_num in self.preprocessed_age:
-                        input_sequence += " " + self.preprocessed_age[line_num]
-                    if line_num in self.preprocessed_gender:
-                        input_sequence += " " + self.preprocessed_gender[line_num]
-                elif self.age and self.education and not self.gender:
-                    input_sequence += line[17].lower()
-                    if line_num in self.preprocessed_age:
-                        input_sequence += " " + self.preprocessed_age[line_num]
-                    if line_num in self.preprocessed_education:
-                        input_sequence += " " + self.preprocessed_education[line_num]
-                elif self.gender and self.education and not self.age:
-                    input_sequence += line[17].lower()
-                    if line_num in self.preprocessed_gender:
-                        input_sequence += " " + self.preprocessed_gender[line_num]
-                    if line_num in self.preprocessed_education:
-                        input_sequence += " " + self.preprocessed_education[line_num]
-                elif self.age and self.gender and self.education:
-                    input_sequence += line[17].lower()
-                    if line_num in self.preprocessed_age:
-                        input_sequence += " " + self.preprocessed_age[line_num]
-                    if line_num in self.preprocessed_gender:
-                        input_sequence += " " + self.preprocessed_gender[line_num]
-                    if line_num in self.preprocessed_education:
-                        input_sequence += " " + self.preprocessed_education[line_num]
-                text_data.append(input_sequence)
-
-        return text_data
+        return education_categories(self.columns_advanced["education"])
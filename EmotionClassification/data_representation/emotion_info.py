@@ -1,8 +1,7 @@
-from EmotionClassification.data_representation.data_representation import DataInstance
-from nltk.tokenize import word_tokenize
+from EmotionClassification.data_representation.features import FeatureInformation
 
 
-class EmotionInformation:
+class EmotionInformation(FeatureInformation):
     """
     This class provides methods to incorporate additional information in the naive bayes classifier
     for emotion classification
@@ -16,172 +15,40 @@ class EmotionInformation:
 
     @author: Miriam S.
     """
-    def __init__(self, filename, event_duration=False, emotion_duration=False, intensity=False, tokenize=False):
+    def __init__(self, filename, event_duration=False, emotion_duration=False, intensity=False, tokenize=False,
+                 data_instance=None, workers=1, min_count=1,
+                 max_vocabulary=None, hash_buckets=None, cache_directory=None):
         """
         this is the constructor for the class EmotionInformation which processes the file in the second step
-        it calls the initial DataInstance class to access the data
+        it calls the initial DataInstance class to access the data (or re-uses an existing one for the same file)
         depending on the configuration, this class incorporates more information
-            self.file_content_advanced stores a list containing every line in the file separated by tab
+            self.columns_advanced stores the columns of the file as dictionary of the form {column name: list of values}
             self.extracted_data_advanced stores a list containing the data (a string)
-                                         which is inserted in the NB calculation
-            self.emotion_dependent_count_advanced stores two nested dictionaries counting tokens
+                                         which is inserted in the NB calculation (extracted on first access)
+            self.emotion_dependent_count_advanced stores a TokenCounts object counting tokens
                                                   depending on their emotion
-                                                  used to calculate likelihood
+                                                  used to calculate likelihood (counted on first access)
         :param filename: the filename to read the data from
         :param event_duration: boolean variable to activate incorporation of event_duration - default is False
         :param emotion_duration:  boolean variable to activate incorporation of emotion_duration - default is False
         :param intensity:  boolean variable to activate incorporation of intensity - default is False
+        :param data_instance: an existing DataInstance for the same file to draw the data from - default is None
+        :param workers: the number of processes counting the tokens of the file - default is 1
+        :param min_count: the minimum frequency of a token over all emotions to be kept in the counts
+                          default is 1 (all tokens)
+        :param max_vocabulary: the maximum number of tokens kept in the counts (the most frequent ones)
+                               default is None (all tokens)
+        :param hash_buckets: the number of buckets the tokens are hashed into if a new DataInstance is created
+                             otherwise the vocabulary of the given DataInstance is used - default is None (no hashing)
+        :param cache_directory: a directory to keep the parsed and tokenized file in for later runs if a new
+                                DataInstance is created (see CorpusCache) - default is None (no cache on disk)
         """
         self.event_duration = event_duration
         self.emotion_duration = emotion_duration
         self.intensity = intensity
-        self.tokenize = tokenize
-
-        self.data = DataInstance(filename, tokenize=self.tokenize)
-        self.file_content_advanced = self.data.file_content
-        self.extracted_data_advanced = self.extract_data()
-        self.emotion_dependent_count_advanced = self.emotion_dependent_frequency()
-
-    def emotion_dependent_frequency(self):
-        """
-        helper method to count the frequency of tokens depending on the emotion
-        :return: a dictionary of the form: {emotion: {token: count}}
-        """
-        total_dict, dependent_token_count = dict(), dict()
-        emotions = set(self.data.true_emotion)
-        # for every emotion create new dict with emotion as key
-        # consequently add text to corresponding key
-        for emotion in emotions:
-            total_dict[emotion] = []
-            for line in self.file_content_advanced:
-                input_sequence = ""
-                if line[1] == emotion and line[17] != "generated_text":
-                    """
-                    in the advanced step the goal is to incorporate more information such as 
-                        event_duration which indicates the duration of the described event
-                        emotion_duration which indicates the duration of the given emotion
-                        intensity which indicates the intensity of the emotion felt/described
-                    this information is added to the original text's string as an additional token
-                    the information is prefixed with "event", "emotion", and "intensity" 
-                    to make sure it is counted as the additional information
-                    and not as one of the original tokens
-                    """
-                    if self.event_duration and not self.emotion_duration and not self.intensity:
-                        input_sequence += line[17]
-                        input_sequence += " event" + line[19]
-                    elif self.emotion_duration and not self.event_duration and not self.intensity:
-                        input_sequence += line[17]
-                        # make sure value "I had none" is not split by tokenizer
-                        if "none" in line[20]:
-                            input_sequence += " emotionnone"
-                        else:
-                            input_sequence += " emotion" + line[20]
-                    elif self.intensity and not self.emotion_duration and not self.event_duration:
-                        input_sequence += line[17]
-                        input_sequence += " intensity" + line[21]
-                    elif self.event_duration and self.emotion_duration and not self.intensity:
-                        input_sequence += line[17]
-                        input_sequence += " event" + line[19]
-                        # make sure value "I had none" is not split by tokenizer
-                        if "none" in line[20]:
-                            input_sequence += " emotionnone"
-                        else:
-                            input_sequence += " emotion" + line[20]
-                    elif self.event_duration and self.intensity and not self.emotion_duration:
-                        input_sequence += line[17]
-                        input_sequence += " event" + line[19]
-                        input_sequence += " intensity" + line[21]
-                    elif self.emotion_duration and self.intensity and not self.event_duration:
-                        input_sequence += line[17]
-                        # make sure value "I had none" is not split by tokenizer
-                        if "none" in line[20]:
-                            input_sequence += " emotionnone"
-                        else:
-                            input_sequence += " emotion" + line[20]
-                        input_sequence += " intensity" + line[21]
-                    elif self.event_duration and self.intensity and self.emotion_duration:
-                        input_sequence += line[17]
-                        input_sequence += " event" + line[19]
-                        # make sure value "I had none" is not split by tokenizer
-                        if "none" in line[20]:
-                            input_sequence += " emotionnone"
-                        else:
-                            input_sequence += " emotion" + line[20]
-                        input_sequence += " intensity" + line[21]
-                    total_dict[emotion].append(input_sequence)
-        for emotion in total_dict.keys():
-            # tokenize words properly if specified - split at whitespace otherwise
-            if self.tokenize:
-                total_dict[emotion] = word_tokenize(' '.join(total_dict[emotion]).lower())
-            else:
-                total_dict[emotion] = ' '.join(total_dict[emotion]).lower().split()
-        # iterate over each emotion, collect emotion dependent vocabulary and create a new dict for each emotion
-        for emotion in emotions:
-            if emotion != "emotion":  # skip header
-                words = total_dict[emotion]
-                dependent_token_count[emotion] = dict()
-                # iterate over every word - if the word is already part of the emotion dependent dictionary
-                # increment the count, add a new entry otherwise
-                for word in words:
-                    if word in dependent_token_count[emotion].keys():
-                        dependent_token_count[emotion][word] += 1
-                    else:
-                        dependent_token_count[emotion][word] = 1
-        return dependent_token_count
-
-    def extract_data(self):
-        """
-        helper method to extract the data for calculation
-        :return: a list containing the data to calculate NB
-        """
-        text_data = []
-        # extract the generated text to re-use for NB calculation
-        for line in self.file_content_advanced:
-            if line[17] != "generated_text":  # skip header
-                input_sequence = ""
-                if self.event_duration and not self.emotion_duration and not self.intensity:
-                    input_sequence += line[17].lower()
-                    input_sequence += " event" + line[19].lower()
-                elif self.emotion_duration and not self.event_duration and not self.intensity:
-                    input_sequence += line[17].lower()
-                    # make sure value "I had none" is not split by tokenizer
-                    if "none" in line[20].lower():
-                        input_sequence += " emotionnone"
-                    else:
-                        input_sequence += " emotion" + line[20].lower()
-                elif self.intensity and not self.emotion_duration and not self.event_duration:
-                    input_sequence += line[17].lower()
-                    input_sequence += " intensity" + line[21].lower()
-                elif self.event_duration and self.emotion_duration and not self.intensity:
-                    input_sequence += line[17].lower()
-                    input_sequence += " event" + line[19].lower()
-                    # make sure value "I had none" is not split by tokenizer
-                    if "none" in line[20].lower():
-                        input_sequence += " emotionnone"
-                    else:
-                        input_sequence += " emotion" + line[20].lower()
-                elif self.event_duration and self.intensity and not self.emotion_duration:
-                    input_sequence += line[17].lower()
-                    input_sequence += " event" + line[19].lower()
-                    input_sequence += " intensity" + line[21].lower()
-                elif self.emotion_duration and self.intensity and not self.event_duration:
-                    input_sequence += line[17].lower()
-                    # make sure value "I had none" is not split by tokenizer
-                    if "none" in line[20].lower():
-                        input_sequence += " emotionnone"
-                    else:
-                        input_sequence += " emotion" + line[20].lower()
-                    input_sequence += " intensity" + line[21].lower()
-                elif self.event_duration and self.intensity and self.emotion_duration:
-                    input_sequence += line[17].lower()
-                    input_sequence += " event" + line[19].lower()
-                    # make sure value "I had none" is not split by tokenizer
-                    if "none" in line[20].lower():
-                        input_sequence += " emotionnone"
-                    else:
-                        input_sequence += " emotion" + line[20].lower()
-                    input_sequence += " intensity" + line[21].lower()
-                text_data.append(input_sequence)
-
-        return text_data
-
+        # the extra tokens are extracted by the feature pipeline (see FeatureInformation)
+        super().__init__(filename, features={"event_duration": event_duration, "emotion_duration": emotion_duration,
+                                             "intensity": intensity},
+                         tokenize=tokenize, data_instance=data_instance, workers=workers, min_count=min_count,
+                         max_vocabulary=max_vocabulary, hash_buckets=hash_buckets,
+                         cache_directory=cache_directory)
@@ -0,0 +1,316 @@
+from EmotionClassification.data_representation.data_representation import DataInstance, TokenCounts, \
+    count_parallel, prune_counts
+from EmotionClassification.instrumentation.instrumentation import instrumented, count_calls
+from EmotionClassification.data_representation.tokenizer import get_tokenizer
+from functools import cached_property
+
+# the registered feature extractors - a dictionary of the form {feature name: (column names, extractor)}
+# the extra tokens of a line follow the order in which the features were registered
+FEATURES = dict()
+# the built-in features as switched on by the boolean variables of the classes
+EMOTION_FEATURES = ("event_duration", "emotion_duration", "intensity")
+DEMOGRAPHIC_FEATURES = ("age", "gender", "education")
+
+# the categories of the demographic information
+# the feature label is put before to avoid ambiguity with other tokens and cutting by the tokenizer in later steps
+GENDER_CATEGORIES = {"Male": "GenderMale", "Female": "GenderFemale", "Gender Variant/Non-Conforming": "GenderQueer",
+                     "Prefer not to answer": "GenderNone"}
+EDUCATION_CATEGORIES = {"High school": "EducationHighSchool",
+                        "Undergraduate degree (BA/BSc/other)": "EducationUndergraduateDegree",
+                        "Graduate degree (MA/MSc/MPhil/other)": "EducationGraduateDegree",
+                        "Secondary education": "EducationSecondaryEducation",
+                        "Doctorate degree (PhD/other)": "EducationDoctorateDegree",
+                        "No formal qualifications": "EducationNone", "Don't know / not applicable": "EducationNone"}
+
+
+def register_feature(name, columns):
+    """
+    decorator to register a function extracting the additional information of a line as a feature
+    the function gets the values of the given columns of a line and returns the extra text added to the line
+    (prefixed with the name of the information to make sure it is not counted as one of the original tokens)
+    or None if the line does not get extra text
+    :param name: the name of the feature (e.g. "intensity")
+    :param columns: the names of the columns the function needs (keys of COLUMNS)
+    :return: the decorator
+    """
+    def decorator(function):
+        FEATURES[name] = (tuple(columns), function)
+        return function
+    return decorator
+
+
+@register_feature("event_duration", ("event_duration",))
+def event_duration_token(event_value):
+    """
+    event_duration indicates the duration of the described event
+    :param event_value: the value of the column event_duration
+    :return: the extra text of the line
+    """
+    return "event" + event_value
+
+
+@register_feature("emotion_duration", ("emotion_duration",))
+def emotion_duration_token(emotion_value):
+    """
+    emotion_duration indicates the duration of the given emotion
+    :param emotion_value: the value of the column emotion_duration
+    :return: the extra text of the line
+    """
+    # make sure value "I had none" is not split by tokenizer
+    if "none" in emotion_value.lower():
+        return "emotionnone"
+    return "emotion" + emotion_value
+
+
+@register_feature("intensity", ("intensity",))
+def intensity_token(intensity_value):
+    """
+    intensity indicates the intensity of the emotion felt/described
+    :param intensity_value: the value of the column intensity
+    :return: the extra text of the line
+    """
+    return "intensity" + intensity_value
+
+
+@register_feature("age", ("age",))
+def age_category(age):
+    """
+    method to bin the age of the participant describing the event
+    borders for the categories are chosen according to the equal frequency bins
+    :param age: the value of the column age
+    :return: the age category
+    """
+    age = int(age)
+    if age <= 24:
+        return "AgeYoung"
+    elif age <= 32:
+        return "AgeMiddle"
+    return "AgeOld"
+
+
+@register_feature("gender", ("gender",))
+def gender_category(gender):
+    """
+    method to preprocess the gender of the participant describing the event (see GENDER_CATEGORIES)
+    :param gender: the value of the column gender
+    :return: the gender category or None for unknown values
+    """
+    return GENDER_CATEGORIES.get(gender)
+
+
+@register_feature("education", ("education",))
+def education_category(education):
+    """
+    method to preprocess the education of the participant describing the event (see EDUCATION_CATEGORIES)
+    :param education: the value of the column education
+    :return: the education category or None for unknown values
+    """
+    return EDUCATION_CATEGORIES.get(education)
+
+
+def active_features(configuration):
+    """
+    get the switched on features of a configuration in the order of registration
+    :param configuration: a dictionary of the form {feature: True} or a list of feature names
+    :return: a list of feature names
+    """
+    if isinstance(configuration, dict):
+        configuration = [feature for feature, active in configuration.items() if active]
+    unknown = [feature for feature in configuration if feature not in FEATURES]
+    if unknown:
+        raise ValueError("unknown features {} - use one of {}".format(", ".join(unknown), ", ".join(FEATURES)))
+    return [feature for feature in FEATURES if feature in configuration]
+
+
+class FeaturePipeline:
+    """
+    This class composes registered features freely (e.g. intensity together with age and gender) and extracts
+    all of them in a single pass over the lines
+    Every line gives the generated text followed by the extra text of every feature - the same augmented
+    sequences are counted for training and predicted, so adding features does not add passes over the file
+
+    The file was created on     Sat October 17th 2026
+    """
+    def __init__(self, features=(), tokenize=False):
+        """
+        this is the constructor for the class FeaturePipeline
+            self.features stores the names of the features in the order of registration
+            self.columns stores the names of the columns needed to extract the features (starting with the text)
+        :param features: the names of registered features (see FEATURES) or a dictionary of the form
+                         {feature: True} - default is () (the generated text only)
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        """
+        self.features = active_features(features)
+        self.tokenize = tokenize
+        self.columns = ["generated_text"]
+        # every extractor gets the positions of its columns within self.columns
+        self.extractors = []
+        for feature in self.features:
+            columns, extractor = FEATURES[feature]
+            for column in columns:
+                if column not in self.columns:
+                    self.columns.append(column)
+            self.extractors.append((extractor, [self.columns.index(column) for column in columns]))
+
+    def extra_sequence(self, values):
+        """
+        helper method to get the extra text of a line
+        :param values: the values of the line in the order of self.columns
+        :return: the extra text (starting with a space if not empty)
+        """
+        input_sequence = ""
+        for extractor, positions in self.extractors:
+            extra = extractor(*[values[position] for position in positions])
+            if extra is not None:
+                input_sequence += " " + extra
+        return input_sequence
+
+    def rows(self, columns):
+        """
+        helper method to iterate over the values of the needed columns line by line
+        :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+        :return: an iterator over tuples with the values in the order of self.columns
+        """
+        return zip(*[columns[column] for column in self.columns])
+
+    def feature_sequences(self, columns):
+        """
+        get the extra text of every line
+        :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+        :return: a list containing a string (starting with a space if not empty) for every line
+        """
+        if not self.extractors:
+            return [""] * len(columns["generated_text"])
+        return [self.extra_sequence(values) for values in self.rows(columns)]
+
+    def sequences(self, columns):
+        """
+        get the augmented sequence of every line, i.e. the generated text followed by the extra text
+        :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+        :return: a generator yielding a string for every line
+        """
+        if not self.extractors:
+            return iter(columns["generated_text"])
+        return (values[0] + self.extra_sequence(values) for values in self.rows(columns))
+
+    def token_streams(self, columns):
+        """
+        get the tokens of the augmented sequence of every line (lowercased the same way as by NaiveBayes)
+        :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+        :return: a generator yielding a list of tokens for every line
+        """
+        tokenizer = get_tokenizer(self.tokenize)
+        return (tokenizer(input_sequence.lower()) for input_sequence in self.sequences(columns))
+
+
+def count_feature_tokens(columns, tokenize=False, features=(), vocabulary=None):
+    """
+    count the frequency of the tokens depending on the emotion including the extra tokens of the features
+    :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+    :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                     tokenizer following the nltk rules, see tokenizer.py) - default is False
+    :param features: the names of the features (see FEATURES) - default is () (the generated text only)
+    :param vocabulary: the Vocabulary object mapping the tokens to ids - default is None (a new vocabulary)
+    :return: a TokenCounts object which can be read like a dictionary of the form {emotion: {token: count}}
+    """
+    dependent_token_count = TokenCounts(vocabulary)
+    # count the tokens of every line in a single pass over the file
+    # the emotion of the line determines which dictionary is updated
+    for emotion, words in zip(columns["emotion"], FeaturePipeline(features, tokenize).token_streams(columns)):
+        dependent_token_count.add_tokens(emotion, words)
+    count_calls("tokenize", len(columns["emotion"]))
+    return dependent_token_count
+
+
+class FeatureInformation:
+    """
+    This class provides methods to incorporate any combination of registered features in the naive bayes
+    classifier for emotion classification (e.g. emotion and demographic information together)
+    The features are extracted by a FeaturePipeline drawing from the DataInstance of the file
+
+    The file was created on     Sat October 17th 2026
+    """
+    def __init__(self, filename, features=(), tokenize=False, data_instance=None, workers=1, min_count=1,
+                 max_vocabulary=None, hash_buckets=None, cache_directory=None):
+        """
+        this is the constructor for the class FeatureInformation which processes the file in the second step
+        it calls the initial DataInstance class to access the data (or re-uses an existing one for the same file)
+            self.columns_advanced stores the columns of the file as dictionary of the form {column name: list of values}
+            self.extracted_data_advanced stores a list containing the data (a string)
+                                         which is inserted in the NB calculation (extracted on first access)
+            self.emotion_dependent_count_advanced stores a TokenCounts object counting tokens
+                                                  depending on their emotion
+                                                  used to calculate likelihood (counted on first access)
+        :param filename: the filename to read the data from
+        :param features: the names of registered features (see FEATURES) or a dictionary of the form
+                         {feature: True} - default is ()
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        :param data_instance: an existing DataInstance for the same file to draw the data from - default is None
+        :param workers: the number of processes counting the tokens of the file - default is 1
+        :param min_count: the minimum frequency of a token over all emotions to be kept in the counts
+                          default is 1 (all tokens)
+        :param max_vocabulary: the maximum number of tokens kept in the counts (the most frequent ones)
+                               default is None (all tokens)
+        :param hash_buckets: the number of buckets the tokens are hashed into if a new DataInstance is created
+                             otherwise the vocabulary of the given DataInstance is used - default is None (no hashing)
+        :param cache_directory: a directory to keep the parsed and tokenized file in for later runs if a new
+                                DataInstance is created (see CorpusCache) - default is None (no cache on disk)
+        """
+        self.pipeline = FeaturePipeline(features, tokenize)
+        self.features = self.pipeline.features
+        self.tokenize = tokenize
+        self.workers = workers
+        self.min_count = min_count
+        self.max_vocabulary = max_vocabulary
+
+        if data_instance is None:
+            data_instance = DataInstance(filename, tokenize=self.tokenize, workers=self.workers,
+                                         min_count=min_count, max_vocabulary=max_vocabulary,
+                                         hash_buckets=hash_buckets, cache_directory=cache_directory)
+        self.data = data_instance
+        self.columns_advanced = self.data.columns
+
+    @cached_property
+    def extracted_data_advanced(self):
+        return self.extract_data()
+
+    @cached_property
+    def emotion_dependent_count_advanced(self):
+        return self.emotion_dependent_frequency()
+
+    @instrumented("emotion_dependent_frequency")
+    def emotion_dependent_frequency(self):
+        """
+        helper method to count the frequency of tokens depending on the emotion
+        the tokens are mapped to the same ids as the tokens of the DataInstance unless the counts are pruned
+        :return: a TokenCounts object which can be read like a dictionary of the form {emotion: {token: count}}
+        """
+        # several processes count the tokens of a part of the file each if specified
+        options = {"tokenize": self.tokenize, "features": self.features}
+        # pruned counts get a vocabulary of their own such that the shared one does not grow by the pruned tokens
+        vocabulary = self.data.vocabulary
+        if self.min_count > 1 or self.max_vocabulary is not None:
+            vocabulary = None
+        if self.data.corpus.cache is not None:
+            # the token ids of the augmented lines are loaded from the cache on disk (or stored there on the first run)
+            token_sequences = self.data.corpus.token_sequences(self.tokenize, self.features,
+                                                               self.pipeline.token_streams(self.columns_advanced))
+            dependent_token_count = token_sequences.count(self.columns_advanced["emotion"], vocabulary=vocabulary)
+        elif self.workers > 1:
+            dependent_token_count = count_parallel(self.columns_advanced, count_feature_tokens, options,
+                                                   self.workers, vocabulary=vocabulary,
+                                                   column_names=["emotion"] + self.pipeline.columns)
+        else:
+            dependent_token_count = count_feature_tokens(self.columns_advanced, vocabulary=vocabulary, **options)
+        return prune_counts(dependent_token_count, self.min_count, self.max_vocabulary)
+
+    @instrumented("extract_data")
+    def extract_data(self):
+        """
+        helper method to extract the data for calculation
+        :return: a list containing the data to calculate NB
+        """
+        # extract the generated text together with the extra text to re-use for NB calculation
+        return [input_sequence.lower() for input_sequence in self.pipeline.sequences(self.columns_advanced)]
@@ -0,0 +1,162 @@
+import re
+
+# the punctuation which is always a token of its own (as in the Treebank rules of the nltk tokenizer)
+_PUNCTUATION = ";@#$%&?!*()\\[\\]{}<>«»“”‘’„‒-―"
+# a word runs up to whitespace or punctuation - commas and colons only belong to a word if a digit follows
+# (e.g. "3,000" or "12:30"), periods and hyphens only if they are not repeated (ellipses and double dashes)
+_WORD = "(?:[^\\s.,:`\"" + _PUNCTUATION + "-]|[,:](?=\\d)|\\.(?!\\.)|-(?!-))+"
+_TOKEN = re.compile("\\.{2,}|--|[" + _PUNCTUATION + "]|`+|''|\"|[,:](?!\\d)|" + _WORD)
+# the characters after which a double quote opens a quotation
+_OPENING = " ([{<«“‘„`"
+# a period ends a sentence if it is only followed by closing brackets or quotes and whitespace
+_SENTENCE_END = re.compile("[\\])}>\"»”’]*(?:\\s|$)")
+_TEXT_END = re.compile("[\\])}>\"»”’\\s]*$")
+# a word ending in a period, possibly followed by closing single quotes
+_FINAL_PERIOD = re.compile("(.*[^.])\\.('*)$", re.S)
+# the clitics which are not split off if a quote is followed by them at the beginning of a word
+_CLITIC_START = re.compile("(?:re|ve|ll|m|t|s|d|n)\\b")
+# the abbreviations after which a period does not end a sentence (initials and words such as "e.g" are
+# recognized by their form)
+ABBREVIATIONS = frozenset(("mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs", "inc", "ltd", "corp", "jan",
+                           "feb", "aug", "sept", "oct", "nov", "dec", "approx", "dept", "fig"))
+# the contractions split into two tokens as by the nltk tokenizer
+CONTRACTIONS = {"cannot": ("can", "not"), "d'ye": ("d", "'ye"), "gimme": ("gim", "me"), "gonna": ("gon", "na"),
+                "gotta": ("got", "ta"), "lemme": ("lem", "me"), "more'n": ("more", "'n"), "wanna": ("wan", "na")}
+
+
+def regex_tokenize(text):
+    """
+    tokenize a text with a single pass of a precompiled regular expression following the Treebank rules of the
+    nltk tokenizer (word_tokenize), e.g. punctuation is split off, "don't" gives "do" and "n't" and double quotes
+    are turned into `` and ''
+    sentences are not split by a trained model (as nltk does) - a period followed by whitespace is taken as the
+    end of a sentence unless it follows an abbreviation (see ABBREVIATIONS), an initial or a word like "e.g"
+    the texts are lowercased before tokenization in this project, the rules are only complete for lowercase text
+    :param text: the text to tokenize
+    :return: a list of tokens
+    """
+    tokens = []
+    for match in _TOKEN.finditer(text):
+        token = match.group()
+        start = match.start()
+        if token == '"' or token == "''":
+            # a quote at the beginning of the text or after whitespace, an opening bracket or an opening quote
+            # opens a quotation
+            if start == 0:
+                opening = token == '"'
+            else:
+                opening = text[start - 1] in _OPENING or (text[start - 1] == '"' and tokens[-1] == "``")
+            tokens.append("``" if opening else "''")
+        elif token[-1] != "." and "'" not in token:
+            # most words are neither split nor changed
+            tokens.extend(CONTRACTIONS.get(token, (token,)))
+        else:
+            _split_word(text, token, match.end(), tokens)
+    return tokens
+
+
+def _split_word(text, word, end, tokens):
+    """
+    helper method to split a word into tokens (leading quote, clitics, contractions and a final period)
+    :param text: the tokenized text
+    :param word: the word as matched in the text
+    :param end: the position after the word in the text
+    :param tokens: the list the tokens are appended to
+    """
+    # a quote at the beginning of a word is a token of its own unless a clitic follows (e.g. 's)
+    if word[0] == "'" and len(word) > 1 and (word[1].isalnum() or word[1] == "_") \
+            and not _CLITIC_START.match(word, 1):
+        tokens.append("'")
+        word = word[1:]
+    trailing = []
+    final_period = _FINAL_PERIOD.match(word)
+    if final_period is not None and _SENTENCE_END.match(text, end) is not None:
+        core = final_period.group(1)
+        if _TEXT_END.match(text, end) is not None or not _is_abbreviation(core):
+            word = core
+            trailing.append(".")
+            if final_period.group(2):
+                trailing.append(final_period.group(2))
+    # clitics at the end of a word are split off (the character before them must not be a quote)
+    if len(word) > 3 and word[-3:] in ("n't", "'ll", "'re", "'ve") and word[-4] != "'":
+        trailing.insert(0, word[-3:])
+        word = word[:-3]
+    elif len(word) > 2 and word[-2:] in ("'s", "'m", "'d") and word[-3] != "'":
+        trailing.insert(0, word[-2:])
+        word = word[:-2]
+    elif len(word) > 1 and word[-1] == "'" and word[-2] != "'":
+        trailing.insert(0, "'")
+        word = word[:-1]
+    if word in CONTRACTIONS:
+        tokens.extend(CONTRACTIONS[word])
+    else:
+        tokens.append(word)
+    tokens.extend(trailing)
+
+
+def _is_abbreviation(word):
+    """
+    helper method to check whether a period after a word does not end the sentence
+    :param word: the word before the period
+    :return: True for abbreviations, initials (e.g. "j") and words containing periods (e.g. "e.g")
+    """
+    return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()) or "." in word
+
+
+def nltk_tokenize(text):
+    """
+    tokenize a text with the nltk tokenizer - nltk is only imported once this tokenizer is used
+    :param text: the text to tokenize
+    :return: a list of tokens
+    """
+    from nltk.tokenize import word_tokenize
+    return word_tokenize(text)
+
+
+def get_tokenizer(tokenize):
+    """
+    get the tokenizer for the value of the parameter tokenize of the classes
+    :param tokenize: False (splitting at whitespace), True or "nltk" (the nltk tokenizer)
+                     or "regex" (regex_tokenize which follows the rules of the nltk tokenizer but is much faster)
+    :return: a function taking a text and returning a list of tokens
+    """
+    if not tokenize:
+        return str.split
+    if tokenize is True or tokenize == "nltk":
+        return nltk_tokenize
+    if tokenize == "regex":
+        return regex_tokenize
+    raise ValueError("unknown tokenizer {} - use False, True, \"nltk\" or \"regex\"".format(tokenize))
+
+
+def tokenizer_agreement(texts, tokenize="regex", reference="nltk"):
+    """
+    measure how often two tokenizers agree, e.g. to validate regex_tokenize against the nltk tokenizer on a corpus
+    :param texts: a list of texts (lowercased as they are before tokenization)
+    :param tokenize: the tokenizer to validate (see get_tokenizer) - default is "regex"
+    :param reference: the tokenizer to compare with (see get_tokenizer) - default is "nltk"
+    :return: a dictionary of the form {"texts": ..., "agreement": ..., "token_agreement": ..., "differences": ...}
+             containing the share of texts tokenized identically, the share of tokens which are equal in both
+             (counted as multisets per text) and up to 20 examples of the form (text, tokens, reference tokens)
+    """
+    tokenizer, reference_tokenizer = get_tokenizer(tokenize), get_tokenizer(reference)
+    identical, common_tokens, reference_tokens, differences = 0, 0, 0, []
+    for text in texts:
+        tokens, expected = tokenizer(text), reference_tokenizer(text)
+        if tokens == expected:
+            identical += 1
+            common_tokens += len(expected)
+        else:
+            remaining = dict()
+            for token in tokens:
+                remaining[token] = remaining.get(token, 0) + 1
+            for token in expected:
+                if remaining.get(token, 0) > 0:
+                    remaining[token] -= 1
+                    common_tokens += 1
+            if len(differences) < 20:
+                differences.append((text, tokens, expected))
+        reference_tokens += len(expected)
+    return {"texts": len(texts), "agreement": identical / len(texts) if texts else 1.0,
+            "token_agreement": common_tokens / reference_tokens if reference_tokens else 1.0,
+            "differences": differences}
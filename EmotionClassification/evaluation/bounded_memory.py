@@ -0,0 +1,115 @@
+from EmotionClassification.data_representation.data_representation import HashedVocabulary
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+from EmotionClassification.evaluation.evaluation import Evaluation
+import sys
+
+# the bounded-memory settings compared by default - every setting holds keyword arguments of NaiveBayes
+SETTINGS = ({"min_count": 2}, {"min_count": 5}, {"max_vocabulary": 10000}, {"hash_buckets": 1 << 16},
+            {"hash_buckets": 1 << 18})
+
+
+def vocabulary_memory_size(vocabulary):
+    """
+    estimate the memory of a vocabulary, i.e. of its dictionary, its list and the token strings
+    :param vocabulary: a Vocabulary or HashedVocabulary object
+    :return: the number of bytes (0 for a HashedVocabulary since it does not keep the tokens)
+    """
+    if isinstance(vocabulary, HashedVocabulary):
+        return 0
+    return sys.getsizeof(vocabulary.ids) + sys.getsizeof(vocabulary.tokens) \
+        + sum(sys.getsizeof(token) for token in vocabulary.tokens)
+
+
+class BoundedMemoryComparison:
+    """
+    This class measures the accuracy loss of the bounded-memory training modes of the naive bayes classifier
+    (pruning rare tokens with min_count / max_vocabulary and hashing the tokens with hash_buckets)
+    Every setting is trained on the training file, evaluated on the test file and compared with the model
+    trained on the exact counts of all tokens
+
+    The file was created on     Sat October 17th 2026
+    """
+    def __init__(self, filename_train, filename_test, settings=SETTINGS, event_duration=False, emotion_duration=False,
+                 intensity=False, age=False, gender=False, education=False, tokenize=False, workers=1):
+        """
+        this is the constructor for the class BoundedMemoryComparison which evaluates every setting in the first step
+            self.results stores a dictionary of the form {setting name: {"accuracy": ..., "macro_f1": ...,
+                         "accuracy_loss": ..., "macro_f1_loss": ..., "agreement": ..., "vocabulary_size": ...,
+                         "count_bytes": ..., "vocabulary_bytes": ...}} starting with the exact counts ("exact")
+                         the losses are the differences to the exact counts (positive if the setting is worse)
+                         the agreement is the share of test lines predicted the same way as with the exact counts
+        :param filename_train: the name of the training file
+        :param filename_test: the name of the test file
+        :param settings: a list of dictionaries with the keyword arguments min_count, max_vocabulary or
+                         hash_buckets of NaiveBayes - default is SETTINGS
+        :param event_duration: boolean variable to activate incorporation of event_duration - default is False
+        :param emotion_duration:  boolean variable to activate incorporation of emotion_duration - default is False
+        :param intensity:  boolean variable to activate incorporation of intensity - default is False
+        :param age: boolean variable to activate incorporation of age - default is False
+        :param gender:  boolean variable to activate incorporation of gender - default is False
+        :param education:  boolean variable to activate incorporation of education - default is False
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        :param workers: the number of processes counting the tokens of the training file - default is 1
+        """
+        self.filename_train = filename_train
+        self.filename_test = filename_test
+        self.features = {"event_duration": event_duration, "emotion_duration": emotion_duration,
+                         "intensity": intensity, "age": age, "gender": gender, "education": education}
+        self.tokenize = tokenize
+        self.workers = workers
+
+        exact, exact_labels = self.evaluate_setting(dict())
+        self.results = {"exact": exact}
+        for setting in settings:
+            result, predicted_labels = self.evaluate_setting(setting)
+            result["accuracy_loss"] = exact["accuracy"] - result["accuracy"]
+            result["macro_f1_loss"] = exact["macro_f1"] - result["macro_f1"]
+            result["agreement"] = sum(label == exact_label for label, exact_label in
+                                      zip(predicted_labels, exact_labels)) / len(exact_labels)
+            self.results[self.setting_name(setting)] = result
+
+    @staticmethod
+    def setting_name(setting):
+        """
+        helper method to get a readable name for a setting
+        :param setting: a dictionary with the keyword arguments of NaiveBayes
+        :return: the name of the setting, e.g. "min_count=2"
+        """
+        return ",".join(key + "=" + str(value) for key, value in setting.items()) or "exact"
+
+    def evaluate_setting(self, setting):
+        """
+        train and evaluate the model of a setting
+        :param setting: a dictionary with the keyword arguments of NaiveBayes
+        :return: a dictionary containing the scores and the size of the counts
+                 and a list containing the predicted labels of the test file
+        """
+        model = NaiveBayes(self.filename_train, tokenize=self.tokenize, workers=self.workers, **self.features,
+                           **setting)
+        evaluation = Evaluation(None, self.filename_test, tokenize=self.tokenize, model=model, **self.features)
+        gold_labels = evaluation.data_test.true_emotion
+        dependent_token_count = model.get_dependent_counts()
+        result = {"accuracy": sum(gold == predicted for gold, predicted in
+                                  zip(gold_labels, evaluation.predicted_labels)) / len(gold_labels),
+                  "macro_f1": evaluation.macro["f1"], "accuracy_loss": 0.0, "macro_f1_loss": 0.0, "agreement": 1.0,
+                  "vocabulary_size": len(dependent_token_count.vocabulary),
+                  "count_bytes": dependent_token_count.memory_size(),
+                  "vocabulary_bytes": vocabulary_memory_size(dependent_token_count.vocabulary)}
+        return result, evaluation.predicted_labels
+
+    def write_file(self, filename_output):
+        """
+        helper method to store the results of every setting in a separate .tsv file
+        :param filename_output: the tsv-file's name for storing the output
+        :return: returns a message after successfully writing file
+        """
+        with open(filename_output, 'w') as file:
+            file.write("Setting \t Accuracy \t Accuracy loss \t Macro F1 \t Macro F1 loss \t Agreement \t "
+                       "Vocabulary \t Count bytes \t Vocabulary bytes")
+            for name, result in self.results.items():
+                file.write("\n" + name + "\t" + "%.4f" % result["accuracy"] + "\t" + "%.4f" % result["accuracy_loss"]
+                           + "\t" + "%.4f" % result["macro_f1"] + "\t" + "%.4f" % result["macro_f1_loss"] + "\t"
+                           + "%.4f" % result["agreement"] + "\t" + str(result["vocabulary_size"]) + "\t"
+                           + str(result["count_bytes"]) + "\t" + str(result["vocabulary_bytes"]))
+        return "File {} was successfully written.".format(filename_output)
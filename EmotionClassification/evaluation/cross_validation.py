@@ -0,0 +1,155 @@
+from EmotionClassification.data_representation.data_representation import load_corpus, Vocabulary, TokenCounts
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+from EmotionClassification.data_representation.features import FeaturePipeline
+from EmotionClassification.evaluation.evaluation import calc_values_classes, calc_precision, calc_recall, calc_f1, \
+    calc_macro
+import itertools
+
+
+class CrossValidation:
+    """
+    This class provides a k-fold cross-validation of the naive bayes classifier on a single file
+    The file is split into consecutive folds, every fold is predicted by a model trained on the remaining folds
+    The file is only read in and tokenized once - the counts of every fold are kept and the counts of a model are
+    derived by subtracting the counts of the held-out fold from the counts of the whole file
+    It is the k-fold mode of Evaluation (see Evaluation.cross_validate) but a class of its own since it evaluates
+    k models on a single file, whereas an Evaluation object holds the model and predictions of one training and
+    one test file
+
+    The file was created on     Sat October 17th 2026
+    """
+    def __init__(self, filename, folds=5, event_duration=False, emotion_duration=False, intensity=False, age=False,
+                 gender=False, education=False, tokenize=False):
+        """
+        this is the constructor for the class CrossValidation which evaluates every fold in the first step
+            self.tokens stores a list with the tokens of every line (including the additional information)
+            self.vocabulary stores the Vocabulary object shared by the counts of all folds
+            self.fold_emotion_counts and self.fold_counts store the counts of every fold as a list of
+                                                         dictionaries of the form {emotion: count}
+                                                         and a list of TokenCounts objects
+            self.emotion_counts and self.dependent_token_count store the same counts for the whole file
+            self.fold_results stores a list with a dictionary of the form {"emotion_dict": ..., "precision": ...,
+                              "recall": ..., "f1": ...} for every fold
+            self.precision, self.recall and self.f1 store the mean scores of every emotion over the folds
+        :param filename: the name of the file to cross-validate on
+        :param folds: the number of folds - default is 5
+        :param event_duration: boolean variable to activate incorporation of event_duration - default is False
+        :param emotion_duration:  boolean variable to activate incorporation of emotion_duration - default is False
+        :param intensity:  boolean variable to activate incorporation of intensity - default is False
+        :param age: boolean variable to activate incorporation of age - default is False
+        :param gender:  boolean variable to activate incorporation of gender - default is False
+        :param education:  boolean variable to activate incorporation of education - default is False
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        """
+        self.folds = folds
+        self.tokenize = tokenize
+        self.configuration = {"event_duration": event_duration, "emotion_duration": emotion_duration,
+                              "intensity": intensity, "age": age, "gender": gender, "education": education}
+
+        self.corpus = load_corpus(filename)
+        self.true_emotion = self.corpus.columns["emotion"]
+        if folds < 2:
+            raise ValueError("cross-validation needs at least 2 folds")
+        if len(self.true_emotion) < folds:
+            raise ValueError("the file {} contains fewer lines than folds".format(filename))
+        # the folds are consecutive parts of the file - fold i contains the lines from boundaries[i] to boundaries[i+1]
+        self.boundaries = [len(self.true_emotion) * fold // folds for fold in range(folds + 1)]
+
+        # every line is tokenized once - the same way as the test data in Evaluation
+        self.tokens = list(FeaturePipeline(self.configuration, tokenize).token_streams(self.corpus.columns))
+        self.vocabulary = Vocabulary()
+        self.fold_emotion_counts, self.fold_counts = self.count_folds()
+        self.emotion_counts, self.dependent_token_count = dict(), TokenCounts(self.vocabulary)
+        for emotion_counts, token_counts in zip(self.fold_emotion_counts, self.fold_counts):
+            for emotion, count in emotion_counts.items():
+                self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + count
+            self.dependent_token_count.merge(token_counts)
+
+        self.fold_results = [self.evaluate_fold(fold) for fold in range(folds)]
+        self.precision = self.mean_scores("precision")
+        self.recall = self.mean_scores("recall")
+        self.f1 = self.mean_scores("f1")
+
+    def count_folds(self):
+        """
+        helper method to count the emotions and the emotion dependent tokens of every fold separately
+        :return: two lists containing a dictionary of the form {emotion: count}
+                 and a TokenCounts object for every fold
+        """
+        fold_emotion_counts, fold_counts = [], []
+        for start, end in zip(self.boundaries, self.boundaries[1:]):
+            emotion_counts, dependent_token_count = dict(), TokenCounts(self.vocabulary)
+            for emotion, tokens in zip(self.true_emotion[start:end], self.tokens[start:end]):
+                emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
+                dependent_token_count.add_tokens(emotion, tokens)
+            fold_emotion_counts.append(emotion_counts)
+            fold_counts.append(dependent_token_count)
+        return fold_emotion_counts, fold_counts
+
+    def fold_model(self, fold):
+        """
+        derive the model trained on all folds but the given one by subtracting the counts of the held-out fold
+        :param fold: the index of the held-out fold
+        :return: a NaiveBayes object
+        """
+        start, end = self.boundaries[fold], self.boundaries[fold + 1]
+        held_out_emotions = self.fold_emotion_counts[fold]
+        remaining = {emotion for emotion, count in self.emotion_counts.items()
+                     if count > held_out_emotions.get(emotion, 0)}
+        # the emotions keep the order of their first occurrence in the training lines since ties are decided by it
+        emotion_counts = dict()
+        for emotion in itertools.chain(self.true_emotion[:start], self.true_emotion[end:]):
+            if emotion not in emotion_counts:
+                emotion_counts[emotion] = self.emotion_counts[emotion] - held_out_emotions.get(emotion, 0)
+                if len(emotion_counts) == len(remaining):
+                    break
+        dependent_token_count = self.dependent_token_count.subtract(self.fold_counts[fold])
+        return NaiveBayes.from_counts(emotion_counts, dependent_token_count, tokenize=self.tokenize)
+
+    def evaluate_fold(self, fold):
+        """
+        predict the lines of a fold with the model trained on the remaining folds
+        :param fold: the index of the held-out fold
+        :return: a dictionary containing the values and scores per emotion for the fold
+        """
+        start, end = self.boundaries[fold], self.boundaries[fold + 1]
+        model = self.fold_model(fold)
+        predicted_labels = [model.predict_tokens(tokens) for tokens in self.tokens[start:end]]
+        emotion_dict = calc_values_classes(self.true_emotion[start:end], predicted_labels)
+        precision = calc_precision(emotion_dict)
+        recall = calc_recall(emotion_dict)
+        return {"emotion_dict": emotion_dict, "precision": precision, "recall": recall,
+                "f1": calc_f1(precision, recall)}
+
+    def mean_scores(self, score):
+        """
+        helper method to average a score of every emotion over the folds
+        an emotion is only averaged over the folds which contain it
+        :param score: the name of the score ("precision", "recall" or "f1")
+        :return: a dictionary with emotions and corresponding mean scores
+        """
+        fold_scores = dict()
+        for result in self.fold_results:
+            for emotion, value in result[score].items():
+                fold_scores.setdefault(emotion, []).append(value)
+        return {emotion: sum(values) / len(values) for emotion, values in fold_scores.items()}
+
+    def write_file(self, filename_output):
+        """
+        helper method to store the mean scores and the macro f1 of every fold in a separate .tsv file
+        :param filename_output: the tsv-file's name for storing the output
+        :return: returns a message after successfully writing file
+        """
+        with open(filename_output, 'w') as file:
+            file.write("Emotion \t Precision \t Recall \t F1")
+            for emotion in self.f1:
+                file.write("\n" + emotion + "\t" + "%.2f" % self.precision[emotion] + "\t"
+                           + "%.2f" % self.recall[emotion] + "\t" + "%.2f" % self.f1[emotion])
+            macro = calc_macro(self.precision, self.recall, self.f1)
+            file.write("\n\n" + "macro values" + "\t" + "%.2f" % macro["precision"] + "\t" + "%.2f" % macro["recall"]
+                       + "\t" + "%.2f" % macro["f1"])
+            for fold, result in enumerate(self.fold_results):
+                file.write("\n" + "fold " + str(fold + 1) + "\t" + "\t" + "\t"
+                           + "%.2f" % calc_macro(result["precision"], result["recall"], result["f1"])["f1"])
+        return "File {} was successfully written.".format(filename_output)
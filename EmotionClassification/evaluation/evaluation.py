@@ -1,14 +1,181 @@
 from EmotionClassification.main_work.naive_bayes import NaiveBayes
 from EmotionClassification.data_representation.data_representation import DataInstance
-from EmotionClassification.data_representation.emotion_info import EmotionInformation
-from EmotionClassification.data_representation.demographic_info import DemographicInformation
-import math
+from EmotionClassification.data_representation.features import FeatureInformation, FeaturePipeline
+from EmotionClassification.evaluation.significance import RESAMPLES, bootstrap_f1, permutation_test
+from EmotionClassification.instrumentation.instrumentation import Instrumentation, instrumented, write_report
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+import multiprocessing
+import itertools
+import numpy as np
+
+# the model used by the processes predicting a part of the test data
+# it is handed to every process once when it is started (and inherited without copying if processes are forked)
+_shared_model = None
+
+
+def _set_shared_model(model):
+    """
+    helper method to store the model in a process predicting a part of the test data
+    :param model: the trained NaiveBayes object
+    """
+    global _shared_model
+    _shared_model = model
+
+
+def _predict_chunk(sequences):
+    """
+    helper method to predict the emotions of a part of the test data in a separate process
+    :param sequences: a list of sequences
+    :return: a list containing the predicted emotion labels in the same order
+    """
+    return [_shared_model.predict(sequence) for sequence in sequences]
+
+
+def _predict_tokens_chunk(token_lists):
+    """
+    helper method to predict the emotions of a part of the already tokenized test data in a separate process
+    :param token_lists: a list containing the tokens of every sequence
+    :return: a list containing the predicted emotion labels in the same order
+    """
+    return [_shared_model.predict_tokens(tokens) for tokens in token_lists]
+
+
+def confusion_matrix(gold_labels, predicted_labels):
+    """
+    calculate the confusion matrix of the true and predicted labels in a single pass
+    the labels are encoded as integers such that every pair of true and predicted label is a single cell index
+    which is counted at once
+    :param gold_labels: a list containing the true emotion labels
+    :param predicted_labels: a list containing the predicted emotion labels in the same order
+    :return: a list containing the labels in the order of their first occurrence (true labels first) and
+             a numpy array whose rows refer to the true and columns to the predicted labels
+    """
+    labels = list(dict.fromkeys(itertools.chain(gold_labels, predicted_labels)))
+    index = {label: position for position, label in enumerate(labels)}
+    gold = np.fromiter(map(index.__getitem__, gold_labels), dtype=np.int64, count=len(gold_labels))
+    predicted = np.fromiter(map(index.__getitem__, predicted_labels), dtype=np.int64, count=len(predicted_labels))
+    matrix = np.bincount(gold * len(labels) + predicted, minlength=len(labels) ** 2)
+    return labels, matrix.reshape(len(labels), len(labels))
+
+
+def calc_values_matrix(labels, matrix):
+    """
+    helper method to derive tp, fn, and fp for the respective classes from the confusion matrix
+    only the labels occurring as true labels are considered as classes
+    :param labels: a list containing the labels of the rows and columns of the matrix
+    :param matrix: the confusion matrix as returned by confusion_matrix
+    :return: a dictionary containing the values corresponding to the emotion
+    """
+    tp = np.diag(matrix)
+    gold_counts = matrix.sum(axis=1)
+    fn = (gold_counts - tp).tolist()
+    fp = (matrix.sum(axis=0) - tp).tolist()
+    tp, gold_counts = tp.tolist(), gold_counts.tolist()
+    return {label: {"tp": tp[position], "fp": fp[position], "fn": fn[position]}
+            for position, label in enumerate(labels) if gold_counts[position] != 0}
+
+
+def calc_values_classes(gold_labels, predicted_labels):
+    """
+    helper method to calculate tp, fn, and fp for the respective classes separately
+    :param gold_labels: a list containing the true emotion labels
+    :param predicted_labels: a list containing the predicted emotion labels in the same order
+    :return: a dictionary containing the values corresponding to the emotion
+    """
+    return calc_values_matrix(*confusion_matrix(gold_labels, predicted_labels))
+
+
+def calc_precision(emotion_dict):
+    """
+    helper method to calculate precision for f1 score
+    :param emotion_dict: a dictionary of the form {emotion: {"tp": ..., "fp": ..., "fn": ...}}
+    :return: a dictionary with emotions and corresponding precision scores
+    """
+    emotion_precision = dict()
+    for emotion in emotion_dict.keys():
+        tp = emotion_dict[emotion]["tp"]
+        fp = emotion_dict[emotion]["fp"]
+        # check whether tp is 0 to avoid error of zero division and assign 0 immediately
+        if tp != 0:
+            precision = tp / (tp + fp)
+        else:
+            precision = 0
+        emotion_precision[emotion] = precision
+    return emotion_precision
+
+
+def calc_recall(emotion_dict):
+    """
+    helper method to calculate recall for f1 score
+    :param emotion_dict: a dictionary of the form {emotion: {"tp": ..., "fp": ..., "fn": ...}}
+    :return: a dictionary with emotions and corresponding recall scores
+    """
+    emotion_recall = dict()
+    # iterate over possible emotions
+    for emotion in emotion_dict.keys():
+        tp = emotion_dict[emotion]["tp"]
+        fn = emotion_dict[emotion]["fn"]
+        # check whether tp and fn are 0 to avoid error of zero division and assign 0 immediately
+        if tp != 0:
+            recall = tp / (tp + fn)
+        else:
+            recall = 0
+        emotion_recall[emotion] = recall
+    return emotion_recall
+
+
+def calc_f1(precision, recall):
+    """
+    calculate the f-score given the true and predicted labels
+    :param precision: a dictionary with emotions and corresponding precision scores
+    :param recall: a dictionary with emotions and corresponding recall scores
+    :return: a dict containing emotions and corresponding f1 scores
+    """
+    emotion_f1 = dict()
+    # iterate over possible emotions
+    for emotion in precision.keys():
+        p = precision[emotion]
+        r = recall[emotion]
+        # check whether precision and recall are 0 to avoid error of zero division and assign 0 immediately
+        if p != 0 and r != 0:
+            f1 = (2 * p * r) / (p + r)
+        else:
+            f1 = 0
+        emotion_f1[emotion] = f1
+    return emotion_f1
+
+
+def calc_micro(emotion_dict):
+    """
+    calculate the micro averaged scores, i.e. the scores of the summed up values of all classes
+    :param emotion_dict: a dictionary of the form {emotion: {"tp": ..., "fp": ..., "fn": ...}}
+    :return: a dictionary of the form {"precision": ..., "recall": ..., "f1": ...}
+    """
+    total = {value: sum(values[value] for values in emotion_dict.values()) for value in ("tp", "fp", "fn")}
+    precision = calc_precision({"micro": total})["micro"]
+    recall = calc_recall({"micro": total})["micro"]
+    return {"precision": precision, "recall": recall,
+            "f1": calc_f1({"micro": precision}, {"micro": recall})["micro"]}
+
+
+def calc_macro(precision, recall, f1):
+    """
+    calculate the macro averaged scores, i.e. the mean of the scores of all classes
+    :param precision: a dictionary with emotions and corresponding precision scores
+    :param recall: a dictionary with emotions and corresponding recall scores
+    :param f1: a dictionary with emotions and corresponding f1 scores
+    :return: a dictionary of the form {"precision": ..., "recall": ..., "f1": ...}
+    """
+    return {"precision": sum(precision.values()) / len(precision), "recall": sum(recall.values()) / len(recall),
+            "f1": sum(f1.values()) / len(f1)}
 
 
 class Evaluation:
     """
     This class provides the evaluation of the naive bayes classifier implemented for emotion classification
     The evaluation is based on F1 scores per class as well as macro F1 scores
+    All values are derived from a confusion matrix which is calculated in a single pass over the labels
 
     The file was created on     Mon June  5th 2023
         it was last edited on   Sat July 29th 2023
@@ -17,13 +184,14 @@ class Evaluation:
     """
     def __init__(self, filename_train, filename_test, event_duration=False, emotion_duration=False, intensity=False,
                  age=False, gender=False, education=False,
-                 tokenize=False):
+                 tokenize=False, cache_size=0, model=None, workers=1, instrument=False, features=(),
+                 cache_directory=None):
         """
         this is the constructor for the class Evaluation containing several important variables
         it calls the class NaiveBayes to access the NB calculation
                  the class DataInstance to access the general file contents (referring to both training and test file)
-                 the class EmotionInformation to access additional information incorporated on demand
-        :param filename_train: the name of the training file
+                 the class FeatureInformation to access additional information incorporated on demand
+        :param filename_train: the name of the training file (not needed if a model is given)
         :param filename_test: the name of the test file
         :param event_duration: boolean variable to activate incorporation of event_duration - default is False
         :param emotion_duration:  boolean variable to activate incorporation of emotion_duration - default is False
@@ -31,7 +199,22 @@ class Evaluation:
         :param age: boolean variable to activate incorporation of age - default is False
         :param gender:  boolean variable to activate incorporation of gender - default is False
         :param education:  boolean variable to activate incorporation of education - default is False
-        :param tokenize: boolean variable to activate proper tokenization (using nltk tokenizer) - default is False
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        :param cache_size: maximum number of test sequences whose tokens are cached by the naive bayes class
+                           None means unlimited - default is 0 (no caching)
+        :param model: an already trained or loaded NaiveBayes object to evaluate instead of training a new one
+                      the test file is extended by the features of the model - default is None
+        :param workers: the number of processes used for training and prediction - default is 1
+        :param instrument: boolean variable to record the wall time, calls and peak traced memory of every stage
+                           (reading the files, extracting the data, counting, predicting and the metrics) as well as
+                           the number of tokenizer and likelihood calls in self.instrumentation - default is False
+                           calls in other processes (workers > 1) are not recorded
+        :param features: the names of further registered features to incorporate (see features.py)
+                         default is () (only the features switched on by the boolean variables)
+        :param cache_directory: a directory to keep the parsed columns and the token ids of both files in such that
+                                later evaluations do not read in and tokenize them again (see CorpusCache)
+                                default is None (no cache on disk)
         """
         self.event_duration = event_duration
         self.emotion_duration = emotion_duration
@@ -39,144 +222,231 @@ class Evaluation:
         self.age = age
         self.gender = gender
         self.education = education
+        self.features = features
         self.tokenize = tokenize
+        self.workers = workers
+        self.cache_directory = cache_directory
+
+        self.instrumentation = None
+        if instrument:
+            # all instrumented functions report to the recorder while the evaluation runs
+            recorder = Instrumentation()
+            with recorder:
+                self.run(filename_train, filename_test, cache_size, model)
+            self.instrumentation = recorder.report()
+        else:
+            self.run(filename_train, filename_test, cache_size, model)
 
+    def run(self, filename_train, filename_test, cache_size, model):
+        """
+        helper method to train the model (if none is given), predict the test data and calculate the scores
+        :param filename_train: the name of the training file (not needed if a model is given)
+        :param filename_test: the name of the test file
+        :param cache_size: maximum number of test sequences whose tokens are cached by the naive bayes class
+        :param model: an already trained or loaded NaiveBayes object to evaluate instead of training a new one
+        """
         # access the naive bayes calculation - all parameters' values are passed to the constructor
-        self.naive_bayes_train = NaiveBayes(filename_train, event_duration=self.event_duration,
-                                            emotion_duration=self.emotion_duration, intensity=self.intensity, age=self.age, gender=self.gender, education=self.education,
-                                            tokenize=self.tokenize)
+        if model is None:
+            self.naive_bayes_train = NaiveBayes(filename_train, event_duration=self.event_duration,
+                                                emotion_duration=self.emotion_duration, intensity=self.intensity, age=self.age, gender=self.gender, education=self.education,
+                                                tokenize=self.tokenize, cache_size=cache_size, workers=self.workers,
+                                                features=self.features, cache_directory=self.cache_directory)
+        else:
+            self.naive_bayes_train = model
         # access the data in the baseline file with both training and test file for different purposes
         # data_train is used to reference all emotion labels that can be predicted (test file might not contain all)
         # data_test is used for reference of data to calculate the naive bayes for
-        self.data_train = DataInstance(filename_train, tokenize=self.tokenize)
-        self.data_test = DataInstance(filename_test, tokenize=self.tokenize)
-        self.advanced_emo = EmotionInformation(filename_test, event_duration=self.event_duration,
-                                               emotion_duration=self.emotion_duration, intensity=self.intensity,
-                                               tokenize=self.tokenize)
-        self.advanced_demo = DemographicInformation(filename_test, age=self.age, gender=self.gender,
-                                                    education=self.education, tokenize=self.tokenize)
+        # the training data was already processed by the naive bayes class and the test data is only processed once
+        # (a loaded model does not contain the training data)
+        self.data_train = self.naive_bayes_train.data_class
+        # the test file is not counted - the additional information is only extracted if it is incorporated
+        self.filename_test = filename_test
+        self.data_test = DataInstance(filename_test, tokenize=self.tokenize, cache_directory=self.cache_directory)
         # store all function outputs as variables
         self.predicted_labels = self.get_predicted()
+        self.labels, self.confusion_matrix = self.calc_confusion_matrix()
         self.emotion_dict = self.calc_values_classes()
         self.precision = self.calc_precision()
         self.recall = self.calc_recall()
         self.f1 = self.calc_f1()
+        self.micro = calc_micro(self.emotion_dict)
+        self.macro = calc_macro(self.precision, self.recall, self.f1)
+
+    @classmethod
+    def cross_validate(cls, filename, folds=5, event_duration=False, emotion_duration=False, intensity=False,
+                       age=False, gender=False, education=False, tokenize=False):
+        """
+        evaluate the naive bayes classifier with k-fold cross-validation on a single file instead of a training
+        and a test file - the file is read in, tokenized and counted once and the model of every fold is derived
+        by subtracting the counts of the held-out fold (see CrossValidation)
+        :param filename: the name of the file to cross-validate on
+        :param folds: the number of folds - default is 5
+        :param event_duration: boolean variable to activate incorporation of event_duration - default is False
+        :param emotion_duration:  boolean variable to activate incorporation of emotion_duration - default is False
+        :param intensity:  boolean variable to activate incorporation of intensity - default is False
+        :param age: boolean variable to activate incorporation of age - default is False
+        :param gender:  boolean variable to activate incorporation of gender - default is False
+        :param education:  boolean variable to activate incorporation of education - default is False
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        :return: a CrossValidation object containing the scores of every fold and the mean scores
+        """
+        # imported here since cross_validation.py uses the metrics of this file
+        from EmotionClassification.evaluation.cross_validation import CrossValidation
+        return CrossValidation(filename, folds=folds, event_duration=event_duration,
+                               emotion_duration=emotion_duration, intensity=intensity, age=age, gender=gender,
+                               education=education, tokenize=tokenize)
+
+    @cached_property
+    def advanced(self):
+        """
+        the FeatureInformation of the test file for the features of the model - it is built on first access
+        :return: a FeatureInformation object drawing from self.data_test
+        """
+        return FeatureInformation(self.filename_test, features=self.naive_bayes_train.features,
+                                  tokenize=self.tokenize, data_instance=self.data_test)
 
+    @instrumented("get_predicted")
     def get_predicted(self):
         """
         get predicted labels for test instances
         :return: a list containing the predicted emotion labels for the instances in the test file
         """
         predicted_labels = []
-        best_emotion, best_prob = None, -math.inf
-        # get emotion labels from training file since this is what can be predicted
-        emotion_labels = self.data_train.emotion_counts.keys()
-        # check whether one of the additional information should be included and refer to corresponding file
+        # the tokens of the test sequences are loaded from the cache on disk if there is one
+        if self.data_test.corpus.cache is not None:
+            return self.get_predicted_cached()
+        # check whether additional information is incorporated by the model and refer to corresponding data
         # advanced data contains additional data - non-advanced does not
-        if self.event_duration or self.emotion_duration or self.intensity:
-            data = self.advanced_emo.extracted_data_advanced
-        elif self.age or self.gender or self.education:
-            data = self.advanced_demo
+        if self.naive_bayes_train.features:
+            data = self.advanced.extracted_data_advanced
         else:
             data = self.data_test.extracted_data
 
         # calculate the naive bayes probability for every sequence and every emotion to get the most likely emotion
-        # iterate over every string (=sequence) in the total data from the test file as well as over every emotion
+        # the emotion labels from the training file are considered since this is what can be predicted
+        # every sequence is only tokenized once for all emotions
+        if self.workers > 1:
+            return self.get_predicted_parallel(data)
         for sequence in data:
-            for emotion in emotion_labels:
-                # get the naive bayes score from the corresponding function
-                current_prob = self.naive_bayes_train.calculate_bayes(emotion, sequence)
-                # get the best probability for emotion and store the label
-                if best_prob < current_prob:
-                    best_prob = current_prob
-                    best_emotion = emotion
-            # add the best emotion to a list and reset the values
-            predicted_labels.append(best_emotion)
-            best_emotion = None
-            best_prob = -math.inf
+            predicted_labels.append(self.naive_bayes_train.predict(sequence))
         return predicted_labels
 
+    def get_predicted_cached(self):
+        """
+        helper method to get the predicted labels from the token ids of the test sequences stored in the cache
+        the sequences are tokenized the same way as by the model (including the extra tokens of its features)
+        and only on the first run (see Corpus.token_sequences)
+        :return: a list containing the predicted emotion labels for the instances in the test file
+        """
+        model = self.naive_bayes_train
+        pipeline = FeaturePipeline(model.features, model.tokenize)
+        token_sequences = self.data_test.corpus.token_sequences(model.tokenize, pipeline.features,
+                                                                pipeline.token_streams(self.data_test.columns))
+        if self.workers > 1:
+            return self.get_predicted_parallel(list(token_sequences), tokenized=True)
+        return [model.predict_tokens(tokens) for tokens in token_sequences]
+
+    def get_predicted_parallel(self, data, tokenized=False):
+        """
+        helper method to get the predicted labels with several processes
+        the data is split into chunks which are predicted independently - the model is handed to every process
+        only once (forked processes share it with the main process) instead of being sent with every chunk
+        :param data: a list of sequences to predict the emotion for
+        :param tokenized: boolean variable indicating that the data contains the tokens of every sequence instead
+                          default is False
+        :return: a list containing the predicted emotion labels in the order of the data
+        """
+        predicted_labels = []
+        # several chunks per process such that processes which finish early can take over remaining work
+        chunk_size = max(1, -(-len(data) // (self.workers * 4)))
+        chunks = [data[start:start + chunk_size] for start in range(0, len(data), chunk_size)]
+        context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_set_shared_model,
+                                 initargs=(self.naive_bayes_train,)) as executor:
+            # the results are returned in the order of the chunks
+            for chunk_labels in executor.map(_predict_tokens_chunk if tokenized else _predict_chunk, chunks):
+                predicted_labels.extend(chunk_labels)
+        return predicted_labels
+
+    @instrumented("metrics")
     def calc_f1(self):
         """
         calculate the f-score given the true and predicted labels
         :return: a dict containing emotions and corresponding f1 scores
         """
-        emotion_f1 = dict()
-        # iterate over possible emotions
-        for emotion in set(self.data_test.true_emotion):
-            p = self.precision[emotion]
-            r = self.recall[emotion]
-            # check whether precision and recall are 0 to avoid error of zero division and assign 0 immediately
-            if p != 0 and r != 0:
-                f1 = (2 * p * r) / (p + r)
-            else:
-                f1 = 0
-            emotion_f1[emotion] = f1
-        return emotion_f1
+        return calc_f1(self.precision, self.recall)
+
+    @instrumented("metrics")
+    def calc_confusion_matrix(self):
+        """
+        calculate the confusion matrix of the true and predicted labels of the test file
+        :return: a list containing the labels and a numpy array whose rows refer to the true and columns to the
+                 predicted labels
+        """
+        return confusion_matrix(self.data_test.true_emotion, self.predicted_labels)
 
+    @instrumented("metrics")
     def calc_values_classes(self):
         """
         helper method to calculate tp, fn, and fp for the respective classes separately
         :return: a dictionary containing the values corresponding to the emotion
         """
-        tp, fn, fp = 0, 0, 0
-        emotion_dict = dict()
-        # iterate over possible emotions
-        for emotion in set(self.data_test.true_emotion):
-            for gold, pred in zip(self.data_test.true_emotion, self.predicted_labels):
-                # increase the tp value if predicted and true emotion match
-                if gold == pred and gold == emotion:
-                    tp += 1
-                # increase fn value if predicted and true don't match but true emotion is current emotion
-                elif gold != pred and gold == emotion:
-                    fn += 1
-                # increase fp value if predicted and true don't match but predicted emotion is current emotion
-                elif gold != pred and pred == emotion:
-                    fp += 1
-            emotion_dict[emotion] = {"tp": tp, "fp": fp, "fn": fn}
-            # reset values for next emotion
-            tp, fn, fp = 0, 0, 0
-        return emotion_dict
+        return calc_values_matrix(self.labels, self.confusion_matrix)
 
+    @instrumented("metrics")
     def calc_recall(self):
         """
         helper method to calculate recall for f1 score
         :return: a dictionary with emotions and corresponding recall scores
         """
-        emotion_recall = dict()
-        # iterate over possible emotions
-        for emotion in set(self.data_test.true_emotion):
-            tp = self.emotion_dict[emotion]["tp"]
-            fn = self.emotion_dict[emotion]["fn"]
-            # check whether tp and fn are 0 to avoid error of zero division and assign 0 immediately
-            if tp != 0:
-                recall = tp / (tp + fn)
-            else:
-                recall = 0
-            emotion_recall[emotion] = recall
-        return emotion_recall
+        return calc_recall(self.emotion_dict)
 
+    @instrumented("metrics")
     def calc_precision(self):
         """
         helper method to calculate precision for f1 score
         :return: a dictionary with emotions and corresponding precision scores
         """
-        emotion_precision = dict()
-        for emotion in set(self.data_test.true_emotion):
-            tp = self.emotion_dict[emotion]["tp"]
-            fp = self.emotion_dict[emotion]["fp"]
-            # check whether tp and fp are 0 to avoid error of zero division and assign 0 immediately
-            if tp != 0 and fp != 0:
-                precision = tp / (tp + fp)
-            else:
-                precision = 0
-            emotion_precision[emotion] = precision
-        return emotion_precision
+        return calc_precision(self.emotion_dict)
 
-    def write_file(self, filename_output):
+    def confidence_intervals(self, resamples=RESAMPLES, confidence=0.95, seed=0):
+        """
+        calculate bootstrap confidence intervals of the f1 score of every emotion and of the macro f1 score
+        (see bootstrap_f1)
+        :param resamples: the number of bootstrap resamples of the test file - default is RESAMPLES
+        :param confidence: the share of the resampled scores within the intervals - default is 0.95
+        :param seed: the seed of the random number generator - default is 0
+        :return: a dictionary of the form {"f1": {emotion: {"score": ..., "low": ..., "high": ...}},
+                 "macro_f1": {"score": ..., "low": ..., "high": ...}, "resamples": ..., "confidence": ...}
+        """
+        return bootstrap_f1(self.data_test.true_emotion, self.predicted_labels, resamples=resamples,
+                            confidence=confidence, seed=seed)
+
+    def compare(self, other, resamples=RESAMPLES, confidence=0.95, seed=0):
+        """
+        test whether the macro f1 score differs from the one of another evaluation on the same test file
+        (e.g. of another feature configuration) with a paired permutation test (see permutation_test)
+        :param other: an Evaluation object of the other model
+        :param resamples: the number of permutations and bootstrap resamples - default is RESAMPLES
+        :param confidence: the share of the resampled differences within the interval - default is 0.95
+        :param seed: the seed of the random number generator - default is 0
+        :return: a dictionary of the form {"macro_f1_a": ..., "macro_f1_b": ..., "difference": ..., "low": ...,
+                 "high": ..., "p_value": ..., "p_values": {emotion: p-value}, "resamples": ...}
+                 where a refers to this evaluation and b to the other one
+        """
+        if other.data_test.true_emotion != self.data_test.true_emotion:
+            raise ValueError("both evaluations have to use the same test file")
+        return permutation_test(self.data_test.true_emotion, self.predicted_labels, other.predicted_labels,
+                                resamples=resamples, confidence=confidence, seed=seed)
+
+    def write_file(self, filename_output, resamples=0, confidence=0.95):
         """
         helper method to store output of evaluation in a separate .tsv file
         :param filename_output: the tsv-file's name for storing the output
+        :param resamples: the number of bootstrap resamples for confidence intervals of the f1 scores which are
+                          added at the end of the file (see confidence_intervals) - default is 0 (no intervals)
+        :param confidence: the share of the resampled scores within the intervals - default is 0.95
         :return: returns a message after successfully writing file
         """
         gold = self.data_test.true_emotion
@@ -192,12 +462,37 @@ class Evaluation:
             file.write("\n" + emotion + "\t" + str(tp) + "\t" + str(fp) + "\t" + str(fn) + "\t" + str(precision) + "\t"
                        + str(recall) + "\t" + str(f1))
 
-        macro_precision = "%.2f" % (sum(self.precision.values()) / len(self.precision.values()))
-        macro_recall = "%.2f" % (sum(self.recall.values()) / len(self.recall.values()))
-        macro_f1 = "%.2f" % (sum(self.f1.values()) / len(self.f1.values()))
+        macro_precision = "%.2f" % self.macro["precision"]
+        macro_recall = "%.2f" % self.macro["recall"]
+        macro_f1 = "%.2f" % self.macro["f1"]
         file.write("\n\n" + "macro values" + "\t" + "\t" + "\t" + "\t" + str(macro_precision)
                    + "\t" + str(macro_recall) + "\t" + str(macro_f1))
+        file.write("\n" + "micro values" + "\t" + "\t" + "\t" + "\t" + "%.2f" % self.micro["precision"]
+                   + "\t" + "%.2f" % self.micro["recall"] + "\t" + "%.2f" % self.micro["f1"])
+
+        # the confusion matrix with the true labels as rows and the predicted labels as columns
+        file.write("\n\n" + "Confusion matrix" + "\t" + "\t".join(self.labels))
+        for label, row in zip(self.labels, self.confusion_matrix.tolist()):
+            file.write("\n" + label + "\t" + "\t".join(str(value) for value in row))
+
+        if resamples:
+            intervals = self.confidence_intervals(resamples=resamples, confidence=confidence)
+            file.write("\n\n" + "%g%% confidence intervals (%d resamples)" % (100 * confidence, resamples)
+                       + "\t" + "F1" + "\t" + "Low" + "\t" + "High")
+            for emotion, interval in list(intervals["f1"].items()) + [("macro values", intervals["macro_f1"])]:
+                file.write("\n" + emotion + "\t" + "%.2f" % interval["score"] + "\t" + "%.2f" % interval["low"]
+                           + "\t" + "%.2f" % interval["high"])
         return "File {} was successfully written.".format(filename_output)
 
+    def write_instrumentation(self, filename_output):
+        """
+        helper method to store the recorded instrumentation (see the parameter instrument) in a separate .json file
+        :param filename_output: the json-file's name for storing the output
+        :return: returns a message after successfully writing file
+        """
+        if self.instrumentation is None:
+            raise ValueError("the evaluation was not instrumented - use instrument=True")
+        return write_report(self.instrumentation, filename_output)
+
 
 
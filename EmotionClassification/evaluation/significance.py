@@ -0,0 +1,150 @@
+import itertools
+import numpy as np
+
+# the number of resamples drawn by default
+RESAMPLES = 10000
+# the maximum number of counts held in memory at once - the resamples are drawn in batches of this size
+BATCH_COUNTS = 1 << 22
+
+
+def encode_labels(gold_labels, *predicted_labels):
+    """
+    encode the true labels and one or more lists of predicted labels as integers
+    the labels are numbered in the order of their first occurrence (true labels first, as by confusion_matrix)
+    such that the classes of the evaluation, i.e. the labels occurring as true labels, are the first ones
+    :param gold_labels: a list containing the true emotion labels
+    :param predicted_labels: lists containing the predicted emotion labels in the same order
+    :return: a tuple consisting of a list containing the labels, the number of classes, a numpy array of the
+             true label codes and a list containing a numpy array of the predicted label codes for every list
+    """
+    labels = list(dict.fromkeys(itertools.chain(gold_labels, *predicted_labels)))
+    index = {label: position for position, label in enumerate(labels)}
+    classes = len(set(gold_labels))
+    gold = np.fromiter(map(index.__getitem__, gold_labels), dtype=np.int64, count=len(gold_labels))
+    predicted = [np.fromiter(map(index.__getitem__, labels_predicted), dtype=np.int64, count=len(labels_predicted))
+                 for labels_predicted in predicted_labels]
+    return labels, classes, gold, predicted
+
+
+def f1_scores(matrices, classes):
+    """
+    calculate the f1 score of every class for a stack of confusion matrices at once
+    this gives the same scores as calc_f1 since 2 * p * r / (p + r) = 2 * tp / (2 * tp + fp + fn)
+    :param matrices: a numpy array of the shape (..., labels, labels) whose rows refer to the true
+                     and columns to the predicted labels
+    :param classes: the number of classes, i.e. of the first labels which occur as true labels
+    :return: a numpy array of the shape (..., classes)
+    """
+    tp = np.diagonal(matrices, axis1=-2, axis2=-1)[..., :classes]
+    # the number of true and predicted instances of every class, i.e. 2 * tp + fp + fn
+    total = matrices.sum(axis=-1)[..., :classes] + matrices.sum(axis=-2)[..., :classes]
+    return np.where(tp > 0, 2 * tp / np.maximum(total, 1), 0.0)
+
+
+def batches(resamples, cells):
+    """
+    helper method to split the resamples into batches such that at most BATCH_COUNTS counts are drawn at once
+    :param resamples: the number of resamples
+    :param cells: the number of counts drawn for every resample
+    :return: a list containing the size of every batch
+    """
+    batch_size = max(1, BATCH_COUNTS // cells)
+    return [min(batch_size, resamples - start) for start in range(0, resamples, batch_size)]
+
+
+def interval(scores, confidence):
+    """
+    helper method to get the percentile interval of resampled scores
+    :param scores: a numpy array of the shape (resamples, ...)
+    :param confidence: the share of the resampled scores within the interval
+    :return: a tuple of numpy arrays containing the lower and upper bounds
+    """
+    return tuple(np.percentile(scores, [50 * (1 - confidence), 50 * (1 + confidence)], axis=0))
+
+
+def bootstrap_f1(gold_labels, predicted_labels, resamples=RESAMPLES, confidence=0.95, seed=0):
+    """
+    calculate bootstrap confidence intervals of the f1 score of every class and of the macro f1 score
+    drawing the test instances with replacement only changes how often every pair of true and predicted label
+    occurs - the confusion matrix of a resample is therefore drawn directly from the multinomial distribution over
+    the cells of the confusion matrix, which is the same as sampling the indices of the instances but does not
+    depend on the size of the test set
+    :param gold_labels: a list containing the true emotion labels
+    :param predicted_labels: a list containing the predicted emotion labels in the same order
+    :param resamples: the number of bootstrap resamples - default is RESAMPLES
+    :param confidence: the share of the resampled scores within the intervals - default is 0.95
+    :param seed: the seed of the random number generator - default is 0
+    :return: a dictionary of the form {"f1": {emotion: {"score": ..., "low": ..., "high": ...}},
+             "macro_f1": {"score": ..., "low": ..., "high": ...}, "resamples": ..., "confidence": ...}
+    """
+    labels, classes, gold, (predicted,) = encode_labels(gold_labels, predicted_labels)
+    cells = np.bincount(gold * len(labels) + predicted, minlength=len(labels) ** 2)
+    scores = f1_scores(cells.reshape(len(labels), len(labels)), classes)
+
+    generator = np.random.default_rng(seed)
+    resampled = []
+    for batch in batches(resamples, len(cells)):
+        matrices = generator.multinomial(len(gold), cells / len(gold), size=batch)
+        resampled.append(f1_scores(matrices.reshape(batch, len(labels), len(labels)), classes))
+    resampled = np.concatenate(resampled)
+    low, high = interval(resampled, confidence)
+    macro_low, macro_high = interval(resampled.mean(axis=1), confidence)
+    return {"f1": {label: {"score": score, "low": class_low, "high": class_high}
+                   for label, score, class_low, class_high in zip(labels, scores.tolist(), low.tolist(),
+                                                                  high.tolist())},
+            "macro_f1": {"score": float(scores.mean()), "low": float(macro_low), "high": float(macro_high)},
+            "resamples": resamples, "confidence": confidence}
+
+
+def permutation_test(gold_labels, predicted_labels_a, predicted_labels_b, resamples=RESAMPLES, confidence=0.95,
+                     seed=0):
+    """
+    test whether two systems (e.g. two feature configurations) differ in macro f1 on the same test instances
+    the p-value is calculated with a paired permutation test: the predictions of both systems are swapped for
+    every instance with a probability of 0.5 and the p-value is the share of permutations whose difference is at
+    least as large as the observed one (in both directions)
+    the confidence interval of the difference is calculated with a paired bootstrap
+    both are drawn from the counts of every combination of true label and both predicted labels instead of
+    the individual instances (see bootstrap_f1), e.g. the number of swapped instances of a combination is binomial
+    :param gold_labels: a list containing the true emotion labels
+    :param predicted_labels_a: a list containing the predicted emotion labels of the first system
+    :param predicted_labels_b: a list containing the predicted emotion labels of the second system
+    :param resamples: the number of permutations and bootstrap resamples - default is RESAMPLES
+    :param confidence: the share of the resampled differences within the interval - default is 0.95
+    :param seed: the seed of the random number generator - default is 0
+    :return: a dictionary of the form {"macro_f1_a": ..., "macro_f1_b": ..., "difference": ..., "low": ...,
+             "high": ..., "p_value": ..., "p_values": {emotion: p-value of the difference in f1}, "resamples": ...}
+             the difference is the macro f1 of the first system minus the one of the second system
+    """
+    if len(predicted_labels_a) != len(gold_labels) or len(predicted_labels_b) != len(gold_labels):
+        raise ValueError("both systems have to be evaluated on the same test instances")
+    labels, classes, gold, (predicted_a, predicted_b) = encode_labels(gold_labels, predicted_labels_a,
+                                                                      predicted_labels_b)
+    size = len(labels)
+    # the counts of every combination (true label, label predicted by a, label predicted by b)
+    cells = np.bincount((gold * size + predicted_a) * size + predicted_b, minlength=size ** 3)
+    counts = cells.reshape(size, size, size)
+    scores_a, scores_b = f1_scores(counts.sum(axis=2), classes), f1_scores(counts.sum(axis=1), classes)
+    difference = scores_a - scores_b
+
+    generator = np.random.default_rng(seed)
+    permuted, resampled = [], []
+    for batch in batches(resamples, len(cells)):
+        # swapped instances count for the other system
+        swapped = generator.binomial(counts, 0.5, size=(batch, size, size, size))
+        kept = counts - swapped
+        permuted.append(f1_scores(kept.sum(axis=3) + swapped.sum(axis=2), classes)
+                        - f1_scores(kept.sum(axis=2) + swapped.sum(axis=3), classes))
+        matrices = generator.multinomial(len(gold), cells / len(gold), size=batch).reshape(batch, size, size, size)
+        resampled.append(f1_scores(matrices.sum(axis=3), classes) - f1_scores(matrices.sum(axis=2), classes))
+    permuted, resampled = np.concatenate(permuted), np.concatenate(resampled)
+
+    # the observed difference is counted as one of the permutations such that the p-value is never 0
+    tolerance = 1e-12
+    p_values = (1 + (np.abs(permuted) >= np.abs(difference) - tolerance).sum(axis=0)) / (resamples + 1)
+    macro_difference = difference.mean()
+    p_value = (1 + (np.abs(permuted.mean(axis=1)) >= abs(macro_difference) - tolerance).sum()) / (resamples + 1)
+    low, high = interval(resampled.mean(axis=1), confidence)
+    return {"macro_f1_a": float(scores_a.mean()), "macro_f1_b": float(scores_b.mean()),
+            "difference": float(macro_difference), "low": float(low), "high": float(high),
+            "p_value": float(p_value), "p_values": dict(zip(labels, p_values.tolist())), "resamples": resamples}
@@ -0,0 +1,151 @@
+from EmotionClassification.data_representation.data_representation import load_corpus, TokenCounts
+from EmotionClassification.data_representation.features import FeaturePipeline, FEATURES
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+from EmotionClassification.evaluation.evaluation import calc_values_classes, calc_precision, calc_recall, calc_f1, \
+    calc_macro
+from EmotionClassification.evaluation.significance import RESAMPLES, permutation_test
+from EmotionClassification.data_representation.tokenizer import get_tokenizer
+
+
+class FeatureSweep:
+    """
+    This class evaluates several feature configurations at once
+    Both files are read in and tokenized only once, the additional information of every configuration is added to
+    the counts of the generated text as a small number of extra tokens per line
+    The results are the same as those of a separate Evaluation for every configuration
+
+    The file was created on     Sat October 17th 2026
+    """
+    def __init__(self, filename_train, filename_test, configurations, tokenize=False, cache_directory=None):
+        """
+        this is the constructor for the class FeatureSweep which evaluates every configuration in the first step
+            self.tokens_train and self.tokens_test store a list with the tokens of the generated text of every line
+            self.base_count stores a TokenCounts object with the counts of the generated text only
+            self.results stores a dictionary of the form {configuration name: {"precision": ..., "recall": ...,
+                         "f1": ..., "macro_precision": ..., "macro_recall": ..., "macro_f1": ...}}
+            self.macro_f1 stores a dictionary of the form {configuration name: macro f1 score}
+            self.predicted_labels stores a dictionary of the form {configuration name: list of predicted labels}
+        :param filename_train: the name of the training file
+        :param filename_test: the name of the test file
+        :param configurations: a list of dictionaries of the form {feature: True} (see FEATURES)
+                               an empty dictionary stands for the baseline
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+                         the extra tokens are tokenized separately from the text which can make a difference
+                         for the nltk tokenizer at the end of the text
+        :param cache_directory: a directory to keep the parsed columns and the tokens of the generated text of both
+                                files in for later runs (see CorpusCache) - default is None (no cache on disk)
+        """
+        self.tokenize = tokenize
+        # the text and the extra tokens are lowercased and tokenized the same way as by NaiveBayes
+        self.tokenizer = get_tokenizer(tokenize)
+        self.configurations = configurations
+        self.corpus_train = load_corpus(filename_train, cache_directory)
+        self.corpus_test = load_corpus(filename_test, cache_directory)
+        # the extra tokens repeat a lot and are only tokenized once
+        self.feature_cache = dict()
+
+        # the generated text is tokenized once for all configurations
+        self.tokens_train = self.line_tokens(self.corpus_train)
+        self.tokens_test = self.line_tokens(self.corpus_test)
+        self.emotion_counts, self.base_count = dict(), TokenCounts()
+        for emotion, tokens in zip(self.corpus_train.columns["emotion"], self.tokens_train):
+            self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + 1
+            self.base_count.add_tokens(emotion, tokens)
+
+        self.results = dict()
+        self.predicted_labels = dict()
+        for configuration in self.configurations:
+            self.results[self.configuration_name(configuration)] = self.evaluate_configuration(configuration)
+        self.macro_f1 = {name: result["macro_f1"] for name, result in self.results.items()}
+
+    @staticmethod
+    def configuration_name(configuration):
+        """
+        helper method to get a readable name for a configuration
+        :param configuration: a dictionary of the form {feature: True}
+        :return: the switched on features joined by "+" or "baseline"
+        """
+        features = [feature for feature in FEATURES if configuration.get(feature)]
+        return "+".join(features) if features else "baseline"
+
+    def line_tokens(self, corpus):
+        """
+        helper method to get the tokens of the generated text of every line of a file
+        :param corpus: the Corpus object of the file - its tokens are taken from its cache on disk if it has one
+        :return: a list containing a list of tokens for every line
+        """
+        if corpus.cache is not None:
+            return list(corpus.token_sequences(self.tokenize))
+        return [self.tokenizer(text.lower()) for text in corpus.columns["generated_text"]]
+
+    def feature_tokens(self, columns, configuration):
+        """
+        helper method to get the extra tokens of every line for a configuration
+        the extra text is built by the same feature pipeline as in NaiveBayes (see FeaturePipeline)
+        :param columns: a dictionary of the form {column name: list of values} as stored by Corpus
+        :param configuration: a dictionary of the form {feature: True}
+        :return: a list containing a tuple of extra tokens for every line
+        """
+        sequences = FeaturePipeline(configuration).feature_sequences(columns)
+        feature_tokens = []
+        for input_sequence in sequences:
+            if input_sequence not in self.feature_cache:
+                self.feature_cache[input_sequence] = tuple(self.tokenizer(input_sequence.lower()))
+            feature_tokens.append(self.feature_cache[input_sequence])
+        return feature_tokens
+
+    def evaluate_configuration(self, configuration):
+        """
+        train and evaluate the naive bayes classifier for a single configuration
+        the counts of the generated text are copied and only the extra tokens are counted
+        :param configuration: a dictionary of the form {feature: True}
+        :return: a dictionary containing the scores per emotion and the macro scores
+        """
+        dependent_token_count = self.base_count.copy()
+        for emotion, tokens in zip(self.corpus_train.columns["emotion"],
+                                   self.feature_tokens(self.corpus_train.columns, configuration)):
+            dependent_token_count.add_tokens(emotion, tokens)
+        model = NaiveBayes.from_counts(self.emotion_counts, dependent_token_count, tokenize=self.tokenize)
+
+        predicted_labels = []
+        for tokens, extra_tokens in zip(self.tokens_test, self.feature_tokens(self.corpus_test.columns,
+                                                                              configuration)):
+            predicted_labels.append(model.predict_tokens(tokens + list(extra_tokens)))
+        self.predicted_labels[self.configuration_name(configuration)] = predicted_labels
+
+        emotion_dict = calc_values_classes(self.corpus_test.columns["emotion"], predicted_labels)
+        precision = calc_precision(emotion_dict)
+        recall = calc_recall(emotion_dict)
+        f1 = calc_f1(precision, recall)
+        macro = calc_macro(precision, recall, f1)
+        return {"precision": precision, "recall": recall, "f1": f1, "macro_precision": macro["precision"],
+                "macro_recall": macro["recall"], "macro_f1": macro["f1"]}
+
+    def compare(self, name_a, name_b="baseline", resamples=RESAMPLES, confidence=0.95, seed=0):
+        """
+        test whether the macro f1 scores of two configurations differ with a paired permutation test
+        (see permutation_test), e.g. whether the gain of a configuration over the baseline is real
+        :param name_a: the name of the first configuration (see configuration_name)
+        :param name_b: the name of the second configuration - default is "baseline"
+        :param resamples: the number of permutations and bootstrap resamples - default is RESAMPLES
+        :param confidence: the share of the resampled differences within the interval - default is 0.95
+        :param seed: the seed of the random number generator - default is 0
+        :return: a dictionary of the form {"macro_f1_a": ..., "macro_f1_b": ..., "difference": ..., "low": ...,
+                 "high": ..., "p_value": ..., "p_values": {emotion: p-value}, "resamples": ...}
+        """
+        return permutation_test(self.corpus_test.columns["emotion"], self.predicted_labels[name_a],
+                                self.predicted_labels[name_b], resamples=resamples, confidence=confidence, seed=seed)
+
+    def write_file(self, filename_output):
+        """
+        helper method to store the macro scores of every configuration in a separate .tsv file
+        :param filename_output: the tsv-file's name for storing the output
+        :return: returns a message after successfully writing file
+        """
+        with open(filename_output, 'w') as file:
+            file.write("Configuration \t Macro Precision \t Macro Recall \t Macro F1")
+            for name, result in self.results.items():
+                file.write("\n" + name + "\t" + "%.2f" % result["macro_precision"] + "\t"
+                           + "%.2f" % result["macro_recall"] + "\t" + "%.2f" % result["macro_f1"])
+        return "File {} was successfully written.".format(filename_output)
@@ -0,0 +1,162 @@
+from functools import wraps
+import json
+import time
+import tracemalloc
+
+# the Instrumentation object which is currently recording - None if instrumentation is switched off
+# the instrumented functions only check this variable such that the overhead is negligible when switched off
+active = None
+
+
+class Instrumentation:
+    """
+    This class records the wall time, the number of calls and the peak traced memory of the stages of a run
+    (e.g. reading the file, extracting the data, counting, predicting) as well as counters of frequent calls
+    (e.g. tokenizer and likelihood calls) which are too frequent to be timed one by one
+    The times of nested stages are also part of the time of the enclosing stage
+
+    The file was created on     Sat October 17th 2026
+    """
+    def __init__(self, trace_memory=True):
+        """
+        this is the constructor for the class Instrumentation
+            self.stages stores a dictionary of the form {stage: {"calls": ..., "seconds": ..., "peak_memory": ...}}
+                        peak_memory is the largest increase of traced memory (in bytes) during a call of the stage
+            self.counters stores a dictionary of the form {counter: count}
+        :param trace_memory: boolean variable to activate tracing of memory allocations (which slows down the run)
+                             the memory is only recorded if this object starts the tracing itself, i.e. the peaks of
+                             tracing started elsewhere are neither used nor reset - default is True
+        """
+        self.trace_memory = trace_memory
+        self.stages = dict()
+        self.counters = dict()
+        # the stages which are currently running - a list of [name, start time, start memory, peak memory]
+        self.running = []
+        self.started_tracing = False
+
+    def start(self):
+        """
+        start recording - all instrumented functions report to this object until stop is called
+        """
+        global active
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        active = self
+
+    def stop(self):
+        """
+        stop recording
+        """
+        global active
+        active = None
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def update_peaks(self):
+        """
+        helper method to hand the peak of the traced memory to all running stages
+        the peak is reset afterwards such that the next stage starts measuring from the current memory
+        :return: the currently traced memory in bytes
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        for running_stage in self.running:
+            running_stage[3] = max(running_stage[3], peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def enter_stage(self, name):
+        """
+        helper method to record the start of a stage
+        :param name: the name of the stage
+        """
+        memory = self.update_peaks() if self.started_tracing else 0
+        self.running.append([name, time.perf_counter(), memory, memory])
+
+    def exit_stage(self):
+        """
+        helper method to record the end of the last started stage
+        """
+        if self.started_tracing:
+            self.update_peaks()
+        name, start_time, start_memory, peak_memory = self.running.pop()
+        stage = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "peak_memory": 0})
+        stage["calls"] += 1
+        stage["seconds"] += time.perf_counter() - start_time
+        stage["peak_memory"] = max(stage["peak_memory"], peak_memory - start_memory)
+
+    def count(self, name, calls=1):
+        """
+        increase a counter
+        :param name: the name of the counter
+        :param calls: the number to add - default is 1
+        """
+        self.counters[name] = self.counters.get(name, 0) + calls
+
+    def report(self):
+        """
+        get the recorded values
+        :return: a dictionary of the form {"stages": {stage: {"calls": ..., "seconds": ..., "peak_memory": ...}},
+                 "counters": {counter: count}}
+        """
+        return {"stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "counters": dict(self.counters)}
+
+    def write_file(self, filename_output):
+        """
+        helper method to store the recorded values in a separate .json file
+        :param filename_output: the json-file's name for storing the output
+        :return: returns a message after successfully writing file
+        """
+        return write_report(self.report(), filename_output)
+
+
+def write_report(report, filename_output):
+    """
+    store recorded values (see Instrumentation.report) in a separate .json file
+    :param report: a dictionary as returned by Instrumentation.report
+    :param filename_output: the json-file's name for storing the output
+    :return: returns a message after successfully writing file
+    """
+    with open(filename_output, "w", encoding="utf8") as f:
+        json.dump(report, f, indent=2)
+    return "File {} was successfully written.".format(filename_output)
+
+
+def instrumented(name):
+    """
+    decorator to record every call of a function as a stage of the active Instrumentation (if there is one)
+    :param name: the name of the stage
+    :return: the decorator
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            instrumentation = active
+            if instrumentation is None:
+                return function(*args, **kwargs)
+            instrumentation.enter_stage(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                instrumentation.exit_stage()
+        return wrapper
+    return decorator
+
+
+def count_calls(name, calls=1):
+    """
+    increase a counter of the active Instrumentation (if there is one)
+    :param name: the name of the counter
+    :param calls: the number to add - default is 1
+    """
+    if active is not None:
+        active.count(name, calls)
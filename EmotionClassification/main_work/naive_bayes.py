@@ -1,8 +1,24 @@
-from EmotionClassification.data_representation.data_representation import DataInstance
-from EmotionClassification.data_representation.emotion_info import EmotionInformation
-from EmotionClassification.data_representation.demographic_info import DemographicInformation
+from EmotionClassification.data_representation.data_representation import DataInstance, Corpus, COLUMNS, \
+    TokenCounts, Vocabulary, HashedVocabulary, CHUNK_SIZE, read_columns, merge_counts, count_files, prune_counts
+from EmotionClassification.data_representation.features import FeatureInformation, EMOTION_FEATURES, \
+    DEMOGRAPHIC_FEATURES, active_features, count_feature_tokens
+from EmotionClassification.instrumentation.instrumentation import instrumented, count_calls
 import math
-from nltk.tokenize import word_tokenize
+import json
+import mmap
+import struct
+from functools import lru_cache, cached_property
+import numpy as np
+from scipy.sparse import csr_matrix
+from EmotionClassification.data_representation.tokenizer import get_tokenizer
+
+# binary model format written by NaiveBayes.save:
+#   magic bytes, length of the json header (unsigned 64 bit little endian), json header,
+#   padding to a multiple of 8 bytes, log priors (float64, emotions),
+#   log probability matrix (float64, (vocabulary + 1) x emotions), vocabulary (utf8 tokens separated by newlines)
+MODEL_MAGIC = b"EMONB002"
+# files of the first version store the log probability matrix as emotions x (vocabulary + 1)
+MODEL_MAGIC_V1 = b"EMONB001"
 
 
 class NaiveBayes:
@@ -15,12 +31,14 @@ class NaiveBayes:
         @author: Miriam S.
         """
     def __init__(self, filename, event_duration=False, emotion_duration=False, intensity=False, age=False, gender=False,
-                 education=False, tokenize=False):
+                 education=False, tokenize=False, cache_size=0, workers=1, min_count=1, max_vocabulary=None,
+                 hash_buckets=None, features=(), cache_directory=None):
         """
         this is the constructor for the class Evaluation containing several important variables
         it calls the class DataInstance to access the general file contents (referring to both training and test file)
-                 the class EmotionInformation to access additional emotion-dependent information incorporated on demand
-                 the class DemographicInformation to access additional demographic information incorporated on demand
+                 the class FeatureInformation to access the additional information incorporated on demand
+                 (emotion-dependent and demographic information can be combined freely)
+        only the counts of the active configuration are built (see advanced)
         :param filename: the name of the file
         :param event_duration: boolean variable to activate incorporation of event_duration - default is False
         :param emotion_duration:  boolean variable to activate incorporation of emotion_duration - default is False
@@ -28,7 +46,23 @@ class NaiveBayes:
         :param age: boolean variable to activate incorporation of age - default is False
         :param gender:  boolean variable to activate incorporation of gender - default is False
         :param education:  boolean variable to activate incorporation of education - default is False
-        :param tokenize: boolean variable to activate proper tokenization (using nltk tokenizer) - default is False
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        :param cache_size: maximum number of sequences whose tokens are cached for repeated predictions
+                           None means unlimited - default is 0 (no caching)
+        :param workers: the number of processes counting the tokens of the training file - default is 1
+        :param min_count: the minimum frequency of a token in the training file to be kept in the model, rarer tokens
+                          are treated as unknown tokens - default is 1 (all tokens)
+        :param max_vocabulary: the maximum number of tokens kept in the model (the most frequent ones)
+                               default is None (all tokens)
+        :param hash_buckets: the number of buckets the tokens are hashed into such that the size of the model does
+                             not depend on the number of distinct tokens (can not be combined with min_count and
+                             max_vocabulary) - default is None (no hashing)
+        :param features: the names of further registered features to incorporate (see features.py)
+                         default is () (only the features switched on by the boolean variables)
+        :param cache_directory: a directory to keep the parsed columns and the token ids of the training file in
+                                such that later runs do not read in and tokenize it again (see CorpusCache)
+                                default is None (no cache on disk)
         """
         self.event_duration = event_duration
         self.emotion_duration = emotion_duration
@@ -36,14 +70,325 @@ class NaiveBayes:
         self.age = age
         self.gender = gender
         self.education = education
+        # all active features - they are extracted together in a single pass over the file
+        self.features = active_features([feature for feature in EMOTION_FEATURES + DEMOGRAPHIC_FEATURES
+                                         if getattr(self, feature)] + list(features))
         self.tokenize = tokenize
+        self.set_cache_size(cache_size)
+        self.filename = filename
+        self.workers = workers
+        self.min_count = min_count
+        self.max_vocabulary = max_vocabulary
+
+        # the feature classes re-use the same DataInstance such that the file is only processed once
+        # they are only built when they are accessed - the counts of the active configuration are built by compile
+        self.data_class = DataInstance(filename, tokenize=self.tokenize, workers=workers, min_count=min_count,
+                                       max_vocabulary=max_vocabulary, hash_buckets=hash_buckets,
+                                       cache_directory=cache_directory)
+        # compile the trained counts into log probability tables once so that scoring only needs lookups
+        self.compile()
+
+    @cached_property
+    def advanced(self):
+        """
+        the FeatureInformation of the training file for all active features - it is built on first access
+        :return: a FeatureInformation object drawing from self.data_class
+        """
+        return FeatureInformation(self.filename, features=self.features, tokenize=self.tokenize,
+                                  data_instance=self.data_class, workers=self.workers, min_count=self.min_count,
+                                  max_vocabulary=self.max_vocabulary)
+
+    def set_cache_size(self, cache_size):
+        """
+        set up the least recently used cache of tokenized sequences keyed on the raw text
+        :param cache_size: maximum number of cached sequences - None means unlimited and 0 deactivates the cache
+        """
+        self.cache_size = cache_size
+        if cache_size == 0:
+            self.token_cache = None
+        else:
+            self.token_cache = lru_cache(maxsize=cache_size)(lambda data: tuple(self.split_sequence(data)))
+
+    def __getstate__(self):
+        """
+        the tokenization cache can not be pickled (e.g. to send the model to another process) and is left out
+        :return: the attributes of the object without the cache
+        """
+        state = self.__dict__.copy()
+        del state["token_cache"]
+        return state
+
+    def __setstate__(self, state):
+        """
+        restore a pickled object with an empty tokenization cache of the same size
+        :param state: the attributes of the object
+        """
+        self.__dict__.update(state)
+        self.set_cache_size(self.cache_size)
+
+    @classmethod
+    def from_counts(cls, emotion_counts, dependent_token_count, tokenize=False, cache_size=0, features=()):
+        """
+        create a model directly from counts instead of a file (e.g. counts which were derived from other counts)
+        additional information has to be part of the counts already
+        :param emotion_counts: a dictionary of the form {emotion: count} used for the prior probabilities
+        :param dependent_token_count: a TokenCounts object or a dictionary of the form {emotion: {token: count}}
+                                      used for the likelihood
+        :param tokenize: False (split at whitespace), True or "nltk" (nltk tokenizer) or "regex" (faster
+                         tokenizer following the nltk rules, see tokenizer.py) - default is False
+        :param cache_size: maximum number of sequences whose tokens are cached for repeated predictions
+                           None means unlimited - default is 0 (no caching)
+        :param features: the names of the features whose extra tokens are part of the counts such that they are
+                         added to the sequences to predict (see features.py) - default is () (all variables False)
+        :return: a NaiveBayes object
+        """
+        model = cls.__new__(cls)
+        model.features = active_features(features)
+        for feature in EMOTION_FEATURES + DEMOGRAPHIC_FEATURES:
+            setattr(model, feature, feature in model.features)
+        model.tokenize = tokenize
+        model.set_cache_size(cache_size)
+        model.data_class, model.advanced = None, None
+        if not isinstance(dependent_token_count, TokenCounts):
+            dependent_token_count = TokenCounts.from_dict(dependent_token_count)
+        model.emotion_counts, model.dependent_token_count = emotion_counts, dependent_token_count
+        model.compile()
+        return model
+
+    @classmethod
+    def from_files(cls, filenames, event_duration=False, emotion_duration=False, intensity=False, age=False,
+                   gender=False, education=False, tokenize=False, cache_size=0, workers=1, min_count=1,
+                   max_vocabulary=None, hash_buckets=None, features=(), chunk_size=CHUNK_SIZE):
+        """
+        train a model out of core on one or several plain or compressed (gzip, bz2 or xz) files
+        the files are streamed in chunks of lines and only the running counts are kept in memory (see count_files)
+        such that the training data may be much larger than the memory - the resulting model only keeps the counts
+        instead of the training data (data_class etc. are None) and can be trained further (see partial_fit)
+        the memory of the running counts is bounded by hash_buckets or max_vocabulary (see count_files, the
+        counts may then differ slightly from those of the constructor), min_count is only applied at the end
+        :param filenames: a filename, a glob pattern (e.g. "exports/*.tsv.gz") or a list of filenames and patterns
+        :param chunk_size: the number of lines kept in memory at once - default is CHUNK_SIZE
+        the other parameters are the same as those of the constructor
+        :return: a NaiveBayes object
+        """
+        if hash_buckets is not None and (min_count > 1 or max_vocabulary is not None):
+            raise ValueError("hashed counts can not be pruned - use either hash_buckets or min_count/max_vocabulary")
+        features = active_features([feature for feature, active in
+                                    zip(EMOTION_FEATURES + DEMOGRAPHIC_FEATURES, (event_duration, emotion_duration,
+                                                                                  intensity, age, gender, education))
+                                    if active] + list(features))
+        vocabulary = Vocabulary() if hash_buckets is None else HashedVocabulary(hash_buckets)
+        emotion_counts, dependent_token_count = count_files(filenames, count_feature_tokens,
+                                                            {"tokenize": tokenize, "features": features},
+                                                            workers=workers, vocabulary=vocabulary,
+                                                            chunk_size=chunk_size, max_vocabulary=max_vocabulary)
+        if not emotion_counts:
+            raise ValueError("the files {} do not contain any lines".format(filenames))
+        dependent_token_count = prune_counts(dependent_token_count, min_count, max_vocabulary)
+        return cls.from_counts(emotion_counts, dependent_token_count, tokenize=tokenize, cache_size=cache_size,
+                               features=features)
+
+    def get_emotion_counts(self):
+        """
+        helper method to access the dictionary with the emotion counts used for the prior probabilities
+        :return: a dictionary of the form {emotion: count}
+        """
+        if self.data_class is None:
+            return self.emotion_counts
+        return self.data_class.emotion_counts
+
+    def get_dependent_counts(self):
+        """
+        helper method to access the emotion dependent token counts for the active configuration
+        :return: a TokenCounts object which can be read like a dictionary of the form {emotion: {token: count}}
+        """
+        if self.data_class is None:
+            return self.dependent_token_count
+        if self.features:
+            return self.advanced.emotion_dependent_count_advanced
+        return self.data_class.emotion_dependent_count
+
+    @instrumented("compile")
+    def compile(self, emotions=None):
+        """
+        turn the trained counts into log probability tables
+        this is done once after training so that the naive bayes calculation only consists of lookups and additions
+            self.vocabulary stores the dictionary of the form {token: id} of the counts' Vocabulary
+            self.unknown_id stores the id used for tokens which are not part of the vocabulary
+            self.log_prior stores a dictionary of the form {emotion: log prior probability}
+            self.log_likelihood stores a dictionary of the form {emotion: list of log likelihoods}
+                                the lists are indexed by the token ids - the last entry (self.unknown_id)
+                                holds the log probability of an unknown token
+            self.log_unknown stores a dictionary of the form {emotion: log probability of an unknown token}
+        the matrix used for batch prediction is derived from these tables on demand
+        :param emotions: the emotions whose likelihood tables changed and need to be compiled again
+                         the prior probabilities are always compiled - default is None (all emotions)
+        """
+        emotion_frequencies = self.get_emotion_counts()
+        total_count = sum(emotion_frequencies.values())
+        emotion_dependent_token_count = self.get_dependent_counts()
+        self.vocabulary = emotion_dependent_token_count.vocabulary.ids
+        self.unknown_id = len(emotion_dependent_token_count.vocabulary)
+        if emotions is None:
+            self.log_likelihood, self.log_unknown = dict(), dict()
+            emotions = emotion_frequencies.keys()
+        self.log_prior = dict()
+        for emotion, emotion_freq in emotion_frequencies.items():
+            self.log_prior[emotion] = math.log(emotion_freq) - math.log(total_count)
+        for emotion in emotions:
+            token_counts = emotion_dependent_token_count.count_array(emotion)
+            # laplace smoothing - the denominator is the same for every token given the emotion
+            # tokens with a count of 0 do not belong to the vocabulary of the emotion
+            denominator = sum(token_counts) + len(token_counts) - token_counts.count(0)
+            # an emotion whose tokens were all pruned only has unknown tokens
+            denominator = max(denominator, 1)
+            # the log likelihood only depends on the count and is computed once for every distinct count
+            # such that the entries of the table share the same few float objects
+            # a count of 0 gives the log probability of an unknown token
+            log_likelihood = {count: math.log((count + 1) / denominator) for count in set(token_counts)}
+            self.log_likelihood[emotion] = list(map(log_likelihood.__getitem__, token_counts))
+            self.log_unknown[emotion] = math.log(1 / denominator)
+            self.log_likelihood[emotion].append(self.log_unknown[emotion])
+        # the tables which were not compiled again are extended by the tokens added to the vocabulary in the meantime
+        for emotion, log_likelihood in self.log_likelihood.items():
+            if len(log_likelihood) <= self.unknown_id:
+                log_likelihood.extend([self.log_unknown[emotion]] * (self.unknown_id + 1 - len(log_likelihood)))
+        # the tables changed - the batch prediction matrix has to be rebuilt
+        self.log_prob_matrix = None
+
+    def partial_fit(self, rows):
+        """
+        add new lines to the trained model without training on the complete data again
+        the counts of the new lines are added to the existing counts and only the likelihood tables of the
+        emotions occurring in the new lines are compiled again - the cost depends on the new lines only
+        the tokens of the new lines are not pruned (see min_count and max_vocabulary)
+        only the counts which were already built are updated - counts of other configurations which are built
+        later on only contain the lines of the training file
+        a model created from counts (e.g. by from_files) keeps these counts and the new lines are added to them
+        in the same way - only a loaded model (see load) can not be trained further
+        :param rows: the new lines - every line is a dictionary of the form {column name: value}
+                     containing the columns in COLUMNS (or a tuple with the values in the order of COLUMNS)
+        """
+        if self.data_class is None and "dependent_token_count" not in vars(self):
+            raise ValueError("the model does not contain the training data needed for further training")
+        rows = [row if isinstance(row, tuple) else tuple(row[name] for name in COLUMNS) for row in rows]
+        if self.data_class is None:
+            self.partial_fit_counts(rows)
+            return
+        # process the new lines the same way the training file was processed
+        new_data = DataInstance(None, tokenize=self.tokenize, corpus=Corpus(None, rows=rows),
+                                hash_buckets=self.data_class.hash_buckets)
+        new_advanced = FeatureInformation(None, features=self.features, tokenize=self.tokenize,
+                                          data_instance=new_data)
+        for emotion, count in new_data.emotion_counts.items():
+            self.data_class.emotion_counts[emotion] = self.data_class.emotion_counts.get(emotion, 0) + count
+        # the counts of the new lines are only built for the counts which were built for the training file
+        for trained, new, counts in ((self.data_class, new_data, "emotion_dependent_count"),
+                                     (vars(self).get("advanced"), new_advanced, "emotion_dependent_count_advanced")):
+            if trained is not None and counts in vars(trained):
+                merge_counts(getattr(trained, counts), getattr(new, counts))
+        self.compile(emotions=new_data.emotion_counts.keys())
+
+    def partial_fit_counts(self, rows):
+        """
+        helper method to add new lines to a model created from counts (see partial_fit)
+        the new tokens are counted with the vocabulary of the stored counts such that they are added without
+        translating any ids
+        :param rows: the new lines as tuples with the values in the order of COLUMNS
+        """
+        columns = {name: [row[position] for row in rows] for position, name in enumerate(COLUMNS)}
+        new_emotion_counts = dict()
+        for emotion in columns["emotion"]:
+            new_emotion_counts[emotion] = new_emotion_counts.get(emotion, 0) + 1
+        new_counts = count_feature_tokens(columns, tokenize=self.tokenize, features=self.features,
+                                          vocabulary=self.dependent_token_count.vocabulary)
+        merge_counts(self.dependent_token_count, new_counts)
+        for emotion, count in new_emotion_counts.items():
+            self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + count
+        self.compile(emotions=new_emotion_counts.keys())
+
+    def update_from_file(self, path):
+        """
+        add the lines of another file (e.g. newly annotated data) to the trained model
+        :param path: the name of the file containing the new lines
+        """
+        self.partial_fit(list(read_columns(path)))
+
+    def build_matrix(self):
+        """
+        helper method to turn the compiled log probability tables into a matrix for batch prediction
+            self.log_prob_matrix stores a C-contiguous numpy array of the shape (vocabulary + 1, emotions)
+                                 the rows are the token ids (see self.vocabulary)
+                                 the last row holds the log probability of tokens unknown to all emotions
+                                 the columns follow the order of the emotions in the training file
+        the log probabilities of all emotions for a token lie next to each other such that the document-term matrix
+        is multiplied with it directly and the rows of the tokens of a sequence are gathered in one piece
+        tokens which are only unknown to some of the emotions get the unknown log probability of those emotions
+        """
+        tables = np.array([self.log_likelihood[emotion] for emotion in self.log_prior.keys()],
+                          dtype=np.float64).reshape(len(self.log_prior), self.unknown_id + 1)
+        self.log_prob_matrix = np.ascontiguousarray(tables.T)
+
+    def split_sequence(self, data):
+        """
+        helper method to lowercase and tokenize a sequence the same way the training data was tokenized
+        :param data: the given data (a sequence)
+        :return: a list of tokens
+        """
+        count_calls("tokenize")
+        # tokenize words properly if specified - split at whitespace otherwise
+        return get_tokenizer(self.tokenize)(data.lower())
+
+    def tokenize_sequence(self, data):
+        """
+        tokenize a sequence - the tokens are taken from the cache if caching is activated
+        :param data: the given data (a sequence)
+        :return: a list (or a tuple if taken from the cache) of tokens
+        """
+        if self.token_cache is not None:
+            return self.token_cache(data)
+        return self.split_sequence(data)
 
-        self.data_class = DataInstance(filename, tokenize=self.tokenize)
-        self.advanced_emo = EmotionInformation(filename, event_duration=self.event_duration,
-                                               emotion_duration=self.emotion_duration, intensity=self.intensity,
-                                               tokenize=self.tokenize)
-        self.advanced_demo = DemographicInformation(filename, age=self.age, gender=self.gender,
-                                                    education=self.education, tokenize=self.tokenize)
+    def cache_info(self):
+        """
+        report the statistics of the tokenization cache to decide on its size
+        :return: a dictionary of the form {"hits": ..., "misses": ..., "maxsize": ..., "currsize": ...}
+                 or None if caching is not activated
+        """
+        if self.token_cache is None:
+            return None
+        return self.token_cache.cache_info()._asdict()
+
+    def predict_batch(self, texts):
+        """
+        calculate the naive bayes scores for a whole batch of sequences at once
+        the sequences are turned into a sparse document-term count matrix which is multiplied with the
+        vocabulary x emotion matrix of log probabilities - this gives the same scores as calculate_bayes
+        (up to floating point rounding since repeated tokens are multiplied instead of added one by one)
+        :param texts: a list of sequences to calculate the naive bayes for
+        :return: a tuple consisting of a list containing the predicted emotion for every sequence
+                 and a numpy array of the shape (sequences, emotions) containing all scores
+                 the columns of the scores follow the order of the emotions in the training file
+        """
+        if self.log_prob_matrix is None:
+            self.build_matrix()
+        unknown_column = self.unknown_id
+        # collect the columns of all tokens in compressed sparse row format
+        columns, row_offsets = [], [0]
+        for sequence in texts:
+            columns.extend(self.token_ids(self.tokenize_sequence(sequence)))
+            row_offsets.append(len(columns))
+        document_term_matrix = csr_matrix((np.ones(len(columns)), np.array(columns, dtype=np.int64),
+                                           np.array(row_offsets, dtype=np.int64)),
+                                          shape=(len(row_offsets) - 1, unknown_column + 1))
+        # repeated tokens within a sequence are merged into counts
+        document_term_matrix.sum_duplicates()
+        count_calls("likelihood", document_term_matrix.shape[0] * len(self.log_prior))
+        scores = document_term_matrix @ self.log_prob_matrix
+        scores += np.fromiter(self.log_prior.values(), dtype=np.float64, count=len(self.log_prior))
+        emotions = list(self.log_prior.keys())
+        labels = [emotions[best] for best in np.argmax(scores, axis=1)]
+        return labels, scores
 
     def calculate_prior(self, emotion):
         """
@@ -52,10 +397,7 @@ class NaiveBayes:
         :param emotion: the label to calculate the prior probability for NB (one of the emotions)
         :return: the prior probability (frequency of the given label)
         """
-        emotion_frequencies = self.data_class.emotion_counts
-        emotion_freq = emotion_frequencies[emotion]
-        total_count = sum(emotion_frequencies.values())
-        return math.log(emotion_freq) - math.log(total_count)
+        return self.log_prior[emotion]
 
     def calculate_likelihood(self, emotion, data):
         """
@@ -66,32 +408,46 @@ class NaiveBayes:
         :param data: the given data (a sentence dependent on the emotion)
         :return: the likelihood for the corresponding label and data
         """
+        return self.calculate_likelihood_tokens(emotion, self.tokenize_sequence(data))
+
+    def calculate_likelihood_tokens(self, emotion, tokens):
+        """
+        helper method to calculate the likelihood for an already tokenized sequence
+        this way a sequence only needs to be tokenized once to calculate the likelihood for every emotion
+        :param emotion: the given emotion to calculate the likelihood for NB (one of the emotions)
+        :param tokens: the tokens of the given data
+        :return: the likelihood for the corresponding label and data
+        """
+        count_calls("likelihood")
+        return self.calculate_likelihood_ids(emotion, self.token_ids(tokens))
+
+    def token_ids(self, tokens):
+        """
+        helper method to look up the ids of the tokens of a sequence once for all emotions
+        :param tokens: the tokens of the given data
+        :return: a list of token ids (self.unknown_id for tokens which are not part of the vocabulary)
+        """
+        vocabulary, unknown_id = self.vocabulary, self.unknown_id
+        return [vocabulary.get(word, unknown_id) for word in tokens]
+
+    def calculate_likelihood_ids(self, emotion, token_ids):
+        """
+        helper method to calculate the likelihood for the token ids of a sequence
+        :param emotion: the given emotion to calculate the likelihood for NB (one of the emotions)
+        :param token_ids: the ids of the tokens of the given data (see token_ids)
+        :return: the likelihood for the corresponding label and data
+        """
+        # a loaded model adds the log probabilities directly from the mapped matrix
+        if self.log_likelihood is None:
+            return float(self.log_prob_matrix[token_ids, self.emotion_columns[emotion]].sum())
         # P(data, emotion) is calculated such that the log probabilities
         # of the individual words given the emotion are added
         prob_data_emotion = 0
-        # access the dictionary with emotion dependent token counts
-        if self.event_duration or self.emotion_duration or self.intensity:
-            emotion_dependent_token_count = self.advanced_emo.emotion_dependent_count_advanced
-        elif self.age or self.gender or self.education:
-            emotion_dependent_token_count = self.advanced_demo.emotion_dependent_count_advanced
-        else:
-            emotion_dependent_token_count = self.data_class.emotion_dependent_count
-        # get the dependent counts for tokens given the emotion
-        total_dependent_token_count = sum(emotion_dependent_token_count[emotion].values())
-        # get the vocabulary count given the emotion
-        dependent_vocabulary_count = len(emotion_dependent_token_count[emotion].keys())
-        # tokenize words properly if specified - split at whitespace otherwise
-        if self.tokenize:
-            data = word_tokenize(data.lower())
-        else:
-            data = data.lower().split()
+        # access the compiled log probabilities given the emotion
+        log_likelihood = self.log_likelihood[emotion]
         # add each log probability to get the final probability
-        for word in data:
-            if word in emotion_dependent_token_count[emotion].keys():
-                prob_data_emotion += math.log((emotion_dependent_token_count[emotion][word] + 1) /
-                                              (total_dependent_token_count + dependent_vocabulary_count))
-            else:
-                prob_data_emotion += math.log(1 / (total_dependent_token_count + dependent_vocabulary_count))
+        for token_id in token_ids:
+            prob_data_emotion += log_likelihood[token_id]
         return prob_data_emotion
 
     def calculate_bayes(self, emotion, data):
@@ -106,3 +462,122 @@ class NaiveBayes:
 
         return likelihood + prior
 
+    def predict(self, data):
+        """
+        get the most likely emotion for the given data
+        the sequence is tokenized once and the tokens are shared between all emotions
+        :param data: the data (a sequence to calculate the naive bayes for)
+        :return: the emotion with the highest conditional log probability
+                 (the first one in the order of the training file in case of a tie)
+        """
+        return self.predict_tokens(self.tokenize_sequence(data))
+
+    def predict_tokens(self, tokens):
+        """
+        get the most likely emotion for an already tokenized sequence
+        :param tokens: the tokens of the given data
+        :return: the emotion with the highest conditional log probability
+                 (the first one in the order of the training file in case of a tie)
+        """
+        token_ids = self.token_ids(tokens)
+        count_calls("likelihood", len(self.log_prior))
+        # a loaded model scores all emotions at once from the mapped matrix (see load)
+        if self.log_likelihood is None:
+            scores = self.log_prob_matrix[token_ids].sum(axis=0) + self.log_prior_vector
+            return self.emotions[int(np.argmax(scores))]
+        best_emotion, best_prob = None, -math.inf
+        for emotion in self.log_prior.keys():
+            current_prob = self.calculate_likelihood_ids(emotion, token_ids) + self.log_prior[emotion]
+            if best_prob < current_prob:
+                best_prob = current_prob
+                best_emotion = emotion
+        return best_emotion
+
+    def save(self, path):
+        """
+        store the compiled model in a compact binary file which can be loaded without training
+        the file contains the vocabulary and the log probabilities as float arrays (see MODEL_MAGIC)
+        :param path: the name of the file to write the model to
+        :return: returns a message after successfully writing file
+        """
+        if self.log_prob_matrix is None:
+            self.build_matrix()
+        # a hashed model does not contain the tokens - only the number of buckets is stored
+        hash_buckets = self.vocabulary.buckets if isinstance(self.vocabulary, HashedVocabulary) else None
+        vocabulary = [None] * len(self.vocabulary)
+        if hash_buckets is None:
+            for word, column in self.vocabulary.items():
+                vocabulary[column] = word
+        header = json.dumps({"emotions": list(self.log_prior.keys()), "vocabulary_size": len(vocabulary),
+                             "event_duration": self.event_duration, "emotion_duration": self.emotion_duration,
+                             "intensity": self.intensity, "age": self.age, "gender": self.gender,
+                             "education": self.education, "features": self.features,
+                             "tokenize": self.tokenize, "hash_buckets": hash_buckets}).encode("utf8")
+        # the arrays start at a multiple of 8 bytes so they can be used directly from the mapped file
+        header += b" " * (-(len(MODEL_MAGIC) + 8 + len(header)) % 8)
+        with open(path, "wb") as f:
+            f.write(MODEL_MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(np.fromiter(self.log_prior.values(), dtype="<f8", count=len(self.log_prior)).tobytes())
+            f.write(np.ascontiguousarray(self.log_prob_matrix, dtype="<f8").tobytes())
+            if hash_buckets is None:
+                f.write("\n".join(vocabulary).encode("utf8"))
+        return "File {} was successfully written.".format(path)
+
+    @classmethod
+    def load(cls, path, cache_size=0):
+        """
+        load a model written by save without training
+        the log probabilities are memory-mapped such that several processes share the pages of the same file
+        the resulting model can predict but does not contain the training data (data_class etc. are None)
+        single sequences are scored by summing the rows of the mapped matrix instead of unpacking the
+        log probabilities into tables (the scores may differ from the trained model by floating point rounding)
+        :param path: the name of the file to read the model from
+        :param cache_size: maximum number of sequences whose tokens are cached for repeated predictions
+                           None means unlimited - default is 0 (no caching)
+        :return: a NaiveBayes object
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = mapped[:len(MODEL_MAGIC)]
+        if magic not in (MODEL_MAGIC, MODEL_MAGIC_V1):
+            raise ValueError("{} is not a naive bayes model file".format(path))
+        offset = len(MODEL_MAGIC) + 8
+        header_length = struct.unpack_from("<Q", mapped, len(MODEL_MAGIC))[0]
+        header = json.loads(mapped[offset:offset + header_length].decode("utf8"))
+        offset += header_length
+        emotions, vocabulary_size = header["emotions"], header["vocabulary_size"]
+
+        model = cls.__new__(cls)
+        model.event_duration, model.emotion_duration = header["event_duration"], header["emotion_duration"]
+        model.intensity, model.age = header["intensity"], header["age"]
+        model.gender, model.education = header["gender"], header["education"]
+        # files written before the features were stored only contain the boolean variables
+        model.features = header.get("features", active_features({feature: header[feature] for feature in
+                                                                  EMOTION_FEATURES + DEMOGRAPHIC_FEATURES}))
+        model.tokenize = header["tokenize"]
+        model.set_cache_size(cache_size)
+        model.data_class, model.advanced = None, None
+
+        log_prior = np.frombuffer(mapped, dtype="<f8", count=len(emotions), offset=offset)
+        offset += log_prior.nbytes
+        model.log_prior = dict(zip(emotions, log_prior.tolist()))
+        model.log_prior_vector, model.emotions = log_prior, emotions
+        model.emotion_columns = {emotion: column for column, emotion in enumerate(emotions)}
+        log_prob_matrix = np.frombuffer(mapped, dtype="<f8", count=len(emotions) * (vocabulary_size + 1), offset=offset)
+        offset += log_prob_matrix.nbytes
+        if magic == MODEL_MAGIC:
+            model.log_prob_matrix = log_prob_matrix.reshape(vocabulary_size + 1, len(emotions))
+        else:
+            # the matrix of an old file is transposed into a copy in memory
+            model.log_prob_matrix = np.ascontiguousarray(log_prob_matrix.reshape(len(emotions), vocabulary_size + 1).T)
+        if header.get("hash_buckets") is not None:
+            model.vocabulary = HashedVocabulary(header["hash_buckets"]).ids
+        else:
+            words = mapped[offset:].decode("utf8").split("\n") if vocabulary_size else []
+            model.vocabulary = dict(zip(words, range(vocabulary_size)))
+        model.unknown_id = vocabulary_size
+        # the log probability tables only exist for models compiled in memory
+        model.log_likelihood, model.log_unknown = None, None
+        return model
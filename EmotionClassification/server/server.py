@@ -0,0 +1,318 @@
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+from collections import deque
+import argparse
+import asyncio
+import json
+import time
+
+# the reason phrases of the status codes used by the server
+STATUS_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class PredictionServer:
+    """
+    This class provides a local asyncio HTTP server (on a TCP port or a Unix socket) predicting emotions with a
+    trained naive bayes model which is loaded only once
+    The texts of concurrent requests are collected into micro-batches which are scored with a single call of
+    NaiveBayes.predict_batch - a batch is scored as soon as it contains max_batch_size texts or the first text of
+    the batch has waited max_wait seconds
+        POST /predict   with a json body {"text": ...} or {"texts": [...]} returns {"labels": [...], "scores": [...]}
+                        where every score is a dictionary of the form {emotion: naive bayes log probability}
+        GET /stats      returns the latency and throughput counters (see stats)
+
+    The file was created on     Sat October 17th 2026
+    """
+    def __init__(self, model, max_batch_size=64, max_wait=0.005, host="127.0.0.1", port=8080, unix_socket=None,
+                 max_body_size=1048576):
+        """
+        this is the constructor for the class PredictionServer - the server is started with serve or run
+            self.counters stores a dictionary of the form {"requests": ..., "texts": ..., "batches": ...,
+                          "errors": ...} counting the answered requests, the scored texts, the scored batches
+                          and the rejected requests
+            self.latencies stores the latencies (in seconds) of the last 10000 requests
+        :param model: a trained or loaded NaiveBayes object or the name of a file written by NaiveBayes.save
+                      the model may not use additional features since requests only contain texts
+        :param max_batch_size: the maximum number of texts scored at once - default is 64
+        :param max_wait: the maximum time (in seconds) a text waits for further texts of its batch - default is 0.005
+        :param host: the host the server listens on - default is "127.0.0.1" (only local connections)
+        :param port: the port the server listens on - default is 8080
+        :param unix_socket: the path of a Unix socket to listen on instead of host and port - default is None
+        :param max_body_size: the maximum size of a request body in bytes - default is 1048576 (1 MB)
+        """
+        if isinstance(model, str):
+            model = NaiveBayes.load(model)
+        if max_batch_size < 1:
+            raise ValueError("the maximum batch size has to be at least 1")
+        if model.features:
+            raise ValueError("the model uses additional information which is not contained in the texts of a request")
+        self.model = model
+        self.emotions = list(model.log_prior.keys())
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.max_body_size = max_body_size
+
+        self.counters = {"requests": 0, "texts": 0, "batches": 0, "errors": 0}
+        self.latencies = deque(maxlen=10000)
+        self.scoring_seconds = 0.0
+        self.started = None
+        # the texts waiting to be scored together with the futures their results are handed to
+        self.queue = None
+
+    async def serve(self):
+        """
+        start the server and the batching task and serve requests until the task is cancelled
+        """
+        self.queue = asyncio.Queue()
+        self.started = time.perf_counter()
+        batcher = asyncio.ensure_future(self.score_batches())
+        if self.unix_socket is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, path=self.unix_socket)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host=self.host, port=self.port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+    def run(self):
+        """
+        run the server until it is interrupted (e.g. with Ctrl+C)
+        """
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+    async def predict(self, texts):
+        """
+        hand texts to the batching task and wait for their results
+        :param texts: a list of sequences to predict the emotion for
+        :return: a list containing a tuple (emotion, scores) for every text
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self.queue.put_nowait((text, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def score_batches(self):
+        """
+        helper method to collect the waiting texts into batches and score every batch at once
+        the scoring itself blocks the event loop - new requests are queued meanwhile and end up in the next batch
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # take all texts which are already waiting before waiting for further ones
+                if self.queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.queue.get_nowait())
+            self.score_batch(batch)
+
+    def score_batch(self, batch):
+        """
+        helper method to score a batch and hand the results to the waiting requests
+        :param batch: a list of tuples (text, future)
+        """
+        start = time.perf_counter()
+        try:
+            labels, scores = self.model.predict_batch([text for text, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self.scoring_seconds += time.perf_counter() - start
+        self.counters["batches"] += 1
+        self.counters["texts"] += len(batch)
+        for (_, future), label, row in zip(batch, labels, scores.tolist()):
+            # the future is cancelled if the client closed the connection in the meantime
+            if not future.done():
+                future.set_result((label, dict(zip(self.emotions, row))))
+
+    def stats(self):
+        """
+        get the latency and throughput counters
+        :return: a dictionary containing the counters, the mean batch size, the texts scored per second since
+                 the start and per second of scoring as well as the mean, median, 95th and 99th percentile and
+                 maximum latency (in seconds) of the last requests
+        """
+        stats = dict(self.counters)
+        uptime = time.perf_counter() - self.started if self.started is not None else 0.0
+        stats["uptime_seconds"] = uptime
+        stats["mean_batch_size"] = self.counters["texts"] / self.counters["batches"] if self.counters["batches"] else 0
+        stats["texts_per_second"] = self.counters["texts"] / uptime if uptime else 0
+        stats["scored_texts_per_second"] = self.counters["texts"] / self.scoring_seconds if self.scoring_seconds else 0
+        latencies = sorted(self.latencies)
+        if latencies:
+            stats["latency"] = {"mean": sum(latencies) / len(latencies),
+                                "p50": latencies[len(latencies) // 2],
+                                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                                "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+                                "max": latencies[-1]}
+        else:
+            stats["latency"] = None
+        return stats
+
+    async def handle_connection(self, reader, writer):
+        """
+        helper method to answer the requests of a connection (several requests if the connection is kept alive)
+        :param reader: the asyncio.StreamReader of the connection
+        :param writer: the asyncio.StreamWriter of the connection
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = dict()
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" \
+                    and not request_line.rstrip().endswith(b"HTTP/1.0")
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self.counters["errors"] += 1
+                    await self.respond(writer, 400, {"error": "invalid Content-Length header"}, False)
+                    break
+                if length > self.max_body_size:
+                    self.counters["errors"] += 1
+                    await self.respond(writer, 413, {"error": "the request body is too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                parts = request_line.decode("latin-1").split()
+                if len(parts) < 2:
+                    self.counters["errors"] += 1
+                    await self.respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                status, answer = await self.answer(parts[0], parts[1].split("?")[0], body)
+                await self.respond(writer, status, answer, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def answer(self, method, path, body):
+        """
+        helper method to get the answer to a request
+        :param method: the HTTP method of the request
+        :param path: the requested path
+        :param body: the body of the request as bytes
+        :return: a tuple consisting of the status code and a dictionary to send as json
+        """
+        if path == "/stats":
+            if method != "GET":
+                return self.reject(405, "use GET for /stats")
+            return 200, self.stats()
+        if path != "/predict":
+            return self.reject(404, "unknown path {}".format(path))
+        if method != "POST":
+            return self.reject(405, "use POST for /predict")
+        try:
+            request = json.loads(body.decode("utf8"))
+        except (UnicodeDecodeError, ValueError):
+            return self.reject(400, "the request body is not valid json")
+        if isinstance(request, dict) and isinstance(request.get("text"), str):
+            texts = [request["text"]]
+        elif isinstance(request, dict) and isinstance(request.get("texts"), list) \
+                and all(isinstance(text, str) for text in request["texts"]):
+            texts = request["texts"]
+        else:
+            return self.reject(400, 'expected a json object of the form {"text": ...} or {"texts": [...]}')
+
+        start = time.perf_counter()
+        try:
+            results = await self.predict(texts)
+        except Exception as error:
+            return self.reject(500, "prediction failed: {}".format(error))
+        self.latencies.append(time.perf_counter() - start)
+        self.counters["requests"] += 1
+        return 200, {"labels": [label for label, _ in results], "scores": [scores for _, scores in results]}
+
+    def reject(self, status, message):
+        """
+        helper method to count a rejected request and get its answer
+        :param status: the status code
+        :param message: the error message
+        :return: a tuple consisting of the status code and a dictionary to send as json
+        """
+        self.counters["errors"] += 1
+        return status, {"error": message}
+
+    @staticmethod
+    async def respond(writer, status, answer, keep_alive):
+        """
+        helper method to send an answer as json
+        :param writer: the asyncio.StreamWriter of the connection
+        :param status: the status code
+        :param answer: a dictionary to send as json
+        :param keep_alive: boolean variable whether the connection stays open for further requests
+        """
+        body = json.dumps(answer).encode("utf8")
+        header = "HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\nConnection: {}\r\n\r\n" \
+            .format(status, STATUS_REASONS[status], len(body), "keep-alive" if keep_alive else "close")
+        writer.write(header.encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(arguments=None):
+    """
+    run the server from the command line, e.g.
+        python -m EmotionClassification.server.server --model model.bin --port 8080
+        curl -X POST localhost:8080/predict -d '{"text": "I passed the exam"}'
+    :param arguments: the command line arguments - default is None (sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="serve emotion predictions of a naive bayes model locally")
+    model_source = parser.add_mutually_exclusive_group(required=True)
+    model_source.add_argument("--model", help="model file written by NaiveBayes.save")
+    model_source.add_argument("--train", nargs="+",
+                              help="training files or glob patterns (plain or compressed) to train the model on")
+    parser.add_argument("--tokenize", nargs="?", const="nltk", default=False, choices=("nltk", "regex"),
+                        help="use the nltk tokenizer or the faster regex tokenizer (only with --train)")
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--unix-socket", help="path of a Unix socket to listen on instead of host and port")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="maximum number of texts scored at once")
+    parser.add_argument("--max-wait", type=float, default=0.005,
+                        help="maximum time in seconds a text waits for further texts of its batch")
+    arguments = parser.parse_args(arguments)
+
+    if arguments.model is not None:
+        model = NaiveBayes.load(arguments.model)
+    else:
+        model = NaiveBayes.from_files(arguments.train, tokenize=arguments.tokenize)
+    try:
+        server = PredictionServer(model, max_batch_size=arguments.max_batch_size, max_wait=arguments.max_wait,
+                                  host=arguments.host, port=arguments.port, unix_socket=arguments.unix_socket)
+    except ValueError as error:
+        parser.error(str(error))
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from EmotionClassification.benchmark.synthetic_corpus import generate_corpus
+from EmotionClassification.data_representation.data_representation import read_columns
+import pytest
+
+
+@pytest.fixture(scope="session")
+def corpus_files(tmp_path_factory):
+    """
+    small synthetic training and test files in the layout of the original file (see generate_corpus)
+    :return: a tuple with the names of the training and the test file
+    """
+    directory = tmp_path_factory.mktemp("corpus")
+    train, test = str(directory / "train.tsv"), str(directory / "test.tsv")
+    generate_corpus(train, 600, vocabulary_size=400, text_length=(3, 15), seed=1)
+    generate_corpus(test, 200, vocabulary_size=400, text_length=(3, 15), seed=2)
+    return train, test
+
+
+@pytest.fixture(scope="session")
+def corpus_parts(corpus_files, tmp_path_factory):
+    """
+    the training file split into two files with a header each, e.g. to add the second part to a trained model
+    :return: a tuple with the names of both parts
+    """
+    with open(corpus_files[0], encoding="utf8") as f:
+        header, *lines = f.readlines()
+    directory = tmp_path_factory.mktemp("parts")
+    parts = (str(directory / "part_a.tsv"), str(directory / "part_b.tsv"))
+    for name, part_lines in zip(parts, (lines[:400], lines[400:])):
+        with open(name, "w", encoding="utf8") as f:
+            f.writelines([header] + part_lines)
+    return parts
+
+
+@pytest.fixture(scope="session")
+def test_texts(corpus_files):
+    """
+    the generated texts of the test file
+    :return: a list of sequences
+    """
+    return [text for text, in read_columns(corpus_files[1], ("generated_text",))]
@@ -0,0 +1,74 @@
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+import pytest
+
+
+def token_frequencies(model):
+    """
+    helper method to sum up the counts of every token over all emotions
+    :param model: a NaiveBayes object
+    :return: a dictionary of the form {token: frequency}
+    """
+    frequencies = dict()
+    for token_counts in dict(model.get_dependent_counts().items()).values():
+        for token, count in token_counts.items():
+            frequencies[token] = frequencies.get(token, 0) + count
+    return frequencies
+
+
+def test_hashed_counts_keep_all_tokens(corpus_files):
+    """
+    hashing the tokens into buckets keeps the number of tokens of every emotion and bounds the table size
+    """
+    exact = NaiveBayes(corpus_files[0])
+    hashed = NaiveBayes(corpus_files[0], hash_buckets=64)
+    counts = hashed.get_dependent_counts()
+    for emotion, token_counts in dict(exact.get_dependent_counts().items()).items():
+        assert sum(counts.count_array(emotion)) == sum(token_counts.values())
+        assert len(hashed.log_likelihood[emotion]) == 64 + 1
+
+
+def test_max_vocabulary_keeps_the_most_frequent_tokens(corpus_files):
+    """
+    pruning to a maximum number of tokens keeps the most frequent ones with their exact counts
+    """
+    frequencies = token_frequencies(NaiveBayes(corpus_files[0]))
+    pruned = NaiveBayes(corpus_files[0], max_vocabulary=50)
+    kept = token_frequencies(pruned)
+
+    assert len(pruned.vocabulary) == 50
+    assert all(frequencies[token] == frequency for token, frequency in kept.items())
+    assert min(kept.values()) >= max(frequency for token, frequency in frequencies.items() if token not in kept)
+
+
+def test_min_count_drops_the_rare_tokens(corpus_files):
+    """
+    pruning by a minimum frequency keeps exactly the tokens occurring at least that often
+    """
+    frequencies = token_frequencies(NaiveBayes(corpus_files[0]))
+    pruned = NaiveBayes(corpus_files[0], min_count=5)
+
+    assert set(pruned.vocabulary) == {token for token, frequency in frequencies.items() if frequency >= 5}
+
+
+def test_hashed_counts_can_not_be_pruned(corpus_files):
+    """
+    hashing and pruning exclude each other
+    """
+    with pytest.raises(ValueError):
+        NaiveBayes.from_files(corpus_files[0], hash_buckets=64, min_count=2)
+
+
+def test_running_counts_of_files_are_bounded(corpus_files, test_texts):
+    """
+    the running counts of streamed files are only pruned once they exceed the bound - below it the model is the
+    same as the one pruned after counting the whole file
+    """
+    frequencies = token_frequencies(NaiveBayes(corpus_files[0]))
+    exact = NaiveBayes(corpus_files[0], max_vocabulary=len(frequencies) // 8)
+    streamed = NaiveBayes.from_files(corpus_files[0], max_vocabulary=len(frequencies) // 8)
+    assert streamed.vocabulary == exact.vocabulary
+    assert streamed.log_likelihood == exact.log_likelihood
+
+    bounded = NaiveBayes.from_files(corpus_files[0], max_vocabulary=5, chunk_size=20)
+    assert len(bounded.vocabulary) == 5
+    assert len(bounded.predict_batch(test_texts)[0]) == len(test_texts)
@@ -0,0 +1,40 @@
+from EmotionClassification.data_representation.data_representation import CorpusCache, load_corpus
+from EmotionClassification.evaluation.evaluation import Evaluation
+import os
+import shutil
+import pytest
+
+
+@pytest.mark.parametrize("options", [{}, {"intensity": True, "age": True}, {"tokenize": "regex"}])
+def test_cached_evaluation_equals_evaluation(corpus_files, tmp_path, options):
+    """
+    the first run storing the files in the cache and a later run loading them give the same results as a run
+    without cache
+    """
+    evaluation = Evaluation(*corpus_files, **options)
+    for _ in range(2):
+        cached = Evaluation(*corpus_files, cache_directory=str(tmp_path / "cache"), **options)
+        assert cached.predicted_labels == evaluation.predicted_labels
+        assert cached.f1 == evaluation.f1
+
+
+def test_changed_file_is_read_in_again(corpus_files, tmp_path):
+    """
+    an entry is no longer used once the content of its file changed, but still used if the file was only touched
+    """
+    filename, directory = str(tmp_path / "train.tsv"), str(tmp_path / "cache")
+    shutil.copyfile(corpus_files[0], filename)
+    lines = len(load_corpus(filename, directory).columns["emotion"])
+    assert CorpusCache(directory).read_meta([filename]) is not None
+
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert CorpusCache(directory).read_meta([filename]) is not None
+
+    with open(corpus_files[0], encoding="utf8") as f:
+        content = f.readlines()
+    with open(filename, "w", encoding="utf8") as f:
+        f.writelines(content[:-10])
+    assert CorpusCache(directory).read_meta([filename]) is None
+    assert len(load_corpus(filename, directory).columns["emotion"]) == lines - 10
+    assert CorpusCache(directory).read_meta([filename])["lines"] == lines - 10
@@ -0,0 +1,32 @@
+from EmotionClassification.evaluation.evaluation import Evaluation
+import pytest
+
+
+@pytest.mark.parametrize("options", [{}, {"intensity": True}, {"age": True, "gender": True}, {"tokenize": "regex"}])
+def test_folds_equal_separate_evaluations(corpus_files, tmp_path, options):
+    """
+    the model of every fold derived by subtracting counts gets the same scores as an Evaluation trained on the
+    remaining folds and tested on the held-out fold
+    """
+    cross_validation = Evaluation.cross_validate(corpus_files[0], folds=4, **options)
+    with open(corpus_files[0], encoding="utf8") as f:
+        header, *lines = f.readlines()
+    train, test = str(tmp_path / "train.tsv"), str(tmp_path / "test.tsv")
+    for fold, result in enumerate(cross_validation.fold_results):
+        start, end = cross_validation.boundaries[fold], cross_validation.boundaries[fold + 1]
+        with open(train, "w", encoding="utf8") as f:
+            f.writelines([header] + lines[:start] + lines[end:])
+        with open(test, "w", encoding="utf8") as f:
+            f.writelines([header] + lines[start:end])
+        evaluation = Evaluation(train, test, **options)
+        assert result["precision"] == evaluation.precision
+        assert result["recall"] == evaluation.recall
+        assert result["f1"] == evaluation.f1
+
+
+def test_too_few_folds_are_rejected(corpus_files):
+    """
+    cross-validation needs at least two folds
+    """
+    with pytest.raises(ValueError):
+        Evaluation.cross_validate(corpus_files[0], folds=1)
@@ -0,0 +1,47 @@
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("options", [{}, {"intensity": True, "age": True}, {"tokenize": "regex"},
+                                     {"hash_buckets": 128}])
+def test_loaded_model_scores_like_trained_model(corpus_files, test_texts, tmp_path, options):
+    """
+    a saved and loaded model predicts the same emotions with the same scores as the trained model
+    """
+    model = NaiveBayes(corpus_files[0], **options)
+    path = str(tmp_path / "model.bin")
+    model.save(path)
+    loaded = NaiveBayes.load(path)
+
+    assert loaded.features == model.features
+    assert loaded.tokenize == model.tokenize
+    assert loaded.log_prior == model.log_prior
+    labels, scores = model.predict_batch(test_texts)
+    loaded_labels, loaded_scores = loaded.predict_batch(test_texts)
+    assert loaded_labels == labels
+    assert np.array_equal(loaded_scores, scores)
+    assert [loaded.predict(text) for text in test_texts] == [model.predict(text) for text in test_texts]
+    for text in test_texts[:20]:
+        for emotion in model.log_prior:
+            assert loaded.calculate_bayes(emotion, text) == pytest.approx(model.calculate_bayes(emotion, text))
+
+
+def test_loaded_model_is_not_trained_further(corpus_files, corpus_parts, tmp_path):
+    """
+    a loaded model does not contain the counts needed to add further lines
+    """
+    path = str(tmp_path / "model.bin")
+    NaiveBayes(corpus_files[0]).save(path)
+    with pytest.raises(ValueError):
+        NaiveBayes.load(path).update_from_file(corpus_parts[1])
+
+
+def test_load_rejects_other_files(tmp_path):
+    """
+    files which were not written by NaiveBayes.save are rejected
+    """
+    path = tmp_path / "model.bin"
+    path.write_bytes(b"not a model file at all")
+    with pytest.raises(ValueError):
+        NaiveBayes.load(str(path))
@@ -0,0 +1,47 @@
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+import bz2
+import gzip
+import shutil
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def compressed_parts(corpus_parts, tmp_path):
+    """
+    the parts of the training file compressed with gzip and bz2
+    :return: a tuple with the names of both compressed parts
+    """
+    parts = (str(tmp_path / "part_a.tsv.gz"), str(tmp_path / "part_b.tsv.bz2"))
+    for part, name, open_output in zip(corpus_parts, parts, (gzip.open, bz2.open)):
+        with open(part, "rb") as source, open_output(name, "wb") as target:
+            shutil.copyfileobj(source, target)
+    return parts
+
+
+@pytest.mark.parametrize("options", [{}, {"intensity": True, "education": True}, {"hash_buckets": 128}])
+def test_files_equal_whole_file(corpus_files, compressed_parts, options):
+    """
+    training on the compressed parts chunk by chunk gives the same model as training on the whole file
+    """
+    model = NaiveBayes.from_files(list(compressed_parts), chunk_size=50, **options)
+    trained = NaiveBayes(corpus_files[0], **options)
+
+    assert model.emotion_counts == trained.get_emotion_counts()
+    assert model.log_likelihood == trained.log_likelihood
+
+
+@pytest.mark.parametrize("options", [{}, {"intensity": True, "education": True}, {"hash_buckets": 128}])
+def test_update_of_file_model_equals_retraining(corpus_files, compressed_parts, test_texts, options):
+    """
+    a model trained on files keeps its counts such that further files can be added to it
+    """
+    model = NaiveBayes.from_files(compressed_parts[0], **options)
+    model.update_from_file(compressed_parts[1])
+    retrained = NaiveBayes.from_files(list(compressed_parts), **options)
+
+    assert model.emotion_counts == retrained.emotion_counts
+    labels, scores = model.predict_batch(test_texts)
+    retrained_labels, retrained_scores = retrained.predict_batch(test_texts)
+    assert labels == retrained_labels
+    assert np.allclose(scores, retrained_scores)
@@ -0,0 +1,28 @@
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+import pytest
+
+
+@pytest.mark.parametrize("options", [{}, {"event_duration": True, "education": True}, {"tokenize": "regex"},
+                                     {"hash_buckets": 128}, {"max_vocabulary": 100}])
+def test_parallel_counts_equal_serial_counts(corpus_files, options):
+    """
+    counting the lines with several processes gives the same counts and tables as a single process
+    """
+    serial = NaiveBayes(corpus_files[0], **options)
+    parallel = NaiveBayes(corpus_files[0], workers=2, **options)
+
+    assert dict(parallel.get_dependent_counts().items()) == dict(serial.get_dependent_counts().items())
+    assert parallel.log_likelihood == serial.log_likelihood
+
+
+@pytest.mark.parametrize("options", [{}, {"intensity": True}, {"hash_buckets": 128}])
+def test_parallel_file_counts_equal_serial_file_counts(corpus_parts, options):
+    """
+    counting several files out of core with one process per file gives the same model as a single process
+    """
+    serial = NaiveBayes.from_files(list(corpus_parts), **options)
+    parallel = NaiveBayes.from_files(list(corpus_parts), workers=2, **options)
+
+    assert parallel.emotion_counts == serial.emotion_counts
+    assert dict(parallel.get_dependent_counts().items()) == dict(serial.get_dependent_counts().items())
+    assert parallel.log_likelihood == serial.log_likelihood
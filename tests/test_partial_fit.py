@@ -0,0 +1,37 @@
+from EmotionClassification.main_work.naive_bayes import NaiveBayes
+from EmotionClassification.data_representation.data_representation import COLUMNS, read_columns
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("options", [{}, {"intensity": True, "gender": True}, {"hash_buckets": 128}])
+def test_update_from_file_equals_retraining(corpus_files, corpus_parts, test_texts, options):
+    """
+    adding the second part of the training file to a model trained on the first part gives the same model
+    as training on the whole file
+    """
+    model = NaiveBayes(corpus_parts[0], **options)
+    model.update_from_file(corpus_parts[1])
+    retrained = NaiveBayes(corpus_files[0], **options)
+
+    assert model.get_emotion_counts() == retrained.get_emotion_counts()
+    assert list(model.log_prior) == list(retrained.log_prior)
+    assert model.log_prior == pytest.approx(retrained.log_prior)
+    labels, scores = model.predict_batch(test_texts)
+    retrained_labels, retrained_scores = retrained.predict_batch(test_texts)
+    assert labels == retrained_labels
+    assert np.allclose(scores, retrained_scores)
+
+
+def test_partial_fit_takes_dictionaries(corpus_parts, test_texts):
+    """
+    the new lines can be given as dictionaries of the form {column name: value} as well as tuples
+    """
+    rows = list(read_columns(corpus_parts[1]))
+    from_tuples = NaiveBayes(corpus_parts[0])
+    from_tuples.partial_fit(rows)
+    from_dictionaries = NaiveBayes(corpus_parts[0])
+    from_dictionaries.partial_fit([dict(zip(COLUMNS, row)) for row in rows])
+
+    assert from_tuples.log_likelihood == from_dictionaries.log_likelihood
+    assert from_tuples.predict_batch(test_texts)[0] == from_dictionaries.predict_batch(test_texts)[0]
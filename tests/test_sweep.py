@@ -0,0 +1,20 @@
+from EmotionClassification.evaluation.sweep import FeatureSweep
+from EmotionClassification.evaluation.evaluation import Evaluation, calc_macro
+import pytest
+
+
+@pytest.mark.parametrize("tokenize", [False, "regex"])
+def test_sweep_equals_separate_evaluations(corpus_files, tokenize):
+    """
+    every configuration of a sweep gets the same scores and predictions as a separate Evaluation
+    """
+    configurations = [{}, {"intensity": True}, {"event_duration": True, "emotion_duration": True},
+                      {"age": True, "gender": True, "education": True}]
+    sweep = FeatureSweep(*corpus_files, configurations, tokenize=tokenize)
+    for configuration in configurations:
+        evaluation = Evaluation(*corpus_files, tokenize=tokenize, **configuration)
+        name = FeatureSweep.configuration_name(configuration)
+        result = sweep.results[name]
+        assert sweep.predicted_labels[name] == evaluation.predicted_labels
+        assert result["f1"] == evaluation.f1
+        assert result["macro_f1"] == calc_macro(evaluation.precision, evaluation.recall, evaluation.f1)["f1"]